@@ -1 +1 @@
-cmd /k "cd /d C:\&&pip install openpyxl"
+cmd /k "cd /d C:\&&pip install openpyxl numpy"
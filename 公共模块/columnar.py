@@ -0,0 +1,160 @@
+import numpy as np
+
+# 列式数据模型：把武器、子弹、护甲的字典列表转换为NumPy结构化数组，供批量计算使用
+# 字典格式与夺金伤害计算模拟程序的加载函数一致
+
+# 部位顺序（下腹部使用腹部倍率，不单独存储）
+PART_NAMES = ('头部', '胸部', '腹部', '大臂', '小臂', '大腿', '小腿')
+PART_KEYS = (
+    'head_multiplier',
+    'chest_multiplier',
+    'abdomen_multiplier',
+    'upper_arm_multiplier',
+    'lower_arm_multiplier',
+    'thigh_multiplier',
+    'calf_multiplier'
+)
+PART_INDEX = {name: i for i, name in enumerate(PART_NAMES)}
+PART_INDEX['下腹部'] = PART_INDEX['腹部']
+
+MAX_DECAY_STEPS = 4  # 表格最多4组距离衰减
+ARMOR_LEVELS = 6
+
+# 护甲类型编码，头盔为0
+ARMOR_TYPE_CODES = {'半甲': 1, '全甲': 2, '重甲': 3}
+
+WEAPON_DTYPE = np.dtype([
+    ('category', np.int16),
+    ('caliber', np.int16),
+    ('fire_mode', np.int8),
+    ('trigger_delay', np.float64),
+    ('fire_rate', np.float64),
+    ('base_damage', np.float64),
+    ('armor_damage', np.float64),
+    ('part_multipliers', np.float64, (len(PART_NAMES),)),
+    ('decay_count', np.int8),
+    ('decay_distances', np.float64, (MAX_DECAY_STEPS,)),  # 不足4组时补inf
+    ('decay_factors', np.float64, (MAX_DECAY_STEPS,))     # 不足4组时补最后一个倍率
+])
+
+BULLET_DTYPE = np.dtype([
+    ('caliber', np.int16),
+    ('pellet_count', np.int16),
+    ('penetration_level', np.int8),
+    ('base_damage_multiplier', np.float64),
+    ('base_armor_multiplier', np.float64),
+    ('armor_decay_factors', np.float64, (ARMOR_LEVELS,)),
+    ('same_level_penetration', np.float64),
+    ('higher_level_penetration', np.float64)
+])
+
+PROTECTOR_DTYPE = np.dtype([
+    ('level', np.int8),
+    ('armor_type', np.int8),
+    ('max_durability', np.float64)
+])
+
+def to_number(value, default=0.0):
+    """表格值转为浮点数，“？”“/”等占位符返回默认值"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+def build_code_table(values):
+    """按首次出现顺序为字符串分配整数编码"""
+    labels = []
+    codes = {}
+    for value in values:
+        if value not in codes:
+            codes[value] = len(labels)
+            labels.append(value)
+    return {'labels': labels, 'codes': codes}
+
+def build_weapon_table(weapons, calibers, categories):
+    """武器字典列表 -> 结构化数组"""
+    table = np.zeros(len(weapons), dtype=WEAPON_DTYPE)
+    for i, weapon in enumerate(weapons):
+        row = table[i]
+        row['category'] = categories['codes'][weapon['category']]
+        row['caliber'] = calibers['codes'][weapon['caliber']]
+        row['fire_mode'] = to_number(weapon['fire_mode'])
+        row['trigger_delay'] = to_number(weapon['trigger_delay'])
+        row['fire_rate'] = to_number(weapon['fire_rate'])
+        row['base_damage'] = to_number(weapon['base_damage'])
+        row['armor_damage'] = to_number(weapon['armor_damage'])
+        row['part_multipliers'] = [to_number(weapon[key], 1.0) for key in PART_KEYS]
+
+        distances = weapon['decay_distances'][:MAX_DECAY_STEPS]
+        factors = weapon['decay_factors'][:MAX_DECAY_STEPS]
+        padding = MAX_DECAY_STEPS - len(distances)
+        row['decay_count'] = len(distances)
+        row['decay_distances'] = list(distances) + [np.inf] * padding
+        row['decay_factors'] = list(factors) + [factors[-1] if factors else 1.0] * padding
+    return table
+
+def build_bullet_table(bullets, calibers):
+    """子弹字典列表 -> 结构化数组"""
+    table = np.zeros(len(bullets), dtype=BULLET_DTYPE)
+    for i, bullet in enumerate(bullets):
+        row = table[i]
+        row['caliber'] = calibers['codes'][bullet['caliber']]
+        row['pellet_count'] = to_number(bullet['pellet_count'])
+        row['penetration_level'] = to_number(bullet['penetration_level'])
+        row['base_damage_multiplier'] = to_number(bullet['base_damage_multiplier'], 1.0)
+        row['base_armor_multiplier'] = to_number(bullet['base_armor_multiplier'], 1.0)
+        row['armor_decay_factors'] = [to_number(f) for f in bullet['armor_decay_factors'][:ARMOR_LEVELS]]
+        row['same_level_penetration'] = to_number(bullet['same_level_penetration'], 1.0)
+        row['higher_level_penetration'] = to_number(bullet['higher_level_penetration'], 1.0)
+    return table
+
+def build_protector_table(items):
+    """护甲/头盔字典列表 -> 结构化数组（头盔的armor_type为0）"""
+    table = np.zeros(len(items), dtype=PROTECTOR_DTYPE)
+    for i, item in enumerate(items):
+        table[i]['level'] = item['level']
+        table[i]['armor_type'] = item.get('armor_type', 0)
+        table[i]['max_durability'] = float(item['max_durability'])
+    return table
+
+def build_columnar_model(weapons, bullets, armors=(), helmets=()):
+    """构建完整的列式模型，武器与子弹共用同一张口径编码表"""
+    calibers = build_code_table([w['caliber'] for w in weapons] + [b['caliber'] for b in bullets])
+    categories = build_code_table(w['category'] for w in weapons)
+    return {
+        'weapons': build_weapon_table(weapons, calibers, categories),
+        'bullets': build_bullet_table(bullets, calibers),
+        'armors': build_protector_table(armors),
+        'helmets': build_protector_table(helmets),
+        'calibers': calibers,
+        'categories': categories
+    }
+
+def compatible_mask(weapons, bullets):
+    """武器×子弹的口径匹配矩阵"""
+    return weapons['caliber'][:, None] == bullets['caliber'][None, :]
+
+def weapon_decay_matrix(weapons, distances):
+    """武器×距离的距离衰减倍率，规则与calculate_weapon_decay一致
+    距离不超过第一个衰减距离时为1.0；落在第i段时取第i-1个倍率；超过全部距离取最后一个倍率
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    # 每个距离严格超过了几个衰减点
+    passed = (distances[None, :, None] > weapons['decay_distances'][:, None, :]).sum(axis=2)
+    factors = np.concatenate([np.ones((len(weapons), 1)), weapons['decay_factors']], axis=1)
+    return np.take_along_axis(factors, passed, axis=1)
+
+def penetration_matrix(bullets, levels):
+    """子弹×防护等级的穿透倍率：低于等级为0，同级/越一级取表格数值，越两级及以上为1"""
+    levels = np.asarray(levels)
+    diff = bullets['penetration_level'][:, None].astype(np.int16) - levels[None, :]
+    result = np.ones(diff.shape)
+    result = np.where(diff == 1, bullets['higher_level_penetration'][:, None], result)
+    result = np.where(diff == 0, bullets['same_level_penetration'][:, None], result)
+    return np.where(diff < 0, 0.0, result)
+
+def armor_decay_matrix(bullets, levels):
+    """子弹×防护等级的护甲衰减倍率（等级0视为无防护，倍率为0）"""
+    levels = np.asarray(levels)
+    factors = np.concatenate([np.zeros((len(bullets), 1)), bullets['armor_decay_factors']], axis=1)
+    return factors[:, levels]
@@ -0,0 +1,116 @@
+import os
+from collections import OrderedDict
+
+# 数据仓库：加载后一次性建立哈希索引，查询时不再遍历列表
+# 记录仍是各程序加载函数返回的字典，索引只保存引用
+
+def normalize_key(text):
+    """规范化名称/口径，规则与standardize_caliber一致：去除空格和点号，统一小写"""
+    if text is None:
+        return ""
+    return str(text).replace(" ", "").replace(".", "").lower().strip()
+
+def group_by(items, key):
+    """按字段分组，组内保持原有顺序，组按首次出现顺序排列"""
+    groups = {}
+    for item in items:
+        groups.setdefault(item[key], []).append(item)
+    return groups
+
+def index_by_name(items):
+    """建立名称索引，返回(精确索引, 规范化索引)，重名时保留第一条记录"""
+    exact = {}
+    normalized = {}
+    for item in items:
+        exact.setdefault(item['name'], item)
+        normalized.setdefault(normalize_key(item['name']), item)
+    return exact, normalized
+
+def build_data_store(weapons=(), bullets=(), armors=(), helmets=()):
+    """建立数据仓库（武器、子弹、护甲、头盔及其索引）"""
+    store = {
+        'weapons': list(weapons),
+        'bullets': list(bullets),
+        'armors': list(armors),
+        'helmets': list(helmets),
+        'bullets_by_caliber': {},
+        'weapons_by_category': group_by(weapons, 'category'),
+        # 等级索引按等级从低到高排列
+        'armors_by_level': dict(sorted(group_by(armors, 'level').items())),
+        'helmets_by_level': dict(sorted(group_by(helmets, 'level').items())),
+        'by_name': {},
+        'by_normalized_name': {},
+        'columnar': None,
+        'ammo_rankings': OrderedDict(),  # 子弹排行的LRU缓存（gold_ammo），随数据仓库一起失效
+        'batch_lookups': OrderedDict()  # 批量计算的名称/距离查询缓存（gold_batch），同上
+    }
+
+    # 子弹按规范化口径索引，兼容已标准化和原始写法的口径
+    for bullet in store['bullets']:
+        store['bullets_by_caliber'].setdefault(normalize_key(bullet['caliber']), []).append(bullet)
+
+    for kind in ('weapons', 'bullets', 'armors', 'helmets'):
+        exact, normalized = index_by_name(store[kind])
+        store['by_name'][kind] = exact
+        store['by_normalized_name'][kind] = normalized
+
+    return store
+
+def bullets_for_caliber(store, caliber):
+    """查询某口径的全部子弹"""
+    return store['bullets_by_caliber'].get(normalize_key(caliber), [])
+
+def compatible_pairs(store):
+    """逐个列出全部武器×同口径子弹的组合：(武器, 子弹)"""
+    for weapon in store['weapons']:
+        for bullet in bullets_for_caliber(store, weapon['caliber']):
+            yield weapon, bullet
+
+def weapons_in_category(store, category):
+    """查询某类别的全部武器"""
+    return store['weapons_by_category'].get(category, [])
+
+def find_record(store, kind, name):
+    """按名称查找记录（kind: weapons/bullets/armors/helmets），先精确匹配再规范化匹配"""
+    record = store['by_name'][kind].get(name)
+    if record is None:
+        record = store['by_normalized_name'][kind].get(normalize_key(name))
+    return record
+
+def get_columnar_model(store):
+    """首次使用时构建列式模型并缓存在仓库中"""
+    if store['columnar'] is None:
+        # 只有批量计算需要numpy，交互程序不依赖它
+        from columnar import build_columnar_model
+        store['columnar'] = build_columnar_model(
+            store['weapons'], store['bullets'], store['armors'], store['helmets']
+        )
+    return store['columnar']
+
+def file_mtimes(file_paths):
+    """读取文件修改时间，文件不存在时记为None"""
+    mtimes = {}
+    for path in file_paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+def create_session(file_paths, loader):
+    """创建数据会话：整个进程只加载一次，loader() 负责读取表格并返回数据仓库"""
+    return {
+        'files': list(file_paths),
+        'loader': loader,
+        'mtimes': None,
+        'store': None
+    }
+
+def get_session_store(session):
+    """取得会话中的数据仓库；表格修改时间变化时才重新加载，加载失败返回None"""
+    mtimes = file_mtimes(session['files'])
+    if session['store'] is None or mtimes != session['mtimes']:
+        session['store'] = session['loader']()
+        # 加载失败时不记录修改时间，下次调用会重试
+        session['mtimes'] = mtimes if session['store'] is not None else None
+    return session['store']
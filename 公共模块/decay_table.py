@@ -0,0 +1,43 @@
+from bisect import bisect_left
+from decimal import Decimal
+
+# 距离衰减表：每把武器的衰减距离与倍率只排序、转换一次，之后按二分查找取倍率
+# 规则：距离不超过第一个衰减距离时为1.0；落在第i段时取第i-1个倍率；超过全部距离取最后一个倍率
+# 即“严格小于该距离的衰减点个数”就是倍率表（开头补1.0）的下标，标量用bisect_left，数组用np.searchsorted
+# 编译结果缓存在武器字典的decay_table字段中
+
+def compile_decay_table(distances, factors):
+    """衰减距离与倍率 -> 按距离排序的查找表"""
+    pairs = sorted(zip(distances, factors))
+    return {
+        'distances': [float(distance) for distance, _ in pairs],
+        'factors': [1.0] + [float(factor) for _, factor in pairs],
+        'decimals': [Decimal('1.0')] + [Decimal(str(factor)) for _, factor in pairs],
+        'arrays': None  # NumPy数组，第一次向量查询时生成
+    }
+
+def weapon_decay_table(weapon, factors_key='decay_factors'):
+    """取武器的衰减查找表，第一次使用时编译并缓存
+    夺金武器的倍率字段为decay_factors，战场武器为decay_multipliers
+    """
+    table = weapon.get('decay_table')
+    if table is None:
+        table = compile_decay_table(weapon['decay_distances'], weapon[factors_key])
+        weapon['decay_table'] = table
+    return table
+
+def decay_at(table, distance):
+    """单个距离的衰减倍率（浮点数）"""
+    return table['factors'][bisect_left(table['distances'], distance)]
+
+def decimal_decay_at(table, distance):
+    """单个距离的衰减倍率（Decimal，供gold_engine使用）"""
+    return table['decimals'][bisect_left(table['distances'], distance)]
+
+def decay(table, distances):
+    """一组距离的衰减倍率，一次数组运算完成，返回与distances同形的数组"""
+    import numpy as np
+    if table['arrays'] is None:
+        table['arrays'] = (np.array(table['distances'], dtype=np.float64), np.array(table['factors'], dtype=np.float64))
+    table_distances, table_factors = table['arrays']
+    return table_factors[np.searchsorted(table_distances, np.asarray(distances, dtype=np.float64), side='left')]
@@ -0,0 +1,50 @@
+from bisect import bisect_left
+
+# 距离断点曲线：衰减倍率是距离的阶梯函数（见decay_table），击杀次数随距离同样分段不变
+# 每段只需按该段的倍率计算一次，相邻枪数相同的段合并，得到击杀次数发生变化的全部距离
+#
+# 曲线格式：{'limits': [各段的距离上限], 'shots': [各段的击杀次数]}，len(shots) == len(limits) + 1
+# 第i段覆盖 limits[i-1] < 距离 <= limits[i]（第0段从0米开始，最后一段没有上限），次数为0表示无法击杀
+# 按距离查询为二分查找，与衰减表取倍率的规则一致
+
+def segment_distances(table):
+    """衰减表各段的代表距离与距离上限：(代表距离列表, 上限列表)
+    每段取其上限作为代表，最后一段取最后一个衰减距离再远1米；重复的衰减距离只算一次
+    """
+    limits = sorted(set(table['distances']))
+    return limits + [limits[-1] + 1 if limits else 0.0], limits
+
+def build_curve(limits, shots):
+    """各段的击杀次数 -> 曲线，合并次数相同的相邻段"""
+    curve = {'limits': [], 'shots': [shots[0]]}
+    for limit, count in zip(limits, shots[1:]):
+        if count == curve['shots'][-1]:
+            continue
+        curve['limits'].append(limit)
+        curve['shots'].append(count)
+    return curve
+
+def shots_at_distance(curve, distance):
+    """查询某距离的击杀次数"""
+    return curve['shots'][bisect_left(curve['limits'], distance)]
+
+def kill_range(curve, max_shots):
+    """从0米起击杀次数不超过max_shots的最远距离：任何距离都满足时为float('inf')，0米也不满足时为None"""
+    for i, count in enumerate(curve['shots']):
+        if not 0 < count <= max_shots:
+            return curve['limits'][i - 1] if i > 0 else None
+    return float('inf')
+
+def curve_intervals(curve):
+    """曲线 -> [(距离下限, 距离上限, 击杀次数)]，第一段下限为0，最后一段上限为None"""
+    starts = [0.0] + curve['limits']
+    ends = curve['limits'] + [None]
+    return list(zip(starts, ends, curve['shots']))
+
+def format_curve(curve, unit='次'):
+    """曲线的简短文字描述，如“0-30米 3次 | 30-50米 4次 | 50米以上 5次”"""
+    texts = []
+    for start, end, shots in curve_intervals(curve):
+        span = f"{start:g}-{end:g}米" if end is not None else f"{start:g}米以上"
+        texts.append(f"{span} {f'{shots}{unit}' if shots else '无法击杀'}")
+    return " | ".join(texts)
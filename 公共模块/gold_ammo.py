@@ -0,0 +1,264 @@
+import heapq
+import itertools
+from bisect import bisect_left
+from decimal import Decimal, InvalidOperation
+
+import numpy as np
+
+from data_store import bullets_for_caliber, compatible_pairs, find_record
+from decay_table import weapon_decay_table, decay_at
+from gold_batch import ENGINES, resolve_protection, write_results
+from gold_engine import DEFAULT_FIRE_RATE, PLAYER_HEALTH, cached_loadout, lru_lookup, pellet_count, prepare_loadout, shot_time, to_durability
+from gold_fixed import DAMAGE_SCALE, RESULT_SCALES
+from gold_sweep import HIT_PATTERNS, MAX_SHOTS, pattern_parts
+from gold_vector import PART_INDEX, PART_MULTIPLIER_KEYS, MISS, prepare_vector_loadout, stack_vector_loadouts, new_vector_state, apply_vector_hit, apply_vector_shot
+
+# 子弹排行：给定武器、目标防护与耐久、距离和命中方式，比较该武器全部同口径子弹的击杀枪数、击杀耗时与护甲伤害
+# 各子弹的组合常量合并为一个（stack_vector_loadouts），每种子弹是一场交战，全部子弹一次数组运算逐发推进
+# 多弹丸子弹（霰弹等）每发的全部弹丸命中该部位，弹丸数少的子弹用“未命中”补齐
+# 未排序的模拟结果按查询（不含排序方式）缓存在数据仓库中（LRU，最多RANKING_CACHE_SIZE条），每次请求按排序方式排一份副本；
+# 表格重新加载后数据仓库是新的，缓存随之失效
+#
+# 反过来的问题“哪套武器+子弹击杀该目标最快”用top_loadouts回答：
+#   先对每个组合算击杀耗时的下界——护甲只会降低伤害（穿透倍率不超过1），按无防护伤害累计到击杀所需的枪数，
+#   再按射速与扳机延迟换算为耗时；组合按下界从小到大精确计算（整数定点引擎），
+#   用堆保留当前最快的k个，下界已超过第k名耗时时，之后的组合都不可能更快，直接结束
+
+DEFAULT_PATTERN = '全部胸部'
+# 排序方式：排序键（未击杀的子弹总是排在最后）
+RANK_ORDERS = {
+    'shots': lambda row: (row['shots'], row['ttk'], -row['armor_damage']),
+    'ttk': lambda row: (row['ttk'], row['shots'], -row['armor_damage']),
+    'armor_damage': lambda row: (-row['armor_damage'], row['shots'], row['ttk'])
+}
+DEFAULT_ORDER = 'shots'
+RANKING_CACHE_SIZE = 1024  # 子弹排行模拟结果的LRU缓存条数
+
+def simulate_bullets(weapon, bullets, helmet, helmet_durability, armor, armor_durability, distance, pattern):
+    """全部子弹一次数组运算结算命中方式的前MAX_SHOTS发，返回(各子弹的结果, 跳过的子弹名称)"""
+    loadouts, timings, usable, skipped = [], [], [], []
+    for bullet in bullets:
+        try:
+            loadout = prepare_vector_loadout(weapon, bullet, float(distance))
+            timing = prepare_loadout(weapon, bullet)  # 射击间隔与扳机延迟，用于击杀耗时
+        except (InvalidOperation, TypeError, ValueError):
+            skipped.append(bullet['name'])
+            continue
+        loadouts.append(loadout)
+        timings.append(timing)
+        usable.append(bullet)
+    if not usable:
+        return [], skipped
+
+    loadout = stack_vector_loadouts(loadouts)
+    state = new_vector_state(
+        (len(usable),),
+        helmet['level'] if helmet else 0, float(helmet_durability),
+        armor['level'] if armor else 0, armor['armor_type'] if armor else 0, float(armor_durability)
+    )
+    pellets = loadout['pellet_count']
+    max_pellets = int(pellets.max())
+    for part in pattern_parts(pattern, MAX_SHOTS):
+        if max_pellets == 1:
+            apply_vector_hit(loadout, state, PART_INDEX[part])
+        else:
+            # 每种子弹的前“弹丸数”颗弹丸命中该部位，其余为未命中
+            apply_vector_shot(loadout, state, np.where(np.arange(max_pellets) < pellets[:, None], PART_INDEX[part], MISS))
+        if state['shots'].all():
+            break
+
+    # 护甲伤害：击杀（或命中序列结束）时头盔与护甲耐久的总减少量
+    armor_damage = (float(helmet_durability) - state['helmet_durability']) + (float(armor_durability) - state['armor_durability'])
+    results = []
+    for i, bullet in enumerate(usable):
+        shots = int(state['shots'][i])
+        results.append({
+            'bullet': bullet['name'],
+            'killed': shots > 0,
+            'shots': shots or None,
+            'ttk': float(shot_time(timings[i], shots)) if shots else None,
+            'armor_damage': round(float(armor_damage[i]), 1),
+            'helmet_durability': round(float(state['helmet_durability'][i]), 1),
+            'armor_durability': round(float(state['armor_durability'][i]), 1)
+        })
+    return results, skipped
+
+def rank_ammo(store, weapon, helmet=None, helmet_durability=None, armor=None, armor_durability=None, distance=0, pattern=DEFAULT_PATTERN, order=DEFAULT_ORDER):
+    """对武器的全部同口径子弹排序，返回{'ranking': [各子弹结果], 'skipped': [数据不完整的子弹]}
+    耐久省略时为满耐久；同一数据仓库中相同的查询（排序方式不同也算）复用缓存的模拟结果，各行只读
+    """
+    if pattern not in HIT_PATTERNS:
+        raise ValueError(f"无效的命中方式: {pattern}（可选：{'、'.join(HIT_PATTERNS)}）")
+    if order not in RANK_ORDERS:
+        raise ValueError(f"无效的排序方式: {order}（可选：{'/'.join(RANK_ORDERS)}）")
+    durability_of = lambda record, durability: Decimal('0.0') if record is None else to_durability(record['max_durability'] if durability in (None, '') else durability)
+    helmet_durability, armor_durability = durability_of(helmet, helmet_durability), durability_of(armor, armor_durability)
+    distance = to_durability(distance or 0)
+
+    key = (
+        weapon['name'], helmet['name'] if helmet else None, helmet_durability,
+        armor['name'] if armor else None, armor_durability, distance, pattern
+    )
+    results, skipped = lru_lookup(store['ammo_rankings'], key, lambda: simulate_bullets(
+        weapon, bullets_for_caliber(store, weapon['caliber']),
+        helmet, helmet_durability, armor, armor_durability, distance, pattern
+    ), RANKING_CACHE_SIZE)
+    sort_key = RANK_ORDERS[order]
+    ranking = sorted(results, key=lambda row: (not row['killed'], sort_key(row) if row['killed'] else -row['armor_damage']))
+    return {'ranking': ranking, 'skipped': list(skipped)}
+
+def run_ammo_scenario(store, scenario):
+    """对一个场景（武器、目标防护、距离、命中方式pattern、排序方式order）给出子弹排行"""
+    weapon = find_record(store, 'weapons', scenario.get('weapon'))
+    if weapon is None:
+        raise ValueError(f"未找到武器: {scenario.get('weapon')}")
+    helmet, helmet_durability = resolve_protection(store, 'helmets', scenario.get('helmet'), scenario.get('helmet_durability'))
+    armor, armor_durability = resolve_protection(store, 'armors', scenario.get('armor'), scenario.get('armor_durability'))
+    distance = to_durability(scenario.get('distance') or 0)
+    pattern = scenario.get('pattern') or DEFAULT_PATTERN
+    order = scenario.get('order') or DEFAULT_ORDER
+
+    result = {
+        'weapon': weapon['name'],
+        'helmet': helmet['name'] if helmet else None,
+        'helmet_durability': float(helmet_durability),
+        'armor': armor['name'] if armor else None,
+        'armor_durability': float(armor_durability),
+        'distance': float(distance),
+        'pattern': pattern,
+        'order': order
+    }
+    result.update(rank_ammo(store, weapon, helmet, helmet_durability, armor, armor_durability, distance, pattern, order))
+    return result
+
+def run_ammo_batch(store, scenarios, output):
+    """逐条给出子弹排行并写出JSONL，返回(成功数, 失败数)"""
+    return write_results(scenarios, output, lambda scenario: run_ammo_scenario(store, scenario))
+
+DEFAULT_TOP = 10
+
+def pattern_multiplier_prefix(weapon, pattern):
+    """命中方式前MAX_SHOTS发的部位倍率前缀和"""
+    prefix = [0.0]
+    for part in pattern_parts(pattern, MAX_SHOTS):
+        prefix.append(prefix[-1] + float(weapon[PART_MULTIPLIER_KEYS[part]]))
+    return prefix
+
+def time_bound(weapon, shots):
+    """第shots发累计耗时（ms）的下界，规则同gold_engine.shot_time，射击间隔按取整前最多少0.005计"""
+    interval = 60000 / float(weapon['fire_rate'] or DEFAULT_FIRE_RATE) - 0.005
+    trigger_delay = float(weapon['trigger_delay'])
+    if weapon['fire_mode'] == 1:  # 全自动
+        return trigger_delay + interval * (shots - 1)
+    return trigger_delay * shots + interval * (shots - 1)
+
+def ttk_lower_bound(weapon, bullet, prefix, distance):
+    """组合击杀耗时的下界（ms），序列内即使无防护也无法击杀时为None
+    每发伤害不超过无防护伤害（取整最多多0.005），穿透倍率按不低于1计，保证下界不会高于实际耗时
+    """
+    penetration = max(1.0, float(bullet.get('same_level_penetration', 0.5)), float(bullet.get('higher_level_penetration', 0.75)))
+    per_multiplier = float(weapon['base_damage']) * float(bullet['base_damage_multiplier']) * decay_at(weapon_decay_table(weapon), distance) * penetration
+    pellets = pellet_count(bullet)
+    health = float(PLAYER_HEALTH) - 0.005 * pellets * MAX_SHOTS
+    shots = bisect_left(prefix, health / (per_multiplier * pellets)) if per_multiplier > 0 else len(prefix)
+    if shots >= len(prefix):
+        return None
+    return time_bound(weapon, max(shots, 1)) - 0.01
+
+def exact_result(weapon, bullet, helmet, helmet_durability, armor, armor_durability, distance, parts):
+    """用整数定点引擎计算组合按命中序列的击杀结果（按游程结算，连续相同的命中在防护耗尽后一次算完）"""
+    engine = ENGINES['fixed']
+    loadout = cached_loadout(
+        weapon, bullet,
+        helmet_level=helmet['level'] if helmet else 0,
+        armor_level=armor['level'] if armor else 0,
+        armor_type=armor['armor_type'] if armor else 0,
+        distance=distance,
+        prepare=engine['prepare']
+    )
+    runs = [(part, len(list(group))) for part, group in itertools.groupby(parts)]
+    return engine['run_runs'](loadout, engine['new_state'](helmet_durability, armor_durability), runs)
+
+def top_loadouts(store, helmet=None, helmet_durability=None, armor=None, armor_durability=None, distance=0, pattern=DEFAULT_PATTERN, top=DEFAULT_TOP, pairs=None):
+    """全部武器×同口径子弹中击杀该目标最快的top个组合，按击杀耗时、枪数排序
+    返回{'ranking': [各组合结果], 'evaluated': 精确计算的组合数, 'pruned': 被下界剪掉的组合数, 'skipped': [数据不完整的组合]}
+    """
+    if pattern not in HIT_PATTERNS:
+        raise ValueError(f"无效的命中方式: {pattern}（可选：{'、'.join(HIT_PATTERNS)}）")
+    if top < 1:
+        raise ValueError("排名数量应为正整数")
+    durability_of = lambda record, durability: Decimal('0.0') if record is None else to_durability(record['max_durability'] if durability in (None, '') else durability)
+    helmet_durability, armor_durability = durability_of(helmet, helmet_durability), durability_of(armor, armor_durability)
+    distance = to_durability(distance or 0)
+    parts = pattern_parts(pattern, MAX_SHOTS)
+
+    # 下界只与武器、子弹有关，逐个组合算一次
+    candidates, skipped, prefixes = [], [], {}
+    for index, (weapon, bullet) in enumerate(compatible_pairs(store) if pairs is None else pairs):
+        try:
+            if id(weapon) not in prefixes:
+                prefixes[id(weapon)] = pattern_multiplier_prefix(weapon, pattern)
+            bound = ttk_lower_bound(weapon, bullet, prefixes[id(weapon)], float(distance))
+        except (TypeError, ValueError):
+            skipped.append(f"{weapon['name']} / {bullet['name']}")
+            continue
+        if bound is not None:
+            candidates.append((bound, index, weapon, bullet))
+    candidates.sort(key=lambda candidate: candidate[:2])
+
+    # 使用堆维护耗时最短的top个组合（堆顶为其中最慢的一个），添加序号避免字典比较
+    best = []
+    evaluated = visited = 0
+    for bound, index, weapon, bullet in candidates:
+        if len(best) == top and bound * DAMAGE_SCALE > -best[0][0][0]:
+            break
+        visited += 1
+        try:
+            result = exact_result(weapon, bullet, helmet, helmet_durability, armor, armor_durability, distance, parts)
+        except (InvalidOperation, TypeError, ValueError):
+            skipped.append(f"{weapon['name']} / {bullet['name']}")
+            continue
+        evaluated += 1
+        if not result['killed']:
+            continue
+        entry = ((-result['ttk'], -result['shots']), -index, {
+            'weapon': weapon['name'],
+            'bullet': bullet['name'],
+            'shots': result['shots'],
+            'ttk': result['ttk'] / RESULT_SCALES['ttk'],
+            'armor_damage': result['total_armor_damage'] / RESULT_SCALES['total_armor_damage']
+        })
+        if len(best) < top:
+            heapq.heappush(best, entry)
+        else:
+            heapq.heappushpop(best, entry)
+
+    ranking = [row for _, _, row in sorted(best, key=lambda entry: (-entry[0][0], -entry[0][1], -entry[1]))]
+    return {'ranking': ranking, 'evaluated': evaluated, 'pruned': len(candidates) - visited, 'skipped': skipped}
+
+def run_top_scenario(store, scenario):
+    """对一个场景（目标防护、距离、命中方式pattern、排名数量top）给出击杀最快的武器+子弹组合"""
+    helmet, helmet_durability = resolve_protection(store, 'helmets', scenario.get('helmet'), scenario.get('helmet_durability'))
+    armor, armor_durability = resolve_protection(store, 'armors', scenario.get('armor'), scenario.get('armor_durability'))
+    distance = to_durability(scenario.get('distance') or 0)
+    pattern = scenario.get('pattern') or DEFAULT_PATTERN
+    try:
+        top = int(scenario.get('top') or DEFAULT_TOP)
+    except ValueError:
+        raise ValueError("排名数量应为正整数")
+
+    result = {
+        'helmet': helmet['name'] if helmet else None,
+        'helmet_durability': float(helmet_durability),
+        'armor': armor['name'] if armor else None,
+        'armor_durability': float(armor_durability),
+        'distance': float(distance),
+        'pattern': pattern,
+        'top': top
+    }
+    result.update(top_loadouts(store, helmet, helmet_durability, armor, armor_durability, distance, pattern, top))
+    return result
+
+def run_top_batch(store, scenarios, output):
+    """逐条求击杀最快的组合并写出JSONL，返回(成功数, 失败数)"""
+    return write_results(scenarios, output, lambda scenario: run_top_scenario(store, scenario))
@@ -0,0 +1,366 @@
+import csv
+import gc
+import itertools
+import json
+import re
+import sys
+from decimal import Decimal, InvalidOperation
+
+from data_store import bullets_for_caliber, find_record, normalize_key
+from gold_engine import VALID_PART_SET, calculate_weapon_decay, cached_loadout, lru_lookup, parse_runs, expand_runs, prepare_loadout, new_state, run_hits, run_magazine, to_durability
+from gold_fixed import DURABILITY_SCALE, RESULT_SCALES, prepare_fixed_loadout, new_fixed_state, run_fixed_hits, run_fixed_magazine, run_fixed_runs, to_units
+
+# 批量模式：从JSON/JSONL/CSV读取交战场景，逐条计算并以JSONL输出，不把全部场景读入内存
+#
+# 场景字段（CSV表头可用中文别名）：
+#   id                 场景编号，可省略（默认为行号）
+#   weapon / 武器       武器名称
+#   bullet / 子弹       子弹名称
+#   helmet / 头盔       头盔名称，省略或“无”表示不戴头盔
+#   helmet_durability / 头盔耐久   省略时为满耐久
+#   armor / 护甲        护甲名称，省略或“无”表示不穿护甲
+#   armor_durability / 护甲耐久    省略时为满耐久
+#   distance / 距离     目标距离（米），省略时为0
+#   hits / 命中部位     命中序列，JSON中为列表，CSV中用空格、逗号、“|”或“、”分隔
+#                      多弹丸子弹（霰弹等）每项为一发：单个部位表示全部弹丸命中，也可写成“头部*2+胸部*5”
+#                      连续相同的命中可写成“胸部×8”（或“胸部x8”），如“头部×2, 胸部×8”
+#   magazine / 弹匣     混装弹匣：按装填顺序列出子弹（须与武器同口径），连续的同种子弹可写成“5.56x45mm M995×3”，
+#                      CSV中用逗号、“|”或“、”分隔；弹匣之后的命中继续使用最后一种子弹，填写时bullet可省略
+#   parts / 可命中部位  最快击杀求解（gold_solver）时可以命中的部位，格式同hits，省略时为全部部位
+#   pattern / 命中方式  子弹排行（gold_ammo）的命中方式，如“全部胸部”“先头后胸”
+#   order / 排序        子弹排行的排序方式：shots（枪数）/ttk（耗时）/armor_damage（护甲伤害）
+#   top / 排名数量      最快组合搜索（gold_ammo.top_loadouts）列出的组合数，省略时为10
+#
+# 结果默认只含汇总字段，details=True 时附带逐发命中记录
+# 不需要逐发记录时命中序列按游程结算（gold_fixed.run_fixed_runs），防护耗尽后的连续命中一次算完
+# 计算引擎默认使用整数定点引擎（gold_fixed），engine='decimal' 时使用Decimal参考引擎（gold_engine），两者结果逐位一致
+#
+# 逐条计算的固定开销按键缓存（LRU，保存在数据仓库的batch_lookups中，表格重新加载后随之失效）：
+#   (武器名称, 子弹名称) -> 记录，(防护类别, 名称) -> 记录与满耐久，(武器, 距离) -> 距离与衰减倍率
+# 只有单个部位的命中列表直接分段，不逐项解析；字段名按表头整体换算一次；结果用预先建好的JSONEncoder写出
+
+FIELD_ALIASES = {
+    '编号': 'id',
+    '武器': 'weapon',
+    '子弹': 'bullet',
+    '头盔': 'helmet',
+    '头盔耐久': 'helmet_durability',
+    '护甲': 'armor',
+    '护甲耐久': 'armor_durability',
+    '距离': 'distance',
+    '命中部位': 'hits',
+    '弹匣': 'magazine',
+    '可命中部位': 'parts',
+    '命中方式': 'pattern',
+    '排序': 'order',
+    '排名数量': 'top'
+}
+
+NO_PROTECTION = ('', '无', 'none')
+# 计算引擎：准备组合常量、创建初始状态（参数为Decimal耐久）、结算命中序列、结算游程序列、结果数值转为浮点数
+ENGINES = {
+    'fixed': {
+        'prepare': prepare_fixed_loadout,
+        'new_state': lambda helmet, armor: new_fixed_state(to_units(helmet, DURABILITY_SCALE), to_units(armor, DURABILITY_SCALE)),
+        'run': run_fixed_hits,
+        'run_runs': run_fixed_runs,
+        'run_magazine': run_fixed_magazine,
+        'number': lambda key, value: value / RESULT_SCALES[key]
+    },
+    'decimal': {
+        'prepare': prepare_loadout,
+        'new_state': new_state,
+        'run': run_hits,
+        'run_runs': lambda loadout, state, runs: run_hits(loadout, state, expand_runs(runs)),
+        'run_magazine': run_magazine,
+        'number': lambda key, value: float(value)
+    }
+}
+DEFAULT_ENGINE = 'fixed'
+
+HIT_SEPARATOR = re.compile(r'[\s,，|、]+')
+MAGAZINE_SEPARATOR = re.compile(r'\s*[,，|、]+\s*')  # 子弹名称含空格，不按空格分隔
+MAGAZINE_COUNT_MARK = '×'  # 子弹名称含“x”，只用“×”表示连续发数
+LOOKUP_CACHE_SIZE = 4096  # 查询缓存的条数
+FIELD_CACHE_SIZE = 256  # 字段名换算缓存的表头数
+RESULT_ENCODER = json.JSONEncoder(ensure_ascii=False)  # 与json.dumps(..., ensure_ascii=False)输出相同
+BATCH_GC_THRESHOLD = 50000  # 批量计算期间第0代垃圾回收的阈值（默认700）
+
+_field_names = {}  # 表头（字段名元组） -> 换算后的字段名列表，与原表头相同时为None
+
+def normalize_fields(scenario):
+    """把中文表头统一为英文字段名，同一表头只换算一次；无需换算时直接返回原字典"""
+    keys = tuple(scenario)
+    names = _field_names.get(keys, False)
+    if names is False:
+        names = [None if key is None else FIELD_ALIASES.get(key.strip(), key.strip()) for key in keys]
+        if names == list(keys):
+            names = None
+        if len(_field_names) >= FIELD_CACHE_SIZE:
+            _field_names.clear()
+        _field_names[keys] = names
+    if names is None:
+        return scenario
+    return {name: value for name, value in zip(names, scenario.values()) if name is not None}
+
+def iter_scenarios(stream, file_format=None):
+    """逐条读取场景；file_format为json/jsonl/csv，不指定时根据第一个非空行判断"""
+    first_line = stream.readline()
+    while first_line and not first_line.strip():
+        first_line = stream.readline()
+    if file_format is None:
+        first = first_line.lstrip()[:1]
+        file_format = 'json' if first == '[' else 'jsonl' if first == '{' else 'csv'
+    lines = itertools.chain([first_line], stream)
+
+    if file_format == 'json':
+        # JSON数组只能整体解析，大量场景请使用JSONL或CSV
+        for scenario in json.loads(''.join(lines)):
+            yield normalize_fields(scenario)
+    elif file_format == 'jsonl':
+        for line in lines:
+            if line.strip():
+                yield normalize_fields(json.loads(line))
+    else:
+        for row in csv.DictReader(lines):
+            yield normalize_fields(row)
+
+def is_plain_parts(hits):
+    """命中列表是否只有单个部位（没有游程、多弹丸写法）"""
+    try:
+        return VALID_PART_SET.issuperset(hits)
+    except TypeError:  # 含列表等不可哈希的项，交给parse_runs报错
+        return False
+
+def group_parts(hits):
+    """只有单个部位的命中列表（最常见的写法）：相邻相同的部位直接合并为一段，结果同parse_runs"""
+    runs = []
+    last = None
+    for part in hits:
+        if part == last:
+            count += 1
+        else:
+            if last is not None:
+                runs.append((last, count))
+            last, count = part, 1
+    if last is not None:
+        runs.append((last, count))
+    return runs
+
+def parse_hit_runs(hits):
+    """命中序列：列表或分隔字符串 -> [(一发的命中, 连续发数)]，格式不对时报错"""
+    if isinstance(hits, str):
+        hits = [part for part in HIT_SEPARATOR.split(hits.strip()) if part]
+    elif isinstance(hits, list) and is_plain_parts(hits):
+        return group_parts(hits)
+    return parse_runs(hits)
+
+def parse_hits(hits):
+    """命中序列：列表或分隔字符串 -> 逐发的部位列表（游程写法展开）"""
+    return expand_runs(parse_hit_runs(hits))
+
+def parse_magazine(magazine):
+    """混装弹匣：列表或分隔字符串 -> [(子弹名称, 连续发数)]，格式不对时报错"""
+    if isinstance(magazine, str):
+        magazine = [entry for entry in MAGAZINE_SEPARATOR.split(magazine.strip()) if entry]
+    rounds = []
+    for entry in magazine:
+        name, mark, count = entry.strip().rpartition(MAGAZINE_COUNT_MARK)
+        if not mark:
+            name, count = entry.strip(), '1'
+        try:
+            count = int(count)
+        except ValueError:
+            raise ValueError(f"无效的子弹数: {entry}")
+        if count < 1:
+            raise ValueError(f"无效的子弹数: {entry}")
+        rounds.append((name.strip(), count))
+    return rounds
+
+def resolve_magazine(store, weapon, magazine):
+    """解析混装弹匣中的子弹（只在武器口径的子弹中查找），返回[(子弹, 连续发数)]"""
+    caliber_bullets = bullets_for_caliber(store, weapon['caliber'])
+    by_name = {normalize_key(bullet['name']): bullet for bullet in caliber_bullets}
+    rounds = []
+    for name, count in parse_magazine(magazine):
+        bullet = by_name.get(normalize_key(name))
+        if bullet is None:
+            raise ValueError(f"{weapon['name']}（{weapon['raw_caliber']}）没有这种子弹: {name}")
+        rounds.append((bullet, count))
+    if not rounds:
+        raise ValueError("弹匣为空")
+    return rounds
+
+def cached_lookup(store, key, build):
+    """批量计算的查询缓存（LRU，最多LOOKUP_CACHE_SIZE条）：命中时直接返回，否则调用build()；
+    build出错时不缓存（下次同样报错），键不可哈希（如名称写成了列表）时直接调用build()
+    """
+    try:
+        hash(key)
+    except TypeError:
+        return build()
+    return lru_lookup(store['batch_lookups'], key, build, LOOKUP_CACHE_SIZE)
+
+def find_protection(store, kind, name):
+    """按名称查找头盔/护甲，返回(记录, 满耐久, 耐久上限)，无防护时返回(None, None, None)"""
+    if name is None or normalize_key(name) in NO_PROTECTION:
+        return None, None, None
+    record = find_record(store, kind, name)
+    if record is None:
+        raise ValueError(f"未找到{'头盔' if kind == 'helmets' else '护甲'}: {name}")
+    return record, to_durability(record['max_durability']), Decimal(str(record['max_durability']))
+
+def resolve_protection(store, kind, name, durability):
+    """解析头盔/护甲名称与耐久，返回(记录, 耐久)，无防护时返回(None, 0)"""
+    record, full, limit = cached_lookup(store, ('protection', kind, name), lambda: find_protection(store, kind, name))
+    if record is None:
+        return None, Decimal('0.0')
+    durability = full if durability in (None, '') else to_durability(durability)
+    if durability < 0 or durability > limit:
+        raise ValueError(f"{record['name']} 的耐久应在0到{record['max_durability']}之间")
+    return record, durability
+
+def find_weapon_bullet(store, scenario):
+    """按名称查找武器与子弹并检查口径，返回(武器, 子弹)；混装弹匣省略子弹时取弹匣中的第一种"""
+    weapon = find_record(store, 'weapons', scenario.get('weapon'))
+    if weapon is None:
+        raise ValueError(f"未找到武器: {scenario.get('weapon')}")
+    if scenario.get('magazine') and not scenario.get('bullet'):
+        scenario = dict(scenario, bullet=resolve_magazine(store, weapon, scenario['magazine'])[0][0]['name'])
+    bullet = find_record(store, 'bullets', scenario.get('bullet'))
+    if bullet is None:
+        raise ValueError(f"未找到子弹: {scenario.get('bullet')}")
+    if normalize_key(bullet['caliber']) != normalize_key(weapon['caliber']):
+        raise ValueError(f"{bullet['name']} 与 {weapon['name']} 口径不匹配")
+    return weapon, bullet
+
+def resolve_equipment(store, scenario):
+    """解析场景中的武器、子弹、头盔与护甲，返回(武器, 子弹, 头盔, 头盔耐久, 护甲, 护甲耐久)"""
+    if scenario.get('magazine') and not scenario.get('bullet'):
+        weapon, bullet = find_weapon_bullet(store, scenario)
+    else:
+        weapon, bullet = cached_lookup(
+            store, ('equipment', scenario.get('weapon'), scenario.get('bullet')), lambda: find_weapon_bullet(store, scenario)
+        )
+
+    helmet, helmet_durability = resolve_protection(store, 'helmets', scenario.get('helmet'), scenario.get('helmet_durability'))
+    armor, armor_durability = resolve_protection(store, 'armors', scenario.get('armor'), scenario.get('armor_durability'))
+    return weapon, bullet, helmet, helmet_durability, armor, armor_durability
+
+def resolve_distance(store, weapon, distance):
+    """距离保留1位小数，返回(距离, 该武器在此距离的衰减倍率)"""
+    def build():
+        value = to_durability(distance or 0)
+        return value, calculate_weapon_decay(float(value), weapon)
+    # 键带上类型：True与1相等，但True不是有效的距离
+    return cached_lookup(store, ('distance', id(weapon), type(distance), distance), build)
+
+def run_scenario(store, scenario, details=False, engine=DEFAULT_ENGINE):
+    """计算一个场景，返回可直接写入JSON的结果字典"""
+    engine = ENGINES[engine]
+    weapon, bullet, helmet, helmet_durability, armor, armor_durability = resolve_equipment(store, scenario)
+    distance, weapon_decay = resolve_distance(store, weapon, scenario.get('distance'))
+    runs = parse_hit_runs(scenario.get('hits') or [])
+
+    # 同一组合的常量只预编译一次（LRU缓存）
+    prepare = lambda bullet: cached_loadout(
+        weapon, bullet,
+        helmet_level=helmet['level'] if helmet else 0,
+        armor_level=armor['level'] if armor else 0,
+        armor_type=armor['armor_type'] if armor else 0,
+        distance=distance,
+        prepare=engine['prepare'],
+        weapon_decay=weapon_decay
+    )
+
+    state = engine['new_state'](helmet_durability, armor_durability)
+    rounds = resolve_magazine(store, weapon, scenario['magazine']) if scenario.get('magazine') else None
+    if rounds:
+        # 逐发对应弹匣中的子弹，弹匣之后继续使用最后一种子弹
+        loadouts = [prepare(bullet) for bullet, _ in rounds]
+        magazine = itertools.chain(
+            itertools.chain.from_iterable(itertools.repeat(loadout, count) for loadout, (_, count) in zip(loadouts, rounds)),
+            itertools.repeat(loadouts[-1])
+        )
+        result = engine['run_magazine'](magazine, state, expand_runs(runs))
+    elif details:
+        result = engine['run'](prepare(bullet), state, expand_runs(runs))
+    else:
+        result = engine['run_runs'](prepare(bullet), state, runs)
+    number = engine['number']
+    summary = {
+        'weapon': weapon['name'],
+        'bullet': bullet['name'],
+        'helmet': helmet['name'] if helmet else None,
+        'armor': armor['name'] if armor else None,
+        'distance': float(distance),
+        'killed': result['killed'],
+        'shots': result['shots'],
+        'ttk': number('ttk', result['ttk']) if result['ttk'] is not None else None,
+        'total_time': number('total_time', result['total_time']),
+        'total_damage': number('total_damage', result['total_damage']),
+        'total_armor_damage': number('total_armor_damage', result['total_armor_damage']),
+        'health': number('health', result['health']),
+        'helmet_durability': number('helmet_durability', result['helmet_durability']),
+        'armor_durability': number('armor_durability', result['armor_durability'])
+    }
+    if rounds:
+        summary['magazine'] = [[bullet['name'], count] for bullet, count in rounds]
+    if details:
+        summary['hits'] = [
+            {
+                'part': record['part'],
+                'damage': number('damage', record['damage']),
+                'armor_damage': number('armor_damage', record['armor_damage']),
+                'protector': record['protector'],
+                'protector_destroyed': record['protector_destroyed'],
+                'health': number('health', record['health']),
+                'helmet_durability': number('helmet_durability', record['helmet_durability']),
+                'armor_durability': number('armor_durability', record['armor_durability']),
+                'time': number('time', record['time'])
+            }
+            for record in result['hits']
+        ]
+        if rounds:
+            names = [bullet['name'] for bullet, count in rounds for _ in range(count)]
+            for i, record in enumerate(summary['hits']):
+                record['bullet'] = names[min(i, len(names) - 1)]
+    return summary
+
+def write_results(scenarios, output, compute):
+    """逐条调用compute(场景)并写出JSONL，单个场景出错时输出error字段并继续，返回(成功数, 失败数)"""
+    succeeded = failed = 0
+    # 缓存中的组合常量与专用结算函数逐条累积且长期存活，按默认阈值会频繁触发垃圾回收并反复遍历它们；
+    # 逐条计算几乎不产生循环引用，批量期间调高阈值，结束后恢复
+    threshold = gc.get_threshold()
+    gc.set_threshold(max(threshold[0], BATCH_GC_THRESHOLD), *threshold[1:])
+    try:
+        for index, scenario in enumerate(scenarios, 1):
+            scenario_id = scenario.get('id') or index
+            try:
+                result = {'id': scenario_id}
+                result.update(compute(scenario))
+                succeeded += 1
+            except InvalidOperation:
+                result = {'id': scenario_id, 'error': "该武器或子弹的表格数据不完整（存在“？”等未知数值），无法计算"}
+                failed += 1
+            except Exception as e:
+                result = {'id': scenario_id, 'error': str(e)}
+                failed += 1
+            output.write(RESULT_ENCODER.encode(result) + '\n')
+    finally:
+        gc.set_threshold(*threshold)
+    return succeeded, failed
+
+def run_batch(store, scenarios, output, details=False, engine=DEFAULT_ENGINE):
+    """逐条计算场景并写出JSONL，返回(成功数, 失败数)"""
+    return write_results(scenarios, output, lambda scenario: run_scenario(store, scenario, details, engine))
+
+def open_scenarios(path):
+    """打开场景文件，'-'表示标准输入；按扩展名确定格式"""
+    if path == '-':
+        return sys.stdin, None
+    lower = path.lower()
+    file_format = 'jsonl' if lower.endswith('.jsonl') else 'json' if lower.endswith('.json') else 'csv' if lower.endswith('.csv') else None
+    # utf-8-sig 兼容Excel导出的带BOM的CSV
+    return open(path, 'r', encoding='utf-8-sig', newline=''), file_format
@@ -0,0 +1,234 @@
+import csv
+from bisect import bisect_left, bisect_right
+from decimal import Decimal, InvalidOperation
+
+from data_store import compatible_pairs
+from gold_engine import cached_loadout, to_durability
+from gold_fixed import DURABILITY_SCALE, prepare_fixed_loadout, new_fixed_state, protector_for, protected_hit, to_units, from_units
+from gold_sweep import HIT_PATTERNS, DEFAULT_DISTANCES, MAX_SHOTS, pattern_parts, pattern_protectors
+
+# 耐久断点表：击杀枪数是防护当前耐久的阶梯函数，直接解析求出枪数发生变化的耐久，不做0.1步长的逐点模拟
+# 思路与斩杀计算程序的calculate_min_durability相同：先用比例公式解出阈值耐久，再用精确的取整规则核对相邻值
+#
+# 耐久以0.1为单位的整数表示时，每发未击穿的命中扣除的耐久是常数（durability_step），
+# 因此按“击穿前有几发满额命中”可以把耐久分成若干段：
+#   同一段内，击穿前的各发伤害、击穿后的各发伤害都与耐久无关，只有击穿的那一发（拆分伤害）随剩余耐久变化，
+#   剩余耐久越高拆分伤害越低、枪数越多；用前缀和求出这一发需要多少伤害才能在第n发击杀，再反解出耐久阈值
+# 表只变化一种防护（头盔或护甲）的耐久，另一种防护按给定耐久参与计算（默认不穿戴）
+# 多弹丸子弹（霰弹等）把每发展开为逐颗弹丸的序列求解，第n颗弹丸击杀即为第 ceil(n/弹丸数) 发
+#
+# 表格式：{'starts': [各区间起始耐久], 'shots': [区间内击杀枪数], 'max_durability': 最大耐久}，耐久为0.1单位的整数，
+# 区间i覆盖 starts[i] 到 starts[i+1]-1，枪数为0表示命中序列内无法击杀；按耐久查询用二分查找
+
+def durability_step(protector):
+    """每发未击穿的命中扣除的耐久（0.1为单位）：耐久为整数单位时，相减后再四舍五入的结果只差一个常数"""
+    factor = protector['durability_factor']
+    return -((factor - 2 * protector['armor_value']) // (2 * factor))
+
+def damage_prefixes(loadout, parts, protector, other_durability):
+    """命中序列的伤害前缀和：(防护完好时, 防护击穿后, 命中该防护的发数位置)
+    不命中该防护的各发伤害与耐久无关，另一种防护的耐久变化在这里一并推进
+    """
+    other = 'armor' if protector == 'helmet' else 'helmet'
+    intact = [0]
+    broken = [0]
+    positions = []
+    for n, part in enumerate(parts, 1):
+        # 变化的防护按未击穿判断该部位是否受其保护
+        if protector == 'helmet':
+            covered = protector_for(loadout, part, 1, other_durability)
+        else:
+            covered = protector_for(loadout, part, other_durability, 1)
+        if covered == protector:
+            positions.append(n)
+            intact.append(intact[-1] + loadout[protector]['full_damage'][part])
+            broken.append(broken[-1] + loadout['open_damage'][part])
+            continue
+        if covered == other:
+            damage, other_durability, _ = protected_hit(loadout, loadout[other], other_durability, part)
+        elif part == '未命中':
+            damage = 0
+        else:
+            damage = loadout['open_damage'][part]
+        intact.append(intact[-1] + damage)
+        broken.append(broken[-1] + damage)
+    return intact, broken, positions
+
+def kill_index(prefix, health, low=0):
+    """累计伤害首次达到生命值的发数，序列内无法击杀时为0"""
+    n = bisect_left(prefix, health, low)
+    return n if n < len(prefix) else 0
+
+def split_hit_damage(loadout, protector_type, durability, part):
+    """击穿那一发的伤害：剩余耐久恰好等于护甲伤害时为满额伤害，否则按耐久占比拆分"""
+    return protected_hit(loadout, loadout[protector_type], durability, part)[0]
+
+def max_durability_for(loadout, protector_type, part, threshold, low, high):
+    """[low, high]内击穿伤害仍不低于threshold的最大耐久，没有时返回low-1
+    先按拆分公式解出理论阈值，再用精确的取整规则向两侧核对（同calculate_min_durability的去尾/进一验证）
+    """
+    damage = lambda durability: split_hit_damage(loadout, protector_type, durability, part)
+    if damage(low) < threshold:
+        return low - 1
+    if damage(high) >= threshold:
+        return high
+
+    source = loadout['decimal']
+    full = source['weapon_damage'] * source['base_damage_multiplier'] * source['body_part_multipliers'][part] * source['weapon_decay']
+    penetrated = full * loadout[protector_type]['source']['penetration_multiplier']
+    # 伤害四舍五入到0.01，达到threshold需要未取整的伤害不低于 threshold-0.5 个0.01
+    target = (Decimal(threshold) - Decimal('0.5')) / 100
+    estimate = low
+    if full != penetrated:
+        ratio_threshold = (full - target) / (full - penetrated)
+        estimate = int(ratio_threshold * loadout[protector_type]['source']['denominator'] * DURABILITY_SCALE)
+    estimate = min(max(estimate, low), high - 1)
+    while estimate + 1 <= high and damage(estimate + 1) >= threshold:
+        estimate += 1
+    while estimate >= low and damage(estimate) < threshold:
+        estimate -= 1
+    return estimate
+
+def durability_breakpoints(loadout, parts, protector_type, max_durability, other_durability=0):
+    """求变化防护耐久0..max_durability（0.1单位）上的击杀枪数阶梯，返回断点表
+    loadout为gold_fixed的整数组合，parts为命中序列，other_durability为另一种防护的耐久
+    """
+    health = new_fixed_state()['health']
+    pellets = loadout['pellet_count']
+    if pellets > 1:
+        parts = [part for part in parts for _ in range(pellets)]
+    intact, broken, positions = damage_prefixes(loadout, parts, protector_type, other_durability)
+    protector = loadout[protector_type]
+    factor, armor_value = protector['durability_factor'], protector['armor_value']
+    step = durability_step(protector)
+    intervals = [(0, kill_index(broken, health))]  # 耐久为0时不受保护
+
+    k, low = 0, 1
+    while low <= max_durability:
+        # 第k段：击穿前有k发满额命中，第k+1发命中该防护时击穿
+        if k >= len(positions) or (k > 0 and step == 0):
+            # 序列内不会击穿（或满额命中不扣耐久，超过护甲伤害的耐久永远不会击穿），剩余部分枪数相同
+            intervals.append((low, kill_index(intact, health)))
+            break
+        high = min((armor_value + k * step * factor) // factor, max_durability)
+        position = positions[k]
+        before = intact[position - 1]
+        if high < low:
+            pass  # 护甲伤害不足0.1时第0段为空
+        elif before >= health:
+            intervals.append((low, kill_index(intact, health)))
+        else:
+            # 剩余耐久 r = 耐久 - k*step；击穿这一发的伤害为x时，击杀发数为累计伤害首次达到生命值的位置
+            part = parts[position - 1]
+            offset = k * step
+            r_low, r_high = low - offset, high - offset
+            need = health - before + broken[position]
+            kill_at = lambda residual: kill_index(broken, need - split_hit_damage(loadout, protector_type, residual, part), position)
+            first, last = kill_at(r_low), kill_at(r_high)
+            if first == last:
+                intervals.append((low, first))
+            else:
+                # 剩余耐久越高伤害越低：依次求出仍能在第n发击杀的最大剩余耐久
+                last = last or len(parts) + 1
+                for n in range(first, last):
+                    r_max = max_durability_for(loadout, protector_type, part, need - broken[n], r_low, r_high)
+                    if r_max >= r_low:
+                        intervals.append((r_low + offset, n))
+                        r_low = r_max + 1
+                intervals.append((r_low + offset, last if last <= len(parts) else 0))
+        low = high + 1
+        k += 1
+
+    # 合并枪数相同的相邻区间
+    starts, shots = [], []
+    for start, count in intervals:
+        if start > max_durability:
+            break
+        count = -(-count // pellets)  # 弹丸序号 -> 枪数
+        if shots and shots[-1] == count:
+            continue
+        starts.append(start)
+        shots.append(count)
+    return {'starts': starts, 'shots': shots, 'max_durability': max_durability}
+
+def shots_at(table, durability):
+    """查询某耐久下的击杀枪数（耐久为数值，保留1位小数）"""
+    return table['shots'][bisect_right(table['starts'], to_units(durability, DURABILITY_SCALE)) - 1]
+
+def intervals_between(table, low, high):
+    """耐久在[low, high]内的各区间：[(起始耐久, 结束耐久, 枪数)]，耐久为Decimal"""
+    low, high = to_units(low, DURABILITY_SCALE), to_units(high, DURABILITY_SCALE)
+    starts = table['starts']
+    first = max(bisect_right(starts, low) - 1, 0)
+    result = []
+    for i in range(first, len(starts)):
+        start = max(starts[i], low)
+        end = min(starts[i + 1] - 1 if i + 1 < len(starts) else table['max_durability'], high)
+        if start > end:
+            break
+        result.append((from_units(start, DURABILITY_SCALE), from_units(end, DURABILITY_SCALE), table['shots'][i]))
+    return result
+
+def protector_levels(store, protector_type):
+    """该类防护在表格中出现的(等级, 护甲类型) -> 最大耐久；头盔的护甲类型记为0"""
+    levels = {}
+    records = store['helmets'] if protector_type == 'helmet' else store['armors']
+    for record in records:
+        key = (record['level'], 0 if protector_type == 'helmet' else record['armor_type'])
+        levels[key] = max(levels.get(key, 0), to_units(record['max_durability'], DURABILITY_SCALE))
+    return levels
+
+def build_breakpoint_tables(store, distances=DEFAULT_DISTANCES, patterns=None, skipped=None, pairs=None):
+    """全部武器×可用子弹×命中方式×防护等级（护甲类型）×距离的断点表
+    返回 {(武器, 子弹, 命中方式, 'helmet'/'armor', 等级, 护甲类型, 距离): 表}，另一种防护视为未穿戴
+    pairs为要计算的(武器, 子弹)组合，省略时为全部组合；表格数值未知（“？”）的组合跳过，名称记入skipped列表
+    """
+    patterns = patterns or list(HIT_PATTERNS)
+    parts = {pattern: pattern_parts(pattern, MAX_SHOTS) for pattern in patterns}
+    levels = {protector_type: protector_levels(store, protector_type) for protector_type in ('helmet', 'armor')}
+    tables = {}
+
+    for weapon, bullet in (compatible_pairs(store) if pairs is None else pairs):
+        try:
+            for distance in distances:
+                for pattern in patterns:
+                    uses = dict(zip(('helmet', 'armor'), pattern_protectors(pattern)))
+                    for protector_type in ('helmet', 'armor'):
+                        if not uses[protector_type]:
+                            continue
+                        for (level, armor_type), max_durability in levels[protector_type].items():
+                            loadout = cached_loadout(
+                                weapon, bullet,
+                                helmet_level=level if protector_type == 'helmet' else 0,
+                                armor_level=level if protector_type == 'armor' else 0,
+                                armor_type=armor_type,
+                                distance=to_durability(distance),
+                                prepare=prepare_fixed_loadout
+                            )
+                            key = (weapon['name'], bullet['name'], pattern, protector_type, level, armor_type, distance)
+                            tables[key] = durability_breakpoints(loadout, parts[pattern], protector_type, max_durability)
+        except (InvalidOperation, TypeError, ValueError):
+            if skipped is not None:
+                skipped.append(f"{weapon['name']} / {bullet['name']}")
+    return tables
+
+BREAKPOINT_HEADER = ['武器', '子弹', '命中方式', '防护', '等级', '护甲类型', '距离', '耐久下限', '耐久上限', '击杀枪数']
+
+def breakpoint_lines(tables):
+    """断点表 -> CSV行：每个耐久区间一行，未击杀的枪数留空"""
+    for (weapon, bullet, pattern, protector_type, level, armor_type, distance), table in tables.items():
+        for start, end, shots in intervals_between(table, 0, from_units(table['max_durability'], DURABILITY_SCALE)):
+            yield [
+                weapon, bullet, pattern, '头盔' if protector_type == 'helmet' else '护甲',
+                level, armor_type or '', distance, start, end, shots or ''
+            ]
+
+def write_breakpoints_csv(tables, output):
+    """把断点表写成CSV：每个耐久区间一行，未击杀的枪数留空；返回行数"""
+    writer = csv.writer(output)
+    writer.writerow(BREAKPOINT_HEADER)
+    count = 0
+    for line in breakpoint_lines(tables):
+        writer.writerow(line)
+        count += 1
+    return count
@@ -0,0 +1,60 @@
+import csv
+from decimal import InvalidOperation
+
+from data_store import compatible_pairs
+from decay_table import weapon_decay_table
+from distance_curves import segment_distances, build_curve, curve_intervals
+from gold_sweep import HIT_PATTERNS, DEFAULT_DURABILITY_FRACTIONS, MAX_SHOTS, pattern_parts, protection_states, state_arrays, shots_to_kill
+
+# 夺金模式的距离断点曲线：对每把武器×可用子弹×命中方式×防护状态，求击杀枪数随距离变化的各个区间
+# 每把武器只按衰减表的段数（通常2-5段）计算，全部防护状态与各段在一次矩阵运算中完成（同gold_sweep）
+# 曲线格式见distance_curves
+
+def iter_distance_curves(store, fractions=DEFAULT_DURABILITY_FRACTIONS, patterns=None, skipped=None, pairs=None):
+    """逐个武器/子弹组合生成曲线行，每行为一个命中方式下的一种防护状态
+    表格数值未知（“？”）的组合跳过，名称记入skipped列表
+    """
+    patterns = patterns or list(HIT_PATTERNS)
+    states = {pattern: protection_states(store, pattern, fractions) for pattern in patterns}
+    arrays = {pattern: state_arrays(states[pattern]) for pattern in patterns}
+    parts = {pattern: pattern_parts(pattern, MAX_SHOTS) for pattern in patterns}
+
+    for weapon, bullet in (compatible_pairs(store) if pairs is None else pairs):
+        try:
+            distances, limits = segment_distances(weapon_decay_table(weapon))
+            results = {pattern: shots_to_kill(weapon, bullet, arrays[pattern], distances, parts[pattern]) for pattern in patterns}
+        except (InvalidOperation, TypeError, ValueError):
+            if skipped is not None:
+                skipped.append(f"{weapon['name']} / {bullet['name']}")
+            continue
+
+        for pattern in patterns:
+            for (helmet, helmet_durability, armor, armor_durability), row in zip(states[pattern], results[pattern]):
+                yield {
+                    'weapon': weapon['name'],
+                    'bullet': bullet['name'],
+                    'pattern': pattern,
+                    'helmet': helmet['name'] if helmet else None,
+                    'helmet_durability': helmet_durability,
+                    'armor': armor['name'] if armor else None,
+                    'armor_durability': armor_durability,
+                    'curve': build_curve(limits, [int(n) for n in row])
+                }
+
+CURVE_HEADER = ['武器', '子弹', '命中方式', '头盔', '头盔耐久', '护甲', '护甲耐久', '距离下限', '距离上限', '击杀枪数']
+
+def write_curves_csv(store, output, fractions=DEFAULT_DURABILITY_FRACTIONS, patterns=None, skipped=None):
+    """把曲线写成CSV：每个距离区间一行，区间不含下限、含上限（第一段从0米开始），最后一段上限与未击杀的枪数留空；返回行数"""
+    writer = csv.writer(output)
+    writer.writerow(CURVE_HEADER)
+    count = 0
+    for row in iter_distance_curves(store, fractions, patterns, skipped):
+        prefix = [
+            row['weapon'], row['bullet'], row['pattern'],
+            row['helmet'] or '无', row['helmet_durability'] if row['helmet'] else '',
+            row['armor'] or '无', row['armor_durability'] if row['armor'] else ''
+        ]
+        for start, end, shots in curve_intervals(row['curve']):
+            writer.writerow(prefix + [f'{start:g}', f'{end:g}' if end is not None else '', shots or ''])
+            count += 1
+    return count
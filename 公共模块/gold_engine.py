@@ -0,0 +1,484 @@
+import itertools
+from collections import OrderedDict
+from decimal import Decimal, ROUND_HALF_UP
+
+from decay_table import weapon_decay_table, decimal_decay_at
+
+# 夺金模式伤害计算引擎：不含输入输出，交互程序与批量计算共用同一套规则
+# 武器、子弹字典格式与夺金伤害计算模拟程序的加载函数一致
+
+# 身体部位（下腹部使用腹部倍率）
+BODY_PARTS = ['头部', '胸部', '腹部', '大臂', '小臂', '大腿', '小腿', '下腹部']
+VALID_PARTS = BODY_PARTS + ['未命中']
+VALID_PART_SET = frozenset(VALID_PARTS)
+
+# 多弹丸子弹（霰弹等）一发的命中写法：单个部位表示全部弹丸命中该部位，
+# 也可以写成“头部*2+胸部*5”分别指定各部位的弹丸数，未写出的弹丸视为未命中
+PELLET_SEPARATOR = '+'
+PELLET_COUNT_MARK = '*'
+# 命中序列的游程写法：“胸部×8”表示连续8发相同的命中（也可用x），多弹丸写法同样适用，如“头部*2+胸部*5×3”
+RUN_COUNT_MARKS = ('×', 'x')
+
+# 各护甲类型保护的部位
+PROTECTED_AREAS = {
+    1: ['胸部', '腹部'],
+    2: ['胸部', '腹部', '下腹部'],
+    3: ['胸部', '腹部', '下腹部', '大臂']
+}
+
+DEFAULT_FIRE_RATE = 600  # 表格射速为空时使用的默认射速
+PLAYER_HEALTH = Decimal('100.0')
+
+LOADOUT_CACHE_SIZE = 4096  # 预编译组合的LRU缓存条数
+CONSTANTS_CACHE_SIZE = 4096  # 武器/子弹常量（含各等级防护）的LRU缓存条数
+
+def pellet_count(bullet):
+    """子弹每发的弹丸数，表格为空时为1"""
+    return int(bullet.get('pellet_count') or 1)
+
+def parse_shot(hit_part, pellets=None):
+    """一发射击各弹丸的命中部位（按结算顺序），长度为弹丸数；pellets为None时只检查写法，返回写出的弹丸"""
+    if hit_part in VALID_PART_SET:
+        return (hit_part,) * (pellets or 1)
+    parts = []
+    for item in hit_part.split(PELLET_SEPARATOR):
+        part, mark, count = item.strip().partition(PELLET_COUNT_MARK)
+        if part not in VALID_PART_SET:
+            raise ValueError(f"无效的命中部位: {part}")
+        try:
+            count = int(count) if mark else 1
+        except ValueError:
+            raise ValueError(f"无效的弹丸数: {item}")
+        if count < 1:
+            raise ValueError(f"无效的弹丸数: {item}")
+        parts += [part] * count
+    if pellets is None:
+        return tuple(parts)
+    if len(parts) > pellets:
+        raise ValueError(f"命中的弹丸数超过每发弹丸数{pellets}: {hit_part}")
+    return tuple(parts) + ('未命中',) * (pellets - len(parts))
+
+def parse_run(entry):
+    """命中序列的一项 -> (一发的命中, 连续发数)，格式不对时报错"""
+    if entry in VALID_PART_SET:  # 最常见的单个部位
+        return entry, 1
+    shot, count = entry.strip(), 1
+    for mark in RUN_COUNT_MARKS:
+        if mark in shot:
+            shot, _, text = shot.rpartition(mark)
+            try:
+                count = int(text)
+            except ValueError:
+                raise ValueError(f"无效的连续发数: {entry}")
+            if count < 1:
+                raise ValueError(f"无效的连续发数: {entry}")
+            break
+    if shot not in VALID_PART_SET:
+        parse_shot(shot)
+    return shot, count
+
+def parse_runs(entries):
+    """命中序列（各项可带游程写法） -> [(一发的命中, 连续发数)]，相邻的相同命中合并为一段"""
+    runs = []
+    for entry in entries:
+        shot, count = parse_run(entry)
+        if runs and runs[-1][0] == shot:
+            runs[-1] = (shot, runs[-1][1] + count)
+        else:
+            runs.append((shot, count))
+    return runs
+
+def expand_runs(runs):
+    """游程 -> 逐发的命中序列"""
+    return [shot for shot, count in runs for _ in range(count)]
+
+def merge_pellets(hit_part, pellet_records):
+    """多弹丸一发的汇总记录：伤害与护甲伤害为各弹丸之和，同时打到头盔和护甲时protector为'both'"""
+    protected = [record for record in pellet_records if record['protected']]
+    record = dict(protected[0] if protected else pellet_records[0])
+    record.update({
+        'part': hit_part,
+        'protector': 'both' if len({item['protector'] for item in protected}) > 1 else record['protector'],
+        'protector_destroyed': any(item['protector_destroyed'] for item in protected),
+        'armor_damage': sum((item['armor_damage'] for item in pellet_records[1:]), pellet_records[0]['armor_damage']),
+        'damage': sum((item['damage'] for item in pellet_records[1:]), pellet_records[0]['damage']),
+        'pellets': pellet_records
+    })
+    return record
+
+def calculate_weapon_decay(distance, weapon):
+    """计算武器衰减倍率（查预编译的衰减表）"""
+    return decimal_decay_at(weapon_decay_table(weapon), distance)
+
+def calculate_penetration_multiplier(penetration_level, protector_level, bullet):
+    """计算穿透倍率（使用子弹数据中的穿透倍率）"""
+    diff = penetration_level - protector_level
+
+    if diff < 0:
+        # 子弹穿透等级低于护甲等级，无法穿透
+        return Decimal('0.0')
+    elif diff == 0:
+        # 同级穿透
+        return Decimal(str(bullet.get('same_level_penetration', 0.5)))
+    elif diff == 1:
+        # 越一级穿透
+        return Decimal(str(bullet.get('higher_level_penetration', 0.75)))
+    else:
+        # 越多级穿透，完全穿透
+        return Decimal('1.0')
+
+def protector_decay(bullet, level):
+    """子弹对某等级头盔/护甲的衰减倍率，无防护时为0"""
+    if level > 0 and level <= 6:
+        return Decimal(str(bullet['armor_decay_factors'][level - 1]))
+    return Decimal('0.0')
+
+def compile_protector(level, decay, weapon, bullet, damage_factors, weapon_decay, is_338_lap_mag):
+    """预编译某类防护（头盔/护甲）在该组合下的常量：穿透倍率、护甲伤害与耐久足够时各部位的伤害"""
+    weapon_armor_damage, base_armor_multiplier, weapon_damage, base_damage_multiplier, body_part_multipliers = damage_factors
+    penetration_multiplier = calculate_penetration_multiplier(bullet['penetration_level'], level, bullet) if level > 0 else Decimal('0.0')
+
+    full_damage = {}
+    for part, part_multiplier in body_part_multipliers.items():
+        if is_338_lap_mag:
+            # .338弹药完全穿透护甲，直接造成全额伤害
+            damage = weapon_damage * base_damage_multiplier * part_multiplier * weapon_decay
+        else:
+            damage = weapon_damage * base_damage_multiplier * part_multiplier * penetration_multiplier * weapon_decay
+        full_damage[part] = damage.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+    return {
+        'level': level,
+        'decay': decay,
+        'penetration_multiplier': penetration_multiplier,
+        'armor_damage_value': weapon_armor_damage * base_armor_multiplier * decay * weapon_decay,
+        # 拆分伤害的分母，乘法顺序与原计算保持一致
+        'denominator': weapon_armor_damage * base_armor_multiplier * weapon_decay * decay,
+        'full_damage': full_damage
+    }
+
+def lru_lookup(cache, key, build, size, stats=None):
+    """LRU缓存查询：命中时移到末尾，未命中时调用build()生成，超过size条时淘汰最久未用的一条"""
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+        if stats is not None:
+            stats['hits'] += 1
+        return value
+    if stats is not None:
+        stats['misses'] += 1
+    value = cache[key] = build()
+    if len(cache) > size:
+        cache.popitem(last=False)
+    return value
+
+def loadout_constants(weapon, bullet, weapon_decay):
+    """武器/子弹在某个距离衰减倍率下与防护无关的常量：射击间隔、各部位倍率与无防护伤害
+    各等级防护的常量第一次用到时编译（protector_constants），保存在protectors字段中
+    """
+    fire_rate = weapon['fire_rate']
+    default_fire_rate = not fire_rate
+    shot_interval = (Decimal('60000') / Decimal(str(fire_rate or DEFAULT_FIRE_RATE))).quantize(
+        Decimal('0.01'), rounding=ROUND_HALF_UP
+    )
+
+    body_part_multipliers = {
+        '头部': Decimal(str(weapon['head_multiplier'])),
+        '胸部': Decimal(str(weapon['chest_multiplier'])),
+        '腹部': Decimal(str(weapon['abdomen_multiplier'])),
+        '大臂': Decimal(str(weapon['upper_arm_multiplier'])),
+        '小臂': Decimal(str(weapon['lower_arm_multiplier'])),
+        '大腿': Decimal(str(weapon['thigh_multiplier'])),
+        '小腿': Decimal(str(weapon['calf_multiplier'])),
+    }
+    body_part_multipliers['下腹部'] = body_part_multipliers['腹部']
+
+    weapon_damage = Decimal(str(weapon['base_damage']))
+    weapon_armor_damage = Decimal(str(weapon['armor_damage']))
+    base_damage_multiplier = Decimal(str(bullet['base_damage_multiplier']))
+    base_armor_multiplier = Decimal(str(bullet['base_armor_multiplier']))
+    # 特殊处理：.338 Lap Mag弹药始终完全穿透护甲
+    is_338_lap_mag = bullet['caliber'] == '338lapmag'
+
+    open_damage = {
+        part: (weapon_damage * base_damage_multiplier * part_multiplier * weapon_decay).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        for part, part_multiplier in body_part_multipliers.items()
+    }
+
+    return {
+        'weapon': weapon,
+        'bullet': bullet,
+        'weapon_decay': weapon_decay,
+        'weapon_damage': weapon_damage,
+        'weapon_armor_damage': weapon_armor_damage,
+        'base_damage_multiplier': base_damage_multiplier,
+        'base_armor_multiplier': base_armor_multiplier,
+        'penetration_level': bullet['penetration_level'],
+        'body_part_multipliers': body_part_multipliers,
+        'open_damage': open_damage,  # 未受保护时各部位的伤害
+        'fire_mode': weapon['fire_mode'],
+        'trigger_delay': Decimal(str(weapon['trigger_delay'])),
+        'shot_interval': shot_interval,
+        'default_fire_rate': default_fire_rate,
+        'is_338_lap_mag': is_338_lap_mag,
+        'pellet_count': pellet_count(bullet),
+        'protectors': {},  # 防护等级 -> compile_protector的结果
+        'engine_cache': {}  # 其他引擎由这些常量派生的数据（如gold_fixed的整数常量），各组合共用
+    }
+
+def protector_constants(constants, level):
+    """某等级防护的常量，按等级保存在组合常量中：头盔与护甲同等级时共用，不随另一类防护的等级重复编译"""
+    protector = constants['protectors'].get(level)
+    if protector is None:
+        damage_factors = (
+            constants['weapon_armor_damage'], constants['base_armor_multiplier'],
+            constants['weapon_damage'], constants['base_damage_multiplier'], constants['body_part_multipliers']
+        )
+        protector = constants['protectors'][level] = compile_protector(
+            level, protector_decay(constants['bullet'], level), constants['weapon'], constants['bullet'],
+            damage_factors, constants['weapon_decay'], constants['is_338_lap_mag']
+        )
+    return protector
+
+_constants_cache = OrderedDict()
+
+def cached_constants(weapon, bullet, weapon_decay):
+    """取得武器/子弹在该衰减倍率下的常量（LRU缓存），同一衰减段内的各个距离共用一份"""
+    return lru_lookup(
+        _constants_cache, (id(weapon), id(bullet), weapon_decay),
+        lambda: loadout_constants(weapon, bullet, weapon_decay), CONSTANTS_CACHE_SIZE
+    )
+
+def prepare_loadout(weapon, bullet, helmet_level=0, armor_level=0, armor_type=0, distance=0):
+    """预先计算一套武器/子弹/防护/距离组合在每次命中时都要用到的常量
+    各部位无防护伤害、头盔/护甲的穿透倍率与护甲伤害都在这里算好，逐发结算只剩耐久相关的计算
+    与防护无关的部分和各等级防护分别缓存，组合只是把它们拼在一起
+    """
+    constants = cached_constants(weapon, bullet, calculate_weapon_decay(float(distance), weapon))
+    helmet = protector_constants(constants, helmet_level)
+    armor = protector_constants(constants, armor_level)
+    loadout = dict(constants)
+    loadout.update({
+        'helmet_level': helmet_level,
+        'armor_level': armor_level,
+        'armor_type': armor_type,
+        'protected_areas': PROTECTED_AREAS.get(armor_type, []),  # 没有护甲时为空
+        'helmet_decay': helmet['decay'],
+        'armor_decay': armor['decay'],
+        'helmet': helmet,
+        'armor': armor
+    })
+    return loadout
+
+_loadout_cache = OrderedDict()
+_loadout_cache_stats = {'hits': 0, 'misses': 0}
+
+def cached_loadout(weapon, bullet, helmet_level=0, armor_level=0, armor_type=0, distance=0, prepare=prepare_loadout, weapon_decay=None):
+    """取得预编译的组合常量，相同组合直接命中LRU缓存；prepare可换成其他引擎的准备函数
+    组合只通过距离衰减倍率依赖距离，缓存键用倍率代替距离，同一衰减段内的距离共用一份组合；
+    调用方已算好该距离的衰减倍率时可通过weapon_decay传入
+    缓存键使用记录对象本身的id：缓存的组合引用着武器和子弹记录，记录不会被回收，id不会重复；
+    表格重新加载后记录是新对象，自然不会命中旧的缓存
+    """
+    if weapon_decay is None:
+        weapon_decay = calculate_weapon_decay(float(distance), weapon)
+    key = (prepare, id(weapon), id(bullet), helmet_level, armor_level, armor_type, weapon_decay)
+    return lru_lookup(
+        _loadout_cache, key,
+        lambda: prepare(weapon, bullet, helmet_level=helmet_level, armor_level=armor_level, armor_type=armor_type, distance=distance),
+        LOADOUT_CACHE_SIZE, _loadout_cache_stats
+    )
+
+def loadout_cache_info():
+    """缓存命中统计：{'hits', 'misses', 'size'}"""
+    return dict(_loadout_cache_stats, size=len(_loadout_cache))
+
+def new_state(helmet_durability=Decimal('0.0'), armor_durability=Decimal('0.0')):
+    """创建一场交战的初始状态"""
+    return {
+        'health': PLAYER_HEALTH,
+        'helmet_durability': helmet_durability,
+        'armor_durability': armor_durability,
+        'hit_count': 0,
+        'total_time': Decimal('0.0'),
+        'total_damage': Decimal('0.0'),
+        'total_armor_damage': Decimal('0.0'),
+        'hit_statistics': {part: 0 for part in VALID_PARTS}
+    }
+
+def shot_time(loadout, hit_count):
+    """第hit_count发的累计耗时：全自动只计一次扳机延迟，半自动每发都计"""
+    if loadout['fire_mode'] == 1:  # 全自动
+        total_time = loadout['trigger_delay'] + loadout['shot_interval'] * Decimal(str(hit_count - 1))
+    else:  # 半自动
+        total_time = (loadout['trigger_delay'] * Decimal(str(hit_count))) + (loadout['shot_interval'] * Decimal(str(hit_count - 1)))
+    return total_time.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+def split_damage(loadout, protector, hit_part, current_protector_durability):
+    """耐久不足以吸收全部护甲伤害时，按剩余耐久占比拆分伤害"""
+    weapon_damage = loadout['weapon_damage']
+    base_damage_multiplier = loadout['base_damage_multiplier']
+    part_multiplier = loadout['body_part_multipliers'][hit_part]
+    penetration_multiplier = protector['penetration_multiplier']
+    weapon_decay = loadout['weapon_decay']
+
+    denominator = protector['denominator']
+    if denominator == Decimal('0'):
+        ratio = Decimal('0.0')
+    else:
+        ratio = current_protector_durability / denominator
+
+    part1 = ratio * weapon_damage * base_damage_multiplier * part_multiplier * penetration_multiplier * weapon_decay
+    part2 = (Decimal('1') - ratio) * weapon_damage * base_damage_multiplier * part_multiplier * weapon_decay
+    return (part1 + part2).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+def apply_hit(loadout, state, hit_part):
+    """结算一次攻击并更新状态，返回本次攻击的记录
+    多弹丸子弹的各弹丸依次结算（格式见parse_shot），记录为各弹丸之和，逐弹丸的记录在pellets字段
+    """
+    single = loadout['pellet_count'] == 1 and hit_part in VALID_PART_SET
+    pellets = None if single else parse_shot(hit_part, loadout['pellet_count'])
+    state['hit_count'] += 1
+    state['total_time'] = shot_time(loadout, state['hit_count'])
+
+    if single:
+        record = resolve_pellet(loadout, state, hit_part)
+    else:
+        record = merge_pellets(hit_part, [resolve_pellet(loadout, state, part) for part in pellets])
+    record['shot'] = state['hit_count']
+    record['time'] = state['total_time']
+    return _finish_record(record, state)
+
+def resolve_pellet(loadout, state, hit_part):
+    """结算一颗弹丸（单弹丸子弹即一发）的伤害与耐久消耗，返回该弹丸的记录"""
+    state['hit_statistics'][hit_part] += 1
+
+    record = {
+        'part': hit_part,
+        'protected': False,
+        'protector': None,
+        'penetration_multiplier': Decimal('0.0'),
+        'armor_damage': Decimal('0.0'),
+        'protector_destroyed': False,
+        'damage': Decimal('0.0')
+    }
+
+    # 未命中不造成伤害
+    if hit_part == '未命中':
+        return record
+
+    # 判断保护状态
+    protector_type = None
+    if hit_part == '头部':
+        if loadout['helmet_level'] > 0 and state['helmet_durability'] > Decimal('0'):
+            protector_type = 'helmet'
+    else:
+        if loadout['armor_level'] > 0 and state['armor_durability'] > Decimal('0') and hit_part in loadout['protected_areas']:
+            protector_type = 'armor'
+
+    if protector_type is not None:
+        protector = loadout[protector_type]
+        durability_key = f'{protector_type}_durability'
+        current_protector_durability = state[durability_key]
+        armor_damage_value = protector['armor_damage_value']
+
+        # 计算剩余耐久
+        remaining_durability = current_protector_durability - armor_damage_value
+        protector_destroyed = False
+        if remaining_durability <= Decimal('0'):
+            protector_destroyed = True
+            remaining_durability = Decimal('0.0')
+        else:
+            remaining_durability = remaining_durability.quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)
+
+        # 累计护甲伤害
+        armor_damage_dealt = current_protector_durability - remaining_durability
+        state['total_armor_damage'] += armor_damage_dealt
+
+        if loadout['is_338_lap_mag'] or current_protector_durability >= armor_damage_value:
+            final_damage = protector['full_damage'][hit_part]
+        else:
+            # 耐久不足以吸收全部护甲伤害时，按剩余耐久占比拆分伤害
+            final_damage = split_damage(loadout, protector, hit_part, current_protector_durability)
+
+        # 更新耐久
+        state[durability_key] = remaining_durability
+
+        record.update({
+            'protected': True,
+            'protector': protector_type,
+            'penetration_multiplier': protector['penetration_multiplier'],
+            'armor_damage': armor_damage_dealt,
+            'protector_destroyed': protector_destroyed
+        })
+    else:
+        # 未受保护
+        final_damage = loadout['open_damage'][hit_part]
+
+    state['total_damage'] += final_damage
+    state['health'] -= final_damage
+    record['damage'] = final_damage
+    return record
+
+def _finish_record(record, state):
+    """记录本次攻击后的剩余状态"""
+    record['health'] = state['health']
+    record['helmet_durability'] = state['helmet_durability']
+    record['armor_durability'] = state['armor_durability']
+    record['killed'] = state['health'] <= Decimal('0')
+    return record
+
+def to_durability(value):
+    """耐久统一为保留1位小数的Decimal，与交互程序的输入处理一致（距离同理）"""
+    return Decimal(str(value)).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)
+
+def simulate(weapon, bullet, helmet_state=None, armor_state=None, distance=0, hits=()):
+    """按命中序列模拟一场交战，击杀后停止
+    helmet_state: {'level': 等级, 'durability': 耐久}，无头盔为None
+    armor_state: {'level': 等级, 'armor_type': 1半甲/2全甲/3重甲, 'durability': 耐久}，无护甲为None
+    返回逐发记录、是否击杀、击杀耗时(TTK)与最终状态
+    """
+    helmet_state = helmet_state or {}
+    armor_state = armor_state or {}
+    loadout = prepare_loadout(
+        weapon, bullet,
+        helmet_level=helmet_state.get('level', 0),
+        armor_level=armor_state.get('level', 0),
+        armor_type=armor_state.get('armor_type', 0),
+        distance=Decimal(str(distance)).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)
+    )
+    state = new_state(
+        to_durability(helmet_state.get('durability', 0)),
+        to_durability(armor_state.get('durability', 0))
+    )
+    return run_hits(loadout, state, hits)
+
+def run_summary(state, records, killed):
+    """交战结束后的汇总结果，records为逐发记录（不逐发记录时为None）"""
+    return {
+        'hits': records,
+        'killed': killed,
+        'shots': state['hit_count'],
+        'ttk': state['total_time'] if killed else None,
+        'total_time': state['total_time'],
+        'total_damage': state['total_damage'],
+        'total_armor_damage': state['total_armor_damage'],
+        'health': state['health'],
+        'helmet_durability': state['helmet_durability'],
+        'armor_durability': state['armor_durability'],
+        'hit_statistics': state['hit_statistics']
+    }
+
+def run_magazine(loadouts, state, hits, apply=apply_hit):
+    """混装弹匣：第n发用loadouts的第n个组合结算（同一武器、同口径的不同子弹，射击耗时只取决于武器），结果结构同run_hits"""
+    records = []
+    for loadout, hit_part in zip(loadouts, hits):
+        record = apply(loadout, state, hit_part)
+        records.append(record)
+        if record['killed']:
+            break
+    return run_summary(state, records, bool(records) and records[-1]['killed'])
+
+def run_hits(loadout, state, hits):
+    """在已准备好的组合上依次结算命中序列"""
+    return run_magazine(itertools.repeat(loadout), state, hits)
@@ -0,0 +1,419 @@
+import itertools
+from decimal import Decimal, ROUND_HALF_UP
+
+from gold_engine import (
+    VALID_PARTS, PLAYER_HEALTH, PROTECTED_AREAS, cached_constants, protector_constants, calculate_weapon_decay,
+    shot_time, split_damage, parse_shot, merge_pellets, run_magazine, run_summary
+)
+
+# 定点数版本的夺金伤害计算：伤害、生命值、时间以0.01为单位，耐久以0.1为单位，全部用整数计算
+# 各部位伤害、护甲伤害直接取自gold_engine预编译的组合常量并换算为整数，
+# 逐发结算只剩整数加减与比较，结果与Decimal引擎逐位一致
+# 只有“耐久不足以吸收全部护甲伤害”的那一发需要按比例拆分伤害，这一发仍用Decimal计算并按耐久缓存
+# 游程序列（run_fixed_runs）：一发的各弹丸都不受保护（无防护、耐久为0或不在保护范围内）时，
+# 之后连续相同的命中伤害不变，用整除直接算出击杀所需的发数，跳到击杀那一发或本段结束；
+# 单弹丸组合逐部位的结算函数、保护它的耐久字段与无防护伤害预先查好（_run_steps），逐段只需一次字典查询
+# 组合直接由gold_engine缓存的常量（cached_constants/protector_constants）拼成，不生成Decimal引擎的组合
+# 专用结算函数（specialize_fixed_hit）：各部位由哪类防护保护、是否为.338 Lap Mag在生成时确定，
+# 每个部位一个闭包，逐发只剩耐久判断与整数运算；函数保存在组合中，随组合一起缓存（cached_loadout）
+# 受保护命中的伤害与耐久规则只有一份（_protection_rule），专用结算函数、多弹丸的逐颗结算与protected_hit都使用它
+
+DAMAGE_SCALE = 100       # 伤害、生命值、时间：0.01
+DURABILITY_SCALE = 10    # 耐久：0.1
+SCALE_DIGITS = {DAMAGE_SCALE: 2, DURABILITY_SCALE: 1}
+UNIT = Decimal('1')
+
+# 结果字段的缩放倍数，除以该倍数即为原始数值
+RESULT_SCALES = {
+    'ttk': DAMAGE_SCALE,
+    'total_time': DAMAGE_SCALE,
+    'total_damage': DAMAGE_SCALE,
+    'health': DAMAGE_SCALE,
+    'damage': DAMAGE_SCALE,
+    'time': DAMAGE_SCALE,
+    'total_armor_damage': DURABILITY_SCALE,
+    'armor_damage': DURABILITY_SCALE,
+    'helmet_durability': DURABILITY_SCALE,
+    'armor_durability': DURABILITY_SCALE
+}
+
+def to_units(value, scale):
+    """Decimal按给定缩放四舍五入为整数（scale=100即保留2位小数），其他数值先按字符串转为Decimal"""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int((value * scale).quantize(UNIT, rounding=ROUND_HALF_UP))
+
+def from_units(value, scale):
+    """整数还原为Decimal，位数与gold_engine的结果一致"""
+    return Decimal(value).scaleb(-SCALE_DIGITS[scale])
+
+PROTECTED_AREA_SETS = {armor_type: frozenset(areas) for armor_type, areas in PROTECTED_AREAS.items()}
+
+def _protector(protector):
+    """防护（头盔/护甲）的整数常量，保存在gold_engine的防护常量中：
+    同一武器/子弹/衰减倍率下同等级防护的各个组合共用一份，拆分伤害缓存也一起共用
+    """
+    fixed = protector.get('fixed')
+    if fixed is not None:
+        return fixed
+    armor_value = protector['armor_damage_value']
+
+    # 护甲伤害换算为整数：放大10^digits倍后为整数，耐久乘以 10^(digits-1) 后可直接比较
+    digits = max(1, -armor_value.as_tuple().exponent)
+    fixed = protector['fixed'] = {
+        'source': protector,
+        'armor_value': int(armor_value.scaleb(digits)),
+        'durability_factor': 10 ** (digits - 1),
+        'full_damage': {part: to_units(damage, DAMAGE_SCALE) for part, damage in protector['full_damage'].items()},
+        'split_damage': {},  # (部位, 耐久) -> 拆分伤害
+        'rules': {},  # 部位 -> 受该防护保护时的结算规则
+        'hits': {True: {}, False: {}},  # 是否生成记录 -> {部位: 受该防护保护时的专用结算函数}
+        'steps': {}  # 部位 -> 受该防护保护时的游程结算信息（_run_steps）
+    }
+    return fixed
+
+def fixed_constants(decimal):
+    """与防护无关的整数常量：各部位无防护伤害、射击耗时缓存与无防护命中的专用结算函数
+    decimal为gold_engine与防护无关的常量（loadout_constants），整数常量保存在其engine_cache中，同一武器/子弹/衰减倍率的各组合共用
+    """
+    cache = decimal['engine_cache']
+    base = cache.get('fixed')
+    if base is None:
+        base = cache['fixed'] = {
+            'decimal': decimal,
+            'open_damage': {part: to_units(damage, DAMAGE_SCALE) for part, damage in decimal['open_damage'].items()},
+            'shot_times': [0],
+            'hits': {True: {}, False: {}},  # 是否生成记录 -> {部位: 不受保护时的专用结算函数}
+            'steps': None  # 全部部位都不受保护时的游程结算信息（_run_steps）
+        }
+    return base
+
+def prepare_fixed_loadout(weapon, bullet, helmet_level=0, armor_level=0, armor_type=0, distance=0):
+    """预先计算组合的整数常量，参数与gold_engine.prepare_loadout相同"""
+    constants = cached_constants(weapon, bullet, calculate_weapon_decay(float(distance), weapon))
+    base = fixed_constants(constants)
+    return {
+        'decimal': constants,  # 与防护无关的Decimal常量，拆分伤害与耗时仍按Decimal规则计算
+        'base': base,
+        'helmet_level': helmet_level,
+        'armor_level': armor_level,
+        'protected_areas': PROTECTED_AREA_SETS.get(armor_type, frozenset()),  # 没有护甲时为空
+        'open_damage': base['open_damage'],
+        'helmet': _protector(protector_constants(constants, helmet_level)),
+        'armor': _protector(protector_constants(constants, armor_level)),
+        'is_338_lap_mag': constants['is_338_lap_mag'],
+        'pellet_count': constants['pellet_count'],
+        'shot_times': base['shot_times']  # 射击耗时只取决于武器，各组合共用
+    }
+
+def _split_damage(loadout, protector, part, durability):
+    """耐久不足以吸收全部护甲伤害时的拆分伤害，按(部位, 耐久)缓存"""
+    key = (part, durability)
+    damage = protector['split_damage'].get(key)
+    if damage is None:
+        damage = to_units(
+            split_damage(loadout['decimal'], protector['source'], part, from_units(durability, DURABILITY_SCALE)),
+            DAMAGE_SCALE
+        )
+        protector['split_damage'][key] = damage
+    return damage
+
+def fixed_shot_time(loadout, hit_count):
+    """第hit_count发的累计耗时（0.01ms为单位），逐发使用时按顺序缓存；
+    游程一次跳过多发时直接计算，不填充中间各发
+    """
+    times = loadout['shot_times']
+    if hit_count < len(times):
+        return times[hit_count]
+    total_time = to_units(shot_time(loadout['decimal'], hit_count), DAMAGE_SCALE)
+    if hit_count == len(times):
+        times.append(total_time)
+    return total_time
+
+def new_fixed_state(helmet_durability=0, armor_durability=0):
+    """创建一场交战的初始状态，耐久以0.1为单位的整数给出"""
+    return {
+        'health': int(PLAYER_HEALTH * DAMAGE_SCALE),
+        'helmet_durability': helmet_durability,
+        'armor_durability': armor_durability,
+        'hit_count': 0,
+        'total_time': 0,
+        'total_damage': 0,
+        'total_armor_damage': 0,
+        'hit_statistics': {part: 0 for part in VALID_PARTS}
+    }
+
+def _protection_rule(base, protector, hit_part):
+    """部位受头盔/护甲保护时的结算规则rule(current) -> (伤害, 剩余耐久, 防护是否被击穿)，current为命中前耐久；
+    按部位缓存在该防护的整数常量中
+    """
+    rule = protector['rules'].get(hit_part)
+    if rule is not None:
+        return rule
+    factor, armor_value = protector['durability_factor'], protector['armor_value']
+    full_damage = protector['full_damage'][hit_part]
+    always_full = base['decimal']['is_338_lap_mag']
+
+    def rule(current):
+        # 剩余耐久：护甲伤害放大后为整数，耐久同倍数放大后相减，再四舍五入到0.1
+        scaled = current * factor
+        remaining = scaled - armor_value
+        protector_destroyed = remaining <= 0
+        remaining = 0 if protector_destroyed else (2 * remaining + factor) // (2 * factor)
+        damage = full_damage if always_full or scaled >= armor_value else _split_damage(base, protector, hit_part, current)
+        return damage, remaining, protector_destroyed
+    protector['rules'][hit_part] = rule
+    return rule
+
+def protected_hit(loadout, protector, current, hit_part):
+    """受头盔/护甲保护的一发命中：(伤害, 剩余耐久, 防护是否被击穿)，current为命中前耐久"""
+    return _protection_rule(loadout['base'], protector, hit_part)(current)
+
+def _strike(state, durability_key, rule):
+    """按规则结算一次受保护的命中，更新耐久、护甲伤害、伤害与生命值，返回(伤害, 护甲伤害, 防护是否被击穿)"""
+    current = state[durability_key]
+    damage, remaining, protector_destroyed = rule(current)
+    state[durability_key] = remaining
+    state['total_armor_damage'] += current - remaining
+    state['total_damage'] += damage
+    state['health'] -= damage
+    return damage, current - remaining, protector_destroyed
+
+def covering_protector(loadout, hit_part):
+    """保护该部位的防护类型（不看耐久）：'helmet'、'armor'，或None（未命中、无防护、不在保护范围内）"""
+    if hit_part == '头部':
+        return 'helmet' if loadout['helmet_level'] > 0 else None
+    if hit_part != '未命中' and loadout['armor_level'] > 0 and hit_part in loadout['protected_areas']:
+        return 'armor'
+    return None
+
+def protector_for(loadout, hit_part, helmet_durability, armor_durability):
+    """命中部位受哪类防护保护：'helmet'、'armor'，或None（未命中、无防护、耐久为0、不在保护范围内）"""
+    protector_type = covering_protector(loadout, hit_part)
+    if protector_type is None or (helmet_durability if protector_type == 'helmet' else armor_durability) <= 0:
+        return None
+    return protector_type
+
+def fixed_pellet(loadout, state, hit_part):
+    """结算一颗弹丸，返回该弹丸的记录（不含时间与剩余状态）"""
+    state['hit_statistics'][hit_part] += 1
+    record = {'part': hit_part, 'protected': False, 'protector': None, 'armor_damage': 0, 'protector_destroyed': False, 'damage': 0}
+    if hit_part == '未命中':
+        return record
+    protector_type = protector_for(loadout, hit_part, state['helmet_durability'], state['armor_durability'])
+    if protector_type is not None:
+        rule = _protection_rule(loadout['base'], loadout[protector_type], hit_part)
+        damage, armor_damage, protector_destroyed = _strike(state, f'{protector_type}_durability', rule)
+        record.update({
+            'protected': True,
+            'protector': protector_type,
+            'armor_damage': armor_damage,
+            'protector_destroyed': protector_destroyed
+        })
+    else:
+        damage = loadout['open_damage'][hit_part]
+        state['total_damage'] += damage
+        state['health'] -= damage
+    record['damage'] = damage
+    return record
+
+def apply_fixed_shot(loadout, state, hit_part):
+    """多弹丸子弹的一发：各弹丸依次结算（格式见gold_engine.parse_shot），记录结构与gold_engine.apply_hit相同"""
+    pellets = parse_shot(hit_part, loadout['pellet_count'])
+    state['hit_count'] += 1
+    state['total_time'] = fixed_shot_time(loadout, state['hit_count'])
+    record = merge_pellets(hit_part, [fixed_pellet(loadout, state, part) for part in pellets])
+    record.update({
+        'shot': state['hit_count'],
+        'time': state['total_time'],
+        'health': state['health'],
+        'helmet_durability': state['helmet_durability'],
+        'armor_durability': state['armor_durability'],
+        'killed': state['health'] <= 0
+    })
+    return record
+
+def _open_hit(base, hit_part, records):
+    """不受保护（或未命中）的一发的专用结算函数hit(state)，按部位缓存在fixed_constants中"""
+    hit = base['hits'][records].get(hit_part)
+    if hit is not None:
+        return hit
+    open_damage = base['open_damage'].get(hit_part, 0)  # 未命中为0
+    times = base['shot_times']
+
+    def hit(state):
+        state['hit_statistics'][hit_part] += 1
+        hit_count = state['hit_count'] = state['hit_count'] + 1
+        total_time = state['total_time'] = times[hit_count] if hit_count < len(times) else fixed_shot_time(base, hit_count)
+        state['total_damage'] += open_damage
+        health = state['health'] = state['health'] - open_damage
+        if not records:
+            return health <= 0
+        return {
+            'shot': hit_count, 'part': hit_part, 'protected': False, 'protector': None, 'armor_damage': 0,
+            'protector_destroyed': False, 'damage': open_damage, 'time': total_time, 'health': health,
+            'helmet_durability': state['helmet_durability'], 'armor_durability': state['armor_durability'], 'killed': health <= 0
+        }
+    base['hits'][records][hit_part] = hit
+    return hit
+
+def _protected_hit(base, protector, protector_type, hit_part, records):
+    """受头盔/护甲保护的部位的专用结算函数hit(state)，耐久为0时按不受保护结算；按部位缓存在该防护的整数常量中"""
+    hit = protector['hits'][records].get(hit_part)
+    if hit is not None:
+        return hit
+    open_hit = _open_hit(base, hit_part, records)
+    times = base['shot_times']
+    durability_key = f'{protector_type}_durability'
+    rule = _protection_rule(base, protector, hit_part)
+
+    def hit(state):
+        current = state[durability_key]
+        if current <= 0:
+            return open_hit(state)
+        state['hit_statistics'][hit_part] += 1
+        hit_count = state['hit_count'] = state['hit_count'] + 1
+        total_time = state['total_time'] = times[hit_count] if hit_count < len(times) else fixed_shot_time(base, hit_count)
+        damage, remaining, protector_destroyed = rule(current)
+        armor_damage = current - remaining
+        state[durability_key] = remaining
+        state['total_armor_damage'] += armor_damage
+        state['total_damage'] += damage
+        health = state['health'] = state['health'] - damage
+        if not records:
+            return health <= 0
+        return {
+            'shot': hit_count, 'part': hit_part, 'protected': True, 'protector': protector_type, 'armor_damage': armor_damage,
+            'protector_destroyed': protector_destroyed, 'damage': damage, 'time': total_time, 'health': health,
+            'helmet_durability': state['helmet_durability'], 'armor_durability': state['armor_durability'], 'killed': health <= 0
+        }
+    protector['hits'][records][hit_part] = hit
+    return hit
+
+def _part_hit(loadout, hit_part, records):
+    """单弹丸组合命中某部位的专用结算函数hit(state)，返回本次攻击的记录（数值为整数，缩放见RESULT_SCALES）；
+    records为False时只返回是否击杀。函数只取决于部位、保护它的那类防护与武器/子弹常量，缓存在共用的常量中，新组合不必重新生成
+    """
+    protector_type = covering_protector(loadout, hit_part)
+    if protector_type is None:
+        return _open_hit(loadout['base'], hit_part, records)
+    return _protected_hit(loadout['base'], loadout[protector_type], protector_type, hit_part, records)
+
+def specialize_fixed_hit(loadout, records=True):
+    """组合的专用结算函数hit(state, hit_part)：结算一次攻击并更新状态，返回本次攻击的记录（结构同gold_engine.apply_hit）
+    records为False时不生成逐发记录，只返回是否击杀（游程、检查点等只需要状态的场合）
+    多弹丸子弹与“头部*1”之类的写法仍走apply_fixed_shot
+    """
+    key = 'specialized_hit' if records else 'specialized_step'
+    hit = loadout.get(key)
+    if hit is not None:
+        return hit
+    if loadout['pellet_count'] != 1:
+        if records:
+            hit = lambda state, hit_part: apply_fixed_shot(loadout, state, hit_part)
+        else:
+            hit = lambda state, hit_part: apply_fixed_shot(loadout, state, hit_part)['killed']
+    else:
+        handlers = {part: _part_hit(loadout, part, records) for part in VALID_PARTS}
+
+        def hit(state, hit_part):
+            handler = handlers.get(hit_part)
+            if handler is not None:
+                return handler(state)
+            record = apply_fixed_shot(loadout, state, hit_part)
+            return record if records else record['killed']
+    loadout[key] = hit
+    return hit
+
+def apply_specialized_hit(loadout, state, hit_part):
+    """用组合的专用结算函数结算一次攻击并更新状态，返回本次攻击的记录（数值为整数，缩放见RESULT_SCALES）"""
+    return specialize_fixed_hit(loadout)(state, hit_part)
+
+def run_fixed_hits(loadout, state, hits):
+    """在已准备好的组合上依次结算命中序列，结果结构与gold_engine.run_hits相同（数值为整数）"""
+    return run_magazine(itertools.repeat(loadout), state, hits, apply_specialized_hit)
+
+def run_fixed_magazine(loadouts, state, hits):
+    """混装弹匣：第n发用loadouts的第n个组合结算，见gold_engine.run_magazine"""
+    return run_magazine(loadouts, state, hits, apply_specialized_hit)
+
+def stable_damage(loadout, state, parts):
+    """一发中各弹丸都不受保护时的总伤害（之后连续相同的命中伤害不变），有弹丸受保护时为None"""
+    damage = 0
+    for part in parts:
+        if part == '未命中':
+            continue
+        if protector_for(loadout, part, state['helmet_durability'], state['armor_durability']) is not None:
+            return None
+        damage += loadout['open_damage'][part]
+    return damage
+
+def _advance_stable(loadout, state, parts, damage, count):
+    """伤害不变的连续count发一次算完，击杀时停在击杀那一发，返回本段剩余的发数"""
+    hits = count if damage == 0 else min(count, -(-state['health'] // damage))
+    for part in parts:
+        state['hit_statistics'][part] += hits
+    state['hit_count'] += hits
+    state['total_time'] = fixed_shot_time(loadout, state['hit_count'])
+    state['total_damage'] += damage * hits
+    state['health'] -= damage * hits
+    return count - hits
+
+def _protected_step(base, protector, protector_type, part):
+    """部位受该防护保护时的游程结算信息，按部位缓存在该防护的整数常量中"""
+    step = protector['steps'].get(part)
+    if step is None:
+        step = protector['steps'][part] = (
+            _protected_hit(base, protector, protector_type, part, False), f'{protector_type}_durability', base['open_damage'][part]
+        )
+    return step
+
+def _run_steps(loadout):
+    """单弹丸组合逐部位的游程结算信息{部位: (只返回是否击杀的专用结算函数, 保护该部位的耐久字段或None, 无防护伤害)}，保存在组合中
+    先复制全部部位都不受保护时的一份（缓存在fixed_constants中），再换上受头盔/护甲保护的部位
+    """
+    steps = loadout.get('run_steps')
+    if steps is None:
+        base = loadout['base']
+        if base['steps'] is None:
+            base['steps'] = {part: (_open_hit(base, part, False), None, base['open_damage'].get(part, 0)) for part in VALID_PARTS}  # 未命中为0
+        steps = loadout['run_steps'] = dict(base['steps'])
+        if loadout['helmet_level'] > 0:
+            steps['头部'] = _protected_step(base, loadout['helmet'], 'helmet', '头部')
+        if loadout['armor_level'] > 0:
+            for part in loadout['protected_areas']:
+                steps[part] = _protected_step(base, loadout['armor'], 'armor', part)
+    return steps
+
+def run_fixed_runs(loadout, state, runs):
+    """结算游程序列[(一发的命中, 连续发数)]，结果结构同run_fixed_hits，但不含逐发记录（hits为None）
+    受保护的命中逐发结算，防护耗尽（或本来就不受保护）后的连续命中一次算完
+    """
+    steps = _run_steps(loadout) if loadout['pellet_count'] == 1 else {}
+    hit = None
+    for shot, count in runs:
+        step = steps.get(shot)
+        if step is not None:
+            part_hit, durability_key, damage = step
+            if durability_key is not None:
+                while count > 0 and state[durability_key] > 0:
+                    count -= 1
+                    if part_hit(state):
+                        break
+            if count > 0 and state['health'] > 0:
+                _advance_stable(loadout, state, (shot,), damage, count)
+        else:
+            # 多弹丸子弹与“头部*1”之类的写法
+            hit = hit or specialize_fixed_hit(loadout, records=False)
+            parts = parse_shot(shot, loadout['pellet_count'])
+            while count > 0 and state['health'] > 0:
+                damage = stable_damage(loadout, state, parts)
+                if damage is None:
+                    hit(state, shot)
+                    count -= 1
+                else:
+                    count = _advance_stable(loadout, state, parts, damage, count)
+        if state['health'] <= 0:
+            break
+
+    return run_summary(state, None, state['health'] <= 0)
@@ -0,0 +1,142 @@
+import numpy as np
+
+from gold_batch import resolve_equipment, write_results
+from gold_engine import PLAYER_HEALTH, to_durability
+from gold_fixed import DURABILITY_SCALE, to_units
+from gold_sweep import HIT_PATTERNS, MAX_SHOTS, pattern_parts
+from gold_vector import HEAD, MISS, PART_INDEX, prepare_vector_loadout, new_vector_state, apply_vector_hit, apply_vector_shot
+
+# 头盔耐久×护甲耐久热力图：固定命中方式下，对两种耐久（0.1步长，0到最大耐久）的整个网格求击杀枪数
+#
+# 每一发只命中一种防护（头部为头盔，护甲保护的部位为护甲，其余部位不受保护），伤害只取决于该防护的耐久，
+# 因此前n发的累计伤害 = 头部命中的累计伤害（只随头盔耐久变化）+ 其余命中的累计伤害（只随护甲耐久变化）
+# 两条轴各用数组引擎推进一遍命中序列（逐发伤害与整格直接计算一致），网格上只需逐发比较累计伤害：
+# 累计伤害随枪数不减，击杀枪数 = 1 + 累计伤害仍低于生命值的发数；全部格子都已击杀或都未击杀的发数不必比较
+#
+# 等枪数线（contours）：对每个枪数n，按头盔耐久列出从护甲耐久0起连续能在n枪内击杀的最大护甲耐久，
+# 相同的相邻头盔耐久合并为一段
+
+DEFAULT_PATTERN = '先头后胸'
+NO_KILL_HEALTH = 2 ** 40  # 推进累计伤害时使用的生命值，保证序列内不会击杀
+
+def durability_axis(record):
+    """0到最大耐久、步长0.1的耐久轴，无防护时只有耐久0"""
+    if record is None:
+        return np.zeros(1)
+    return np.arange(to_units(record['max_durability'], DURABILITY_SCALE) + 1) / DURABILITY_SCALE
+
+def cumulative_damage(loadout, helmet_state, armor_state, parts):
+    """两条轴同时按部位编号序列推进：头盔轴只结算头部命中，护甲轴结算其余命中（不受护甲保护的部位同样与耐久无关）
+    返回两条轴前0..n发的累计伤害（0.01为单位），推进到两条轴的最小累计伤害之和已达到生命值为止
+    """
+    health = int(PLAYER_HEALTH * 100)
+    pellets = loadout['pellet_count']
+    damage = {'helmet': [np.zeros(helmet_state['health'].shape, dtype=np.int64)], 'armor': [np.zeros(armor_state['health'].shape, dtype=np.int64)]}
+    for part in parts:
+        for kind, state in (('helmet', helmet_state), ('armor', armor_state)):
+            axis_part = part if (part == HEAD) == (kind == 'helmet') else MISS
+            if pellets == 1:
+                apply_vector_hit(loadout, state, axis_part)
+            else:
+                apply_vector_shot(loadout, state, np.full(pellets, axis_part))
+            damage[kind].append(NO_KILL_HEALTH - state['health'])
+        if damage['helmet'][-1].min() + damage['armor'][-1].min() >= health:
+            break
+    return np.array(damage['helmet']), np.array(damage['armor'])
+
+def kill_grid(helmet_damage, armor_damage):
+    """两条轴的累计伤害 -> 击杀枪数网格（头盔耐久×护甲耐久，未击杀为0）"""
+    health = int(PLAYER_HEALTH * 100)
+    dtype = np.uint8 if len(helmet_damage) < 256 else np.uint16
+    # 头盔部分还差多少伤害（int32足够，比较更快）
+    need = (health - helmet_damage).astype(np.int32)
+    armor_damage = armor_damage.astype(np.int32)
+    alive = np.zeros((helmet_damage.shape[1], armor_damage.shape[1]), dtype=dtype)  # 仍未击杀的发数
+    uniform = 0  # 全部格子都未击杀的发数
+    for n in range(1, len(helmet_damage)):
+        if need[n].min() > armor_damage[n].max():
+            uniform += 1
+            continue
+        if need[n].max() <= armor_damage[n].min():
+            break
+        alive += armor_damage[n][None, :] < need[n][:, None]
+    killed = armor_damage[-1][None, :] >= need[-1][:, None]
+    return np.where(killed, alive + (uniform + 1), 0).astype(dtype)
+
+def shot_contours(shots, helmet_axis, armor_axis):
+    """等枪数线：[{'shots': n, 'boundary': [[头盔耐久起, 头盔耐久止, 最大护甲耐久]]}]，该段内0耐久也无法在n枪内击杀时最大护甲耐久为None"""
+    contours = []
+    # 每行从护甲耐久0起的枪数累计最大值（未击杀视为最大），不超过n的格数即从0起连续满足的格数
+    running = np.maximum.accumulate(np.where(shots > 0, shots, np.iinfo(shots.dtype).max), axis=1)
+    for count in np.unique(shots[shots > 0]):
+        reach = (running <= count).sum(axis=1)
+        boundary = []
+        starts = np.flatnonzero(np.diff(reach, prepend=-1))
+        ends = np.append(starts[1:], len(reach)) - 1
+        for start, end in zip(starts, ends):
+            boundary.append([
+                float(helmet_axis[start]), float(helmet_axis[end]),
+                float(armor_axis[reach[start] - 1]) if reach[start] > 0 else None
+            ])
+        contours.append({'shots': int(count), 'boundary': boundary})
+    return contours
+
+def durability_heatmap(weapon, bullet, helmet=None, armor=None, distance=0, pattern=DEFAULT_PATTERN):
+    """武器/子弹对某头盔与护甲的热力图：{'helmet_durability': 头盔耐久轴, 'armor_durability': 护甲耐久轴,
+    'shots': 击杀枪数网格（行为头盔耐久，列为护甲耐久，未击杀为0）, 'contours': 等枪数线}
+    """
+    if pattern not in HIT_PATTERNS:
+        raise ValueError(f"无效的命中方式: {pattern}（可选：{'、'.join(HIT_PATTERNS)}）")
+    loadout = prepare_vector_loadout(weapon, bullet, float(distance))
+    helmet_axis, armor_axis = durability_axis(helmet), durability_axis(armor)
+    parts = [PART_INDEX[part] for part in pattern_parts(pattern, MAX_SHOTS)]
+
+    helmet_state = new_vector_state(helmet_axis.shape, helmet_level=helmet['level'] if helmet else 0, helmet_durability=helmet_axis)
+    armor_state = new_vector_state(
+        armor_axis.shape,
+        armor_level=armor['level'] if armor else 0, armor_type=armor['armor_type'] if armor else 0, armor_durability=armor_axis
+    )
+    for state in (helmet_state, armor_state):
+        state['health'][...] = NO_KILL_HEALTH
+    shots = kill_grid(*cumulative_damage(loadout, helmet_state, armor_state, parts))
+    return {
+        'helmet_durability': helmet_axis,
+        'armor_durability': armor_axis,
+        'shots': shots,
+        'contours': shot_contours(shots, helmet_axis, armor_axis)
+    }
+
+def run_length_rows(shots):
+    """网格逐行游程编码：每行为[[连续格数, 枪数], ...]"""
+    rows = []
+    for row in shots:
+        starts = np.flatnonzero(np.diff(row, prepend=-1))
+        lengths = np.diff(np.append(starts, len(row)))
+        rows.append([[int(length), int(row[start])] for start, length in zip(starts, lengths)])
+    return rows
+
+def run_heatmap_scenario(store, scenario, details=False):
+    """对一个场景（武器、子弹、头盔、护甲、距离、命中方式pattern）生成热力图，details=True时附带逐行游程编码的网格"""
+    scenario = dict(scenario, helmet_durability=None, armor_durability=None)  # 耐久取整条轴，场景中的耐久不使用
+    weapon, bullet, helmet, _, armor, _ = resolve_equipment(store, scenario)
+    distance = to_durability(scenario.get('distance') or 0)
+    pattern = scenario.get('pattern') or DEFAULT_PATTERN
+    heatmap = durability_heatmap(weapon, bullet, helmet, armor, distance, pattern)
+
+    result = {
+        'weapon': weapon['name'],
+        'bullet': bullet['name'],
+        'helmet': helmet['name'] if helmet else None,
+        'armor': armor['name'] if armor else None,
+        'distance': float(distance),
+        'pattern': pattern,
+        'shape': list(heatmap['shots'].shape),  # (头盔耐久格数, 护甲耐久格数)，步长0.1，从0开始
+        'contours': heatmap['contours']
+    }
+    if details:
+        result['grid'] = run_length_rows(heatmap['shots'])
+    return result
+
+def run_heatmap_batch(store, scenarios, output, details=False):
+    """逐条生成热力图并写出JSONL，返回(成功数, 失败数)"""
+    return write_results(scenarios, output, lambda scenario: run_heatmap_scenario(store, scenario, details))
@@ -0,0 +1,47 @@
+from gold_engine import apply_hit
+
+# 命中记录与逐发检查点：每发结算后保存一份交战状态（生命值、头盔/护甲耐久、累计耗时、命中统计）
+# 撤销最近N发只需丢弃检查点；修改第k发时从第k-1发的检查点开始，只重新结算第k发及之后的命中
+
+def copy_state(state):
+    """复制交战状态（命中统计单独复制，其余字段为不可变的数值）"""
+    copied = dict(state)
+    copied['hit_statistics'] = dict(state['hit_statistics'])
+    return copied
+
+def new_history(state):
+    """以初始状态创建命中记录：checkpoints[n]为第n发结算后的状态，records[n-1]为第n发的记录"""
+    return {'checkpoints': [copy_state(state)], 'records': []}
+
+def current_state(history):
+    """当前（最后一发结算后）的状态，只读"""
+    return history['checkpoints'][-1]
+
+def push_hit(loadout, history, hit_part):
+    """在最后一个检查点上结算一发命中并保存新的检查点，返回本次攻击的记录"""
+    state = copy_state(history['checkpoints'][-1])
+    record = apply_hit(loadout, state, hit_part)
+    history['checkpoints'].append(state)
+    history['records'].append(record)
+    return record
+
+def rewind(history, count=1):
+    """撤销最近count发命中，返回实际撤销的发数"""
+    count = min(count, len(history['records']))
+    if count > 0:
+        del history['checkpoints'][-count:]
+        del history['records'][-count:]
+    return count
+
+def edit_hit(loadout, history, index, hit_part):
+    """把第index发（从1开始）改为hit_part，从第index-1发的检查点开始重新结算之后的命中
+    修改后提前击杀时，之后的命中作废；返回作废的发数
+    """
+    later_parts = [record['part'] for record in history['records'][index:]]
+    rewind(history, len(history['records']) - index + 1)
+    record = push_hit(loadout, history, hit_part)
+    for i, part in enumerate(later_parts):
+        if record['killed']:
+            return len(later_parts) - i
+        record = push_hit(loadout, history, part)
+    return 0
@@ -0,0 +1,152 @@
+import itertools
+from decimal import InvalidOperation
+
+from data_store import bullets_for_caliber, find_record
+from gold_batch import resolve_protection, write_results
+from gold_engine import cached_loadout, to_durability
+from gold_fixed import DURABILITY_SCALE, RESULT_SCALES, prepare_fixed_loadout, new_fixed_state, specialize_fixed_hit, fixed_shot_time, run_fixed_runs, to_units
+from gold_history import copy_state
+from gold_sweep import HIT_PATTERNS, MAX_SHOTS, pattern_parts
+
+# 混装弹匣的最优切换点：先装k发子弹A（通常是穿甲弹，先打掉护甲），之后全是子弹B，求击杀耗时最短的组合与k
+#
+# 每种子弹的组合常量只预编译一次（LRU缓存），按命中方式推进一遍并保存每发之后的检查点（同gold_history）；
+# “前k发用A、之后用B”直接从A的第k个检查点开始用B结算剩下的命中，前k发不再重复计算。
+# 剩下的命中按游程结算（gold_fixed.run_fixed_runs），B打穿防护之后的连续命中一次算完，
+# 因此一对子弹的全部切换点合起来只比单独模拟一次多几发的计算量
+# 前k发未击杀时击杀耗时至少是第k+1发的耗时，已不可能比只用A、只用B或这对子弹当前最好的切换点更快时，更大的k不再计算
+# （不比只用其中一种子弹更快的切换没有意义，不列出）
+
+DEFAULT_PATTERN = '全部胸部'
+DEFAULT_TOP = 10  # 列出的弹匣数
+
+def bullet_checkpoints(loadout, state, parts):
+    """同一种子弹按命中序列推进，返回每发之后的状态（第0项为初始状态），击杀的那一发为最后一项"""
+    hit = specialize_fixed_hit(loadout, records=False)
+    checkpoints = [copy_state(state)]
+    for part in parts:
+        killed = hit(state, part)
+        checkpoints.append(copy_state(state))
+        if killed:
+            break
+    return checkpoints
+
+def magazine_row(magazine, state):
+    """一种弹匣的击杀结果，magazine为[[子弹名称, 发数]]，最后一种子弹的发数为None（打到击杀为止）"""
+    return {
+        'magazine': magazine,
+        'shots': state['hit_count'],
+        'ttk': state['total_time'] / RESULT_SCALES['ttk'],
+        'armor_damage': state['total_armor_damage'] / RESULT_SCALES['total_armor_damage']
+    }
+
+def best_split(first, then, checkpoints, suffix_runs, best_time=None):
+    """前k发用first（first的检查点）、之后用then的最快切换点：((耗时, 枪数, k, 结束状态), 计算的切换点数)
+    都无法击杀时为None；best_time为只用其中一种子弹的最短击杀耗时，不比它更快的切换点不列出
+    """
+    best, count = None, 0
+    # 第k个检查点之后切换；最后一个检查点之后全是first，不算切换
+    for k in range(1, len(checkpoints) - 1):
+        limit = best[0] if best else best_time
+        if limit is not None and fixed_shot_time(first, k + 1) >= limit:  # 前k发未击杀，耗时至少是第k+1发
+            break
+        count += 1
+        state = copy_state(checkpoints[k])
+        result = run_fixed_runs(then, state, suffix_runs[k])
+        if not result['killed'] or (best_time is not None and result['ttk'] >= best_time):
+            continue
+        if best is None or (result['ttk'], result['shots']) < best[:2]:
+            best = (result['ttk'], result['shots'], k, state)
+    return best, count
+
+def mixed_magazines(weapon, bullets, helmet=None, helmet_durability=None, armor=None, armor_durability=None, distance=0, pattern=DEFAULT_PATTERN):
+    """武器的各子弹两两组成“前k发A、之后全是B”的弹匣（也包括只用一种子弹），求每种组合最快的切换点
+    返回{'rows': [各弹匣结果，按击杀耗时、枪数排序，无法击杀的不列出], 'splits': 计算的切换点数, 'skipped': [数据不完整的子弹]}
+    """
+    if pattern not in HIT_PATTERNS:
+        raise ValueError(f"无效的命中方式: {pattern}（可选：{'、'.join(HIT_PATTERNS)}）")
+    parts = pattern_parts(pattern, MAX_SHOTS)
+    # 第k发之后剩下的命中（游程）
+    suffix_runs = [[(part, len(list(group))) for part, group in itertools.groupby(parts[k:])] for k in range(MAX_SHOTS)]
+
+    loadouts, checkpoints, skipped = {}, {}, []
+    for bullet in bullets:
+        try:
+            loadout = cached_loadout(
+                weapon, bullet,
+                helmet_level=helmet['level'] if helmet else 0,
+                armor_level=armor['level'] if armor else 0,
+                armor_type=armor['armor_type'] if armor else 0,
+                distance=distance,
+                prepare=prepare_fixed_loadout
+            )
+            state = new_fixed_state(to_units(helmet_durability, DURABILITY_SCALE), to_units(armor_durability, DURABILITY_SCALE))
+            checkpoints[bullet['name']] = bullet_checkpoints(loadout, state, parts)
+        except (InvalidOperation, TypeError, ValueError):
+            skipped.append(bullet['name'])
+            continue
+        loadouts[bullet['name']] = loadout
+
+    # 只用一种子弹的击杀耗时
+    singles = {}
+    for name, points in checkpoints.items():
+        if points[-1]['health'] <= 0:
+            singles[name] = points[-1]['total_time']
+
+    rows, splits = [], 0
+    for first in loadouts:
+        if first in singles:
+            rows.append(magazine_row([[first, None]], checkpoints[first][-1]))
+        for then in loadouts:
+            if then == first:
+                continue
+            single = min((singles[name] for name in (first, then) if name in singles), default=None)
+            best, count = best_split(loadouts[first], loadouts[then], checkpoints[first], suffix_runs, single)
+            splits += count
+            if best is not None:
+                rows.append(magazine_row([[first, best[2]], [then, None]], best[3]))
+    rows.sort(key=lambda row: (row['ttk'], row['shots'], len(row['magazine'])))
+    return {'rows': rows, 'splits': splits, 'skipped': skipped}
+
+def run_mixed_scenario(store, scenario):
+    """对一个场景（武器、目标防护、距离、命中方式pattern、排名数量top）给出最快的混装弹匣，bullet填写时只列出含该子弹的弹匣"""
+    weapon = find_record(store, 'weapons', scenario.get('weapon'))
+    if weapon is None:
+        raise ValueError(f"未找到武器: {scenario.get('weapon')}")
+    bullets = bullets_for_caliber(store, weapon['caliber'])
+    if not bullets:
+        raise ValueError(f"没有 {weapon['raw_caliber']} 口径的子弹")
+    helmet, helmet_durability = resolve_protection(store, 'helmets', scenario.get('helmet'), scenario.get('helmet_durability'))
+    armor, armor_durability = resolve_protection(store, 'armors', scenario.get('armor'), scenario.get('armor_durability'))
+    distance = to_durability(scenario.get('distance') or 0)
+    pattern = scenario.get('pattern') or DEFAULT_PATTERN
+    try:
+        top = int(scenario.get('top') or DEFAULT_TOP)
+    except ValueError:
+        raise ValueError("排名数量应为正整数")
+    if top < 1:
+        raise ValueError("排名数量应为正整数")
+
+    search = mixed_magazines(weapon, bullets, helmet, helmet_durability, armor, armor_durability, distance, pattern)
+    rows = search['rows']
+    if scenario.get('bullet'):
+        bullet = find_record(store, 'bullets', scenario['bullet'])
+        if bullet is None or bullet not in bullets:
+            raise ValueError(f"{weapon['name']}（{weapon['raw_caliber']}）没有这种子弹: {scenario['bullet']}")
+        rows = [row for row in rows if any(name == bullet['name'] for name, _ in row['magazine'])]
+    return {
+        'weapon': weapon['name'],
+        'helmet': helmet['name'] if helmet else None,
+        'helmet_durability': float(helmet_durability),
+        'armor': armor['name'] if armor else None,
+        'armor_durability': float(armor_durability),
+        'distance': float(distance),
+        'pattern': pattern,
+        'ranking': rows[:top],
+        'splits': search['splits'],
+        'skipped': search['skipped']
+    }
+
+def run_mixed_batch(store, scenarios, output):
+    """逐条求最快的混装弹匣并写出JSONL，返回(成功数, 失败数)"""
+    return write_results(scenarios, output, lambda scenario: run_mixed_scenario(store, scenario))
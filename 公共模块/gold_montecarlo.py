@@ -0,0 +1,187 @@
+from decimal import InvalidOperation
+
+import numpy as np
+
+from gold_batch import resolve_equipment, write_results
+from gold_engine import to_durability
+from gold_vector import PART_ORDER, prepare_vector_loadout, new_vector_state, select_vector_state, specialize_vector_hit, apply_vector_shot, shot_times
+
+# 蒙特卡洛交战模拟：按各部位命中概率随机生成命中序列，大量试验一起做数组运算（gold_vector）
+# 护甲保护范围、耐久消耗与gold_engine逐发计算完全一致，统计击杀枪数与击杀耗时的分布
+#
+# 命中概率：{部位: 权重}，部位为头部/胸部/腹部/下腹部/大臂/小臂/大腿/小腿/未命中，权重会自动归一化
+# 按距离变化时写成 {距离: {部位: 权重}}，某距离使用不超过该距离的最大距离档的概率
+# 多弹丸子弹（霰弹等）每颗弹丸按同一概率分别抽取命中部位
+# CSV场景可直接用部位名称作列名填写权重
+
+DEFAULT_HIT_PROBABILITIES = {
+    '头部': 0.1,
+    '胸部': 0.25,
+    '腹部': 0.15,
+    '下腹部': 0.05,
+    '大臂': 0.1,
+    '小臂': 0.05,
+    '大腿': 0.1,
+    '小腿': 0.05,
+    '未命中': 0.15
+}
+
+DEFAULT_TRIALS = 100000
+CHUNK_TRIALS = 100000  # 每批同时模拟的试验数，限制内存占用
+MAX_SHOTS = 100  # 超过该枪数仍未击杀时记为未击杀
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+def normalize_probabilities(weights):
+    """{部位: 权重} -> 按PART_ORDER排列并归一化的概率数组"""
+    probabilities = np.zeros(len(PART_ORDER))
+    for part, weight in weights.items():
+        if part not in PART_ORDER:
+            raise ValueError(f"无效的命中部位: {part}")
+        weight = float(weight or 0)
+        if weight < 0:
+            raise ValueError(f"{part} 的命中概率不能为负数")
+        probabilities[PART_ORDER.index(part)] = weight
+    total = probabilities.sum()
+    if total <= 0:
+        raise ValueError("命中概率之和必须大于0")
+    return probabilities / total
+
+def parse_distribution(spec):
+    """命中概率 -> [(起始距离, 概率数组)]，按距离从小到大排列"""
+    if not spec:
+        spec = DEFAULT_HIT_PROBABILITIES
+    if all(isinstance(value, dict) for value in spec.values()):
+        bands = [(float(distance), normalize_probabilities(weights)) for distance, weights in spec.items()]
+        return sorted(bands, key=lambda band: band[0])
+    return [(0.0, normalize_probabilities(spec))]
+
+def distribution_at(distribution, distance):
+    """取某距离适用的概率数组（不超过该距离的最大距离档，距离小于全部档位时取第一档）"""
+    probabilities = distribution[0][1]
+    for start, band in distribution:
+        if distance >= start:
+            probabilities = band
+    return probabilities
+
+def scenario_distribution(scenario):
+    """读取场景中的命中概率：probabilities字段，或以部位名称为键的字段（CSV列）"""
+    spec = scenario.get('probabilities')
+    if not spec:
+        spec = {part: scenario[part] for part in PART_ORDER if scenario.get(part) not in (None, '')}
+    return parse_distribution(spec)
+
+def scenario_distances(scenario):
+    """读取场景中的距离：distances列表（或逗号分隔字符串），否则为单个distance
+    与其他计算一样保留1位小数（to_durability），保证衰减段与逐发计算一致；距离不能为负数
+    """
+    distances = scenario.get('distances')
+    if distances in (None, ''):
+        distances = [scenario.get('distance') or 0]
+    elif isinstance(distances, str):
+        distances = [value for value in distances.replace('，', ',').split(',') if value.strip()]
+    result = []
+    for value in distances:
+        try:
+            distance = to_durability(value)
+        except InvalidOperation:
+            raise ValueError(f"无效的距离: {value}")
+        if distance.is_signed():  # 包括舍入后为-0.0的情况
+            raise ValueError(f"距离不能为负数: {value}")
+        result.append(float(distance))
+    return result
+
+def simulate_trials(weapon, bullet, protection, distances, probabilities, trials, rng):
+    """模拟trials次交战，返回击杀枪数矩阵（试验×距离，未击杀为0）
+    protection: (头盔等级, 头盔耐久, 护甲等级, 护甲类型, 护甲耐久)
+    probabilities: 距离×部位的概率矩阵
+    """
+    loadout = prepare_vector_loadout(weapon, bullet, distances)
+    weapon_decay = loadout['weapon_decay']
+    pellets = loadout['pellet_count']
+    # 全部试验的防护相同，单弹丸子弹使用按距离×部位预先算好的专用结算函数
+    hit = specialize_vector_hit(loadout, protection[0], protection[2], protection[3]) if pellets == 1 else None
+    cumulative = np.cumsum(probabilities, axis=1)
+    cumulative[:, -1] = 1.0  # 避免浮点累加误差导致抽不到最后一个部位
+    results = []
+    for start in range(0, trials, CHUNK_TRIALS):
+        # 试验×距离展平为一维，已击杀的交战每发之后剔除，只计算仍存活的部分
+        size = min(CHUNK_TRIALS, trials - start) * len(distances)
+        shots = np.zeros(size, dtype=np.int32)
+        index = np.arange(size)
+        distance_index = index % len(distances)
+        state = new_vector_state((size,), *protection)
+        for _ in range(MAX_SHOTS):
+            draws = rng.random((len(index), pellets))
+            parts = np.empty((len(index), pellets), dtype=np.intp)
+            for i in range(len(distances)):
+                at_distance = distance_index == i
+                parts[at_distance] = np.searchsorted(cumulative[i], draws[at_distance], side='right')
+            if hit is not None:
+                hit(state, parts[:, 0], distance_index)
+            else:
+                loadout['weapon_decay'] = weapon_decay[distance_index]
+                apply_vector_shot(loadout, state, parts)
+
+            finished = state['shots'] > 0
+            shots[index[finished]] = state['shots'][finished]
+            alive = ~finished
+            if not alive.any():
+                break
+            index, distance_index = index[alive], distance_index[alive]
+            state = select_vector_state(state, alive)
+        results.append(shots.reshape(-1, len(distances)))
+    return np.concatenate(results)
+
+def summarize(shots, times):
+    """单个距离的击杀枪数分布 -> 击杀率、枪数与击杀耗时的均值和分位数（只统计击杀成功的试验）"""
+    killed = shots[shots > 0]
+    summary = {'kill_rate': float(len(killed) / len(shots)) if len(shots) else 0.0}
+    if len(killed) == 0:
+        summary['shots'] = summary['ttk'] = None
+        return summary
+    # 分位数取实际出现过的枪数，击杀耗时随枪数单调递增，可直接换算
+    shot_percentiles = np.percentile(killed, PERCENTILES, method='inverted_cdf').astype(int)
+    summary['shots'] = {'mean': round(float(killed.mean()), 3)}
+    summary['shots'].update({f'p{p}': int(n) for p, n in zip(PERCENTILES, shot_percentiles)})
+    summary['ttk'] = {'mean': round(float(times[killed].mean()), 2)}
+    summary['ttk'].update({f'p{p}': float(times[n]) for p, n in zip(PERCENTILES, shot_percentiles)})
+    return summary
+
+def run_montecarlo_scenario(store, scenario, trials=DEFAULT_TRIALS, rng=None):
+    """对一个场景做蒙特卡洛模拟，返回可直接写入JSON的结果字典"""
+    rng = rng if rng is not None else np.random.default_rng()
+    weapon, bullet, helmet, helmet_durability, armor, armor_durability = resolve_equipment(store, scenario)
+    distances = scenario_distances(scenario)
+    distribution = scenario_distribution(scenario)
+    trials = int(scenario.get('trials') or trials)
+    if trials <= 0:
+        raise ValueError("试验次数必须大于0")
+
+    protection = (
+        helmet['level'] if helmet else 0, float(helmet_durability),
+        armor['level'] if armor else 0, armor['armor_type'] if armor else 0, float(armor_durability)
+    )
+    probabilities = np.array([distribution_at(distribution, distance) for distance in distances])
+    shots = simulate_trials(weapon, bullet, protection, distances, probabilities, trials, rng)
+    times = shot_times(weapon, bullet, MAX_SHOTS)
+
+    results = []
+    for i, distance in enumerate(distances):
+        result = {'distance': distance}
+        result.update(summarize(shots[:, i], times))
+        results.append(result)
+    return {
+        'weapon': weapon['name'],
+        'bullet': bullet['name'],
+        'helmet': helmet['name'] if helmet else None,
+        'helmet_durability': float(helmet_durability),
+        'armor': armor['name'] if armor else None,
+        'armor_durability': float(armor_durability),
+        'trials': trials,
+        'results': results
+    }
+
+def run_montecarlo_batch(store, scenarios, output, trials=DEFAULT_TRIALS, seed=None):
+    """逐条模拟场景并写出JSONL，返回(成功数, 失败数)；指定seed时结果可复现"""
+    rng = np.random.default_rng(seed)
+    return write_results(scenarios, output, lambda scenario: run_montecarlo_scenario(store, scenario, trials, rng))
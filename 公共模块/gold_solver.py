@@ -0,0 +1,146 @@
+from gold_batch import HIT_SEPARATOR, resolve_equipment, write_results
+from gold_engine import BODY_PARTS, cached_loadout, to_durability
+from gold_fixed import DAMAGE_SCALE, DURABILITY_SCALE, prepare_fixed_loadout, new_fixed_state, protector_for, protected_hit, fixed_shot_time, to_units
+
+# 最快击杀求解：给定武器/子弹/防护状态，求击杀所需枪数最少的命中序列
+# 逐发规则直接使用整数定点引擎（gold_fixed），结果与交互程序逐发模拟一致
+# 累计耗时随枪数严格递增，枪数最少的序列也就是耗时最短的序列
+#
+# 按枪数逐层展开状态(生命值, 头盔耐久, 护甲耐久)：
+#   同一层中相同的状态只保留一个；
+#   头盔与护甲耐久相同、生命值却不低于之前某一层（或本层）已出现过的状态，不可能更快击杀，直接剪掉
+# 可以限制能命中的部位（如只露出胸部和腿部）
+# 多弹丸子弹（霰弹等）每发的全部弹丸命中所选部位，各弹丸依次结算
+
+MAX_SHOTS = 100  # 超过该枪数仍无法击杀时视为无法击杀
+
+def parse_parts(parts):
+    """可命中部位：列表或分隔字符串，省略时为全部部位"""
+    if parts in (None, '', []):
+        return tuple(BODY_PARTS)
+    if isinstance(parts, str):
+        parts = [part for part in HIT_SEPARATOR.split(parts.strip()) if part]
+    for part in parts:
+        if part not in BODY_PARTS:
+            raise ValueError(f"无效的命中部位: {part}")
+    return tuple(dict.fromkeys(parts))  # 去重并保持顺序
+
+def solve_loadout(loadout, helmet_durability, armor_durability, parts=tuple(BODY_PARTS), max_shots=MAX_SHOTS):
+    """在整数定点组合上求最快击杀，耐久以0.1为单位的整数给出
+    返回(命中序列, 枪数)，无法击杀时返回(None, 0)；同一组合的结果缓存在组合中
+    """
+    solutions = loadout.setdefault('solutions', {})
+    key = (helmet_durability, armor_durability, parts, max_shots)
+    if key in solutions:
+        return solutions[key]
+
+    start = (new_fixed_state()['health'], helmet_durability, armor_durability)
+    parents = {start: None}           # 状态 -> (上一状态, 命中部位)
+    best = {start[1:]: start[0]}      # (头盔耐久, 护甲耐久) -> 已出现的最低生命值
+    frontier = [start]
+    solution = (None, 0)
+    pellets = loadout['pellet_count']
+
+    for shots in range(1, max_shots + 1):
+        next_frontier = []
+        for state in frontier:
+            health, helmet, armor = state
+            for part in parts:
+                protector_type = protector_for(loadout, part, helmet, armor) if pellets == 1 else 'pellets'
+                if protector_type == 'helmet':
+                    damage, remaining, _ = protected_hit(loadout, loadout['helmet'], helmet, part)
+                    next_state = (health - damage, remaining, armor)
+                elif protector_type == 'armor':
+                    damage, remaining, _ = protected_hit(loadout, loadout['armor'], armor, part)
+                    next_state = (health - damage, helmet, remaining)
+                elif protector_type == 'pellets':
+                    next_state = pellet_shot(loadout, state, part, pellets)
+                else:
+                    next_state = (health - loadout['open_damage'][part], helmet, armor)
+                if next_state[0] <= 0:
+                    parents[next_state] = (state, part)
+                    solution = (_sequence(parents, next_state), shots)
+                    break
+                if best.get(next_state[1:], next_state[0] + 1) <= next_state[0]:
+                    continue
+                best[next_state[1:]] = next_state[0]
+                parents[next_state] = (state, part)
+                next_frontier.append(next_state)
+            if solution[0] is not None:
+                break
+        if solution[0] is not None or not next_frontier:
+            break
+        frontier = next_frontier
+
+    solutions[key] = solution
+    return solution
+
+def pellet_shot(loadout, state, part, pellets):
+    """多弹丸一发全部命中part后的状态(生命值, 头盔耐久, 护甲耐久)"""
+    health, helmet, armor = state
+    for _ in range(pellets):
+        protector_type = protector_for(loadout, part, helmet, armor)
+        if protector_type == 'helmet':
+            damage, helmet, _ = protected_hit(loadout, loadout['helmet'], helmet, part)
+        elif protector_type == 'armor':
+            damage, armor, _ = protected_hit(loadout, loadout['armor'], armor, part)
+        else:
+            damage = loadout['open_damage'][part]
+        health -= damage
+    return health, helmet, armor
+
+def _sequence(parents, state):
+    """沿父状态回溯出命中序列"""
+    sequence = []
+    while parents[state] is not None:
+        state, part = parents[state]
+        sequence.append(part)
+    return sequence[::-1]
+
+def solve_fastest_kill(weapon, bullet, helmet_level=0, helmet_durability=0, armor_level=0, armor_type=0, armor_durability=0, distance=0, parts=None, max_shots=MAX_SHOTS):
+    """求最快击杀的命中序列，返回{'killed', 'shots', 'ttk', 'hits'}，耗时单位为ms"""
+    loadout = cached_loadout(
+        weapon, bullet,
+        helmet_level=helmet_level, armor_level=armor_level, armor_type=armor_type,
+        distance=to_durability(distance), prepare=prepare_fixed_loadout
+    )
+    hits, shots = solve_loadout(
+        loadout,
+        to_units(helmet_durability, DURABILITY_SCALE) if helmet_level else 0,
+        to_units(armor_durability, DURABILITY_SCALE) if armor_level else 0,
+        parse_parts(parts), max_shots
+    )
+    if hits is None:
+        return {'killed': False, 'shots': None, 'ttk': None, 'hits': None}
+    return {
+        'killed': True,
+        'shots': shots,
+        'ttk': fixed_shot_time(loadout, shots) / DAMAGE_SCALE,
+        'hits': hits
+    }
+
+def run_solve_scenario(store, scenario):
+    """对一个场景求最快击杀，可命中部位写在parts字段（省略时为全部部位）"""
+    weapon, bullet, helmet, helmet_durability, armor, armor_durability = resolve_equipment(store, scenario)
+    distance = to_durability(scenario.get('distance') or 0)
+    result = {
+        'weapon': weapon['name'],
+        'bullet': bullet['name'],
+        'helmet': helmet['name'] if helmet else None,
+        'helmet_durability': float(helmet_durability),
+        'armor': armor['name'] if armor else None,
+        'armor_durability': float(armor_durability),
+        'distance': float(distance),
+        'parts': list(parse_parts(scenario.get('parts')))
+    }
+    result.update(solve_fastest_kill(
+        weapon, bullet,
+        helmet_level=helmet['level'] if helmet else 0, helmet_durability=helmet_durability,
+        armor_level=armor['level'] if armor else 0, armor_type=armor['armor_type'] if armor else 0,
+        armor_durability=armor_durability, distance=distance, parts=scenario.get('parts')
+    ))
+    return result
+
+def run_solve_batch(store, scenarios, output):
+    """逐条求解场景并写出JSONL，返回(成功数, 失败数)"""
+    return write_results(scenarios, output, lambda scenario: run_solve_scenario(store, scenario))
@@ -0,0 +1,180 @@
+import csv
+from decimal import Decimal, InvalidOperation
+
+import numpy as np
+
+from data_store import compatible_pairs
+from gold_batch import ENGINES
+from gold_engine import PROTECTED_AREAS, cached_loadout, to_durability
+from gold_vector import PART_INDEX, prepare_vector_loadout, new_vector_state, apply_vector_hit, apply_vector_shot, shot_times
+
+# 击杀枪数/击杀耗时矩阵：对每把武器×可用子弹×头盔/护甲×耐久比例×距离计算固定命中方式下的击杀枪数
+# 每个武器/子弹组合内，对“防护状态×距离”整个矩阵做数组运算（gold_vector），逐发推进直到全部击杀
+# engine='fixed'/'decimal' 时改为逐个状态用整数定点引擎或Decimal参考引擎计算，用于核对
+
+# 命中方式：(开头的命中部位, 之后循环的命中部位)
+HIT_PATTERNS = {
+    '全部头部': ((), ('头部',)),
+    '全部胸部': ((), ('胸部',)),
+    '先头后胸': (('头部',), ('胸部',)),
+    '四肢': ((), ('大臂', '小臂', '大腿', '小腿'))
+}
+
+DEFAULT_DISTANCES = (0, 10, 20, 30, 40, 50, 60, 80, 100)
+DEFAULT_DURABILITY_FRACTIONS = (1.0, 0.75, 0.5, 0.25)  # 耐久比例（相对最大耐久）
+MAX_SHOTS = 60  # 超过该枪数仍未击杀时记为未击杀
+SWEEP_ENGINES = ('vector',) + tuple(ENGINES)
+
+def pattern_parts(pattern, count):
+    """展开命中方式的前count发命中部位"""
+    prefix, cycle = HIT_PATTERNS[pattern]
+    parts = list(prefix[:count])
+    while len(parts) < count:
+        parts.append(cycle[(len(parts) - len(prefix)) % len(cycle)])
+    return parts
+
+def pattern_protectors(pattern):
+    """命中方式会打到的防护：(是否打头盔, 是否打护甲)"""
+    prefix, cycle = HIT_PATTERNS[pattern]
+    parts = set(prefix) | set(cycle)
+    uses_helmet = '头部' in parts
+    uses_armor = any(part in areas for areas in PROTECTED_AREAS.values() for part in parts)
+    return uses_helmet, uses_armor
+
+def protection_states(store, pattern, fractions):
+    """列出命中方式需要的防护状态：[(头盔, 头盔耐久, 护甲, 护甲耐久)]
+    只打头的方式只列头盔，只打身体的方式只列护甲；先头后胸同时用到两者，按同等级的头盔与护甲配套
+    每种方式都包含一行无防护
+    """
+    uses_helmet, uses_armor = pattern_protectors(pattern)
+    durability = lambda item, fraction: to_durability(Decimal(str(item['max_durability'])) * Decimal(str(fraction)))
+    states = [(None, None, None, None)]
+
+    if uses_helmet and uses_armor:
+        for helmet in store['helmets']:
+            for armor in store['armors_by_level'].get(helmet['level'], []):
+                for fraction in fractions:
+                    states.append((helmet, durability(helmet, fraction), armor, durability(armor, fraction)))
+    elif uses_helmet:
+        for helmet in store['helmets']:
+            for fraction in fractions:
+                states.append((helmet, durability(helmet, fraction), None, None))
+    elif uses_armor:
+        for armor in store['armors']:
+            for fraction in fractions:
+                states.append((None, None, armor, durability(armor, fraction)))
+    return states
+
+def state_arrays(states):
+    """防护状态列表 -> 各字段的数组"""
+    return {
+        'helmet_level': np.array([h['level'] if h else 0 for h, _, _, _ in states], dtype=np.int8),
+        'helmet_durability': np.array([float(d) if h else 0.0 for h, d, _, _ in states]),
+        'armor_level': np.array([a['level'] if a else 0 for _, _, a, _ in states], dtype=np.int8),
+        'armor_type': np.array([a['armor_type'] if a else 0 for _, _, a, _ in states], dtype=np.int8),
+        'armor_durability': np.array([float(d) if a else 0.0 for _, _, a, d in states])
+    }
+
+def shots_to_kill(weapon, bullet, arrays, distances, parts):
+    """在“防护状态×距离”矩阵上逐发推进，返回击杀枪数矩阵（未击杀为0）"""
+    loadout = prepare_vector_loadout(weapon, bullet, distances)
+    column = lambda values: values[:, None]
+    state = new_vector_state(
+        (len(arrays['helmet_level']), len(distances)),
+        column(arrays['helmet_level']), column(arrays['helmet_durability']),
+        column(arrays['armor_level']), column(arrays['armor_type']), column(arrays['armor_durability'])
+    )
+    pellets = loadout['pellet_count']
+    for part in parts:
+        if pellets == 1:
+            alive = apply_vector_hit(loadout, state, PART_INDEX[part])
+        else:
+            # 多弹丸子弹每发的全部弹丸命中该部位
+            alive = apply_vector_shot(loadout, state, np.full(pellets, PART_INDEX[part]))
+        if not alive.any():
+            break
+    return state['shots']
+
+def shots_to_kill_exact(weapon, bullet, states, distances, parts, engine):
+    """逐个防护状态与距离用标量引擎结算，返回击杀枪数矩阵（未击杀为0）"""
+    engine = ENGINES[engine]
+    shots = np.zeros((len(states), len(distances)), dtype=np.int32)
+    for j, distance in enumerate(distances):
+        for i, (helmet, helmet_durability, armor, armor_durability) in enumerate(states):
+            loadout = cached_loadout(
+                weapon, bullet,
+                helmet_level=helmet['level'] if helmet else 0,
+                armor_level=armor['level'] if armor else 0,
+                armor_type=armor['armor_type'] if armor else 0,
+                distance=to_durability(distance),
+                prepare=engine['prepare']
+            )
+            state = engine['new_state'](helmet_durability or Decimal('0.0'), armor_durability or Decimal('0.0'))
+            result = engine['run'](loadout, state, parts)
+            if result['killed']:
+                shots[i, j] = result['shots']
+    return shots
+
+def iter_sweep_rows(store, distances=DEFAULT_DISTANCES, fractions=DEFAULT_DURABILITY_FRACTIONS, patterns=None, skipped=None, engine='vector', pairs=None):
+    """逐个武器/子弹组合生成矩阵行，每行为一个命中方式下的一种防护状态，列为各距离的枪数与耗时
+    pairs为要计算的(武器, 子弹)组合，省略时为全部组合；表格数值未知（“？”）的组合跳过，名称记入skipped列表
+    """
+    patterns = patterns or list(HIT_PATTERNS)
+    states = {pattern: protection_states(store, pattern, fractions) for pattern in patterns}
+    arrays = {pattern: state_arrays(states[pattern]) for pattern in patterns}
+    parts = {pattern: pattern_parts(pattern, MAX_SHOTS) for pattern in patterns}
+
+    for weapon, bullet in (compatible_pairs(store) if pairs is None else pairs):
+        try:
+            times = shot_times(weapon, bullet, MAX_SHOTS)
+            if engine == 'vector':
+                results = {pattern: shots_to_kill(weapon, bullet, arrays[pattern], distances, parts[pattern]) for pattern in patterns}
+            else:
+                results = {pattern: shots_to_kill_exact(weapon, bullet, states[pattern], distances, parts[pattern], engine) for pattern in patterns}
+        except (InvalidOperation, TypeError, ValueError):
+            if skipped is not None:
+                skipped.append(f"{weapon['name']} / {bullet['name']}")
+            continue
+
+        for pattern in patterns:
+            for (helmet, helmet_durability, armor, armor_durability), row in zip(states[pattern], results[pattern]):
+                yield {
+                    'weapon': weapon['name'],
+                    'bullet': bullet['name'],
+                    'pattern': pattern,
+                    'helmet': helmet['name'] if helmet else None,
+                    'helmet_durability': helmet_durability,
+                    'armor': armor['name'] if armor else None,
+                    'armor_durability': armor_durability,
+                    'shots': [int(n) for n in row],
+                    'ttk': [float(times[n]) if n else None for n in row]
+                }
+
+def sweep_header(distances):
+    """CSV表头：每个距离两列（击杀枪数、击杀耗时ms）"""
+    header = ['武器', '子弹', '命中方式', '头盔', '头盔耐久', '护甲', '护甲耐久']
+    for distance in distances:
+        header += [f'{distance}m枪数', f'{distance}m耗时']
+    return header
+
+def sweep_line(row):
+    """矩阵行 -> CSV行，未击杀留空"""
+    line = [
+        row['weapon'], row['bullet'], row['pattern'],
+        row['helmet'] or '无', row['helmet_durability'] if row['helmet'] else '',
+        row['armor'] or '无', row['armor_durability'] if row['armor'] else ''
+    ]
+    for shots, ttk in zip(row['shots'], row['ttk']):
+        line += [shots or '', f'{ttk:.2f}' if ttk is not None else '']
+    return line
+
+def write_sweep_csv(store, output, distances=DEFAULT_DISTANCES, fractions=DEFAULT_DURABILITY_FRACTIONS, patterns=None, skipped=None, engine='vector'):
+    """把矩阵写成CSV：每行一个组合，每个距离两列（击杀枪数、击杀耗时ms），未击杀留空；返回行数"""
+    writer = csv.writer(output)
+    writer.writerow(sweep_header(distances))
+
+    count = 0
+    for row in iter_sweep_rows(store, distances, fractions, patterns, skipped, engine):
+        writer.writerow(sweep_line(row))
+        count += 1
+    return count
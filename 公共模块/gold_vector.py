@@ -0,0 +1,264 @@
+import numpy as np
+
+from decay_table import weapon_decay_table, decay
+from gold_engine import (
+    PROTECTED_AREAS, PLAYER_HEALTH, calculate_penetration_multiplier,
+    protector_decay, prepare_loadout, shot_time, pellet_count
+)
+
+# gold_engine的数组版本：同一套伤害规则，一次结算整组交战（防护状态×距离、或大量随机试验）的一发命中
+# 伤害保留2位小数、耐久保留1位小数，均为四舍五入；生命值以0.01为单位用整数累计
+# 浮点运算的取整结果与Decimal引擎逐发核对一致
+# 组合常量通常是一种子弹的标量与按部位/等级的表；stack_vector_loadouts把多种子弹合并为一个组合，
+# 表多出与交战状态对应的子弹维度，同一武器的多种子弹在一次数组运算中结算
+# 整组交战的防护等级与护甲类型相同时（蒙特卡洛），specialize_vector_hit预先按距离×部位算好伤害、护甲伤害与是否受保护，
+# 逐发只剩查表与耐久相关的运算，结果与apply_vector_hit逐位一致
+
+# 部位编号（未命中放在最后）
+PART_ORDER = ('头部', '胸部', '腹部', '下腹部', '大臂', '小臂', '大腿', '小腿', '未命中')
+PART_INDEX = {part: i for i, part in enumerate(PART_ORDER)}
+HEAD = PART_INDEX['头部']
+MISS = PART_INDEX['未命中']
+
+PART_MULTIPLIER_KEYS = {
+    '头部': 'head_multiplier',
+    '胸部': 'chest_multiplier',
+    '腹部': 'abdomen_multiplier',
+    '下腹部': 'abdomen_multiplier',
+    '大臂': 'upper_arm_multiplier',
+    '小臂': 'lower_arm_multiplier',
+    '大腿': 'thigh_multiplier',
+    '小腿': 'calf_multiplier'
+}
+
+# 护甲类型(0无护甲,1-3) × 部位 的保护表
+COVERAGE = np.array([
+    [part in PROTECTED_AREAS.get(armor_type, []) for part in PART_ORDER]
+    for armor_type in range(4)
+])
+
+ROUND_EPSILON = 1e-6  # 浮点误差容差（按取整后的最小单位计）
+
+def round_half_up(values, scale):
+    """按 1/scale 的精度四舍五入（scale=100保留2位，scale=10保留1位）"""
+    return np.floor(values * scale + 0.5 + ROUND_EPSILON) / scale
+
+def lookup(table, index, pellet_axis=False):
+    """按编号查表：table的第一维为部位/等级编号，合并多种子弹时第二维为子弹，与交战状态的最后一维对应
+    pellet_axis为True时index的最后一维是弹丸维度，子弹维度对应倒数第二维
+    """
+    if table.ndim == 1:
+        return table[index]
+    return np.choose(index, table[..., None] if pellet_axis else table)
+
+def level_tables(bullet):
+    """按防护等级0-6查表的穿透倍率与护甲衰减倍率（等级0为无防护）"""
+    penetration = [0.0] + [float(calculate_penetration_multiplier(bullet['penetration_level'], level, bullet)) for level in range(1, 7)]
+    decay = [float(protector_decay(bullet, level)) for level in range(7)]
+    return np.array(penetration), np.array(decay)
+
+def prepare_vector_loadout(weapon, bullet, distances):
+    """预先计算武器/子弹组合在各距离上的常量，距离为最后一维"""
+    penetration_table, decay_table = level_tables(bullet)
+    weapon_damage = float(weapon['base_damage']) * float(bullet['base_damage_multiplier'])
+    part_multipliers = [float(weapon[PART_MULTIPLIER_KEYS[part]]) if part in PART_MULTIPLIER_KEYS else 0.0 for part in PART_ORDER]
+    return {
+        'weapon_decay': decay(weapon_decay_table(weapon), distances),
+        'part_damage': weapon_damage * np.array(part_multipliers),  # 未命中为0
+        'armor_damage': float(weapon['armor_damage']) * float(bullet['base_armor_multiplier']),
+        'penetration_table': penetration_table,
+        'decay_table': decay_table,
+        'is_338_lap_mag': bullet['caliber'] == '338lapmag',
+        'pellet_count': pellet_count(bullet)
+    }
+
+def stack_vector_loadouts(loadouts):
+    """把同一武器、同一距离下多种子弹的组合合并为一个，交战状态的最后一维依次对应各子弹"""
+    stack = lambda key: np.stack([loadout[key] for loadout in loadouts], axis=-1)
+    return {
+        'weapon_decay': loadouts[0]['weapon_decay'],
+        'part_damage': stack('part_damage'),
+        'armor_damage': np.array([loadout['armor_damage'] for loadout in loadouts]),
+        'penetration_table': stack('penetration_table'),
+        'decay_table': stack('decay_table'),
+        'is_338_lap_mag': np.array([loadout['is_338_lap_mag'] for loadout in loadouts]),
+        'pellet_count': np.array([loadout['pellet_count'] for loadout in loadouts])
+    }
+
+def protected_damage_of(loadout, full_damage, levels, durability, armor_value, pellet_axis=False):
+    """受保护时的伤害：耐久不足以吸收全部护甲伤害时按剩余耐久占比拆分，.338 Lap Mag为全额伤害"""
+    is_338_lap_mag = loadout['is_338_lap_mag']
+    if np.all(is_338_lap_mag):
+        return full_damage
+    penetration = lookup(loadout['penetration_table'], levels, pellet_axis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(armor_value == 0, 0.0, durability / armor_value)
+    damage = np.where(
+        durability >= armor_value,
+        full_damage * penetration,
+        ratio * full_damage * penetration + (1 - ratio) * full_damage
+    )
+    if np.any(is_338_lap_mag):
+        damage = np.where(np.asarray(is_338_lap_mag)[..., None] if pellet_axis else is_338_lap_mag, full_damage, damage)
+    return damage
+
+def new_vector_state(shape, helmet_level=0, helmet_durability=0.0, armor_level=0, armor_type=0, armor_durability=0.0):
+    """创建整组交战的初始状态，各参数为可广播到shape的标量或数组"""
+    full = lambda value, dtype: np.broadcast_to(np.asarray(value, dtype=dtype), shape).copy()
+    return {
+        'helmet_level': full(helmet_level, np.int8),
+        'helmet_durability': full(helmet_durability, np.float64),
+        'armor_level': full(armor_level, np.int8),
+        'armor_type': full(armor_type, np.int8),
+        'armor_durability': full(armor_durability, np.float64),
+        'health': np.full(shape, int(PLAYER_HEALTH * 100), dtype=np.int64),
+        'shots': np.zeros(shape, dtype=np.int32),  # 击杀所用枪数，未击杀为0
+        'hit_count': 0
+    }
+
+def select_vector_state(state, index):
+    """只保留index选中的交战（用于剔除已击杀的试验），返回新的状态"""
+    selected = {key: value[index] for key, value in state.items() if isinstance(value, np.ndarray)}
+    selected['hit_count'] = state['hit_count']
+    return selected
+
+def apply_vector_hit(loadout, state, parts):
+    """对尚未击杀的交战结算一发命中，parts为部位编号（标量或与状态同形的数组）"""
+    state['hit_count'] += 1
+    alive = state['shots'] == 0
+    parts = np.broadcast_to(parts, alive.shape)
+    is_head = parts == HEAD
+
+    weapon_decay = loadout['weapon_decay']
+    full_damage = lookup(loadout['part_damage'], parts) * weapon_decay
+
+    # 头部由头盔保护，身体部位按护甲类型判断是否在保护范围内
+    levels = np.where(is_head, state['helmet_level'], state['armor_level'])
+    durability = np.where(is_head, state['helmet_durability'], state['armor_durability'])
+    covered = np.where(is_head, True, COVERAGE[state['armor_type'], parts]) & (parts != MISS)
+    protected = covered & (levels > 0) & (durability > 0) & alive
+
+    # 护甲伤害与剩余耐久
+    armor_value = loadout['armor_damage'] * lookup(loadout['decay_table'], levels) * weapon_decay
+    remaining = durability - armor_value
+    remaining = np.where(remaining <= ROUND_EPSILON / 10, 0.0, round_half_up(remaining, 10))
+
+    protected_damage = protected_damage_of(loadout, full_damage, levels, durability, armor_value)
+    damage = np.where(protected, protected_damage, full_damage)
+    damage_cents = np.floor(damage * 100 + 0.5 + ROUND_EPSILON).astype(np.int64)
+
+    helmet_hit = protected & is_head
+    armor_hit = protected & ~is_head
+    state['helmet_durability'] = np.where(helmet_hit, remaining, state['helmet_durability'])
+    state['armor_durability'] = np.where(armor_hit, remaining, state['armor_durability'])
+    state['health'] -= np.where(alive, damage_cents, 0)
+    state['shots'][alive & (state['health'] <= 0)] = state['hit_count']
+    return alive
+
+def specialize_vector_hit(loadout, helmet_level=0, armor_level=0, armor_type=0):
+    """整组交战防护等级、护甲类型相同时的专用结算函数hit(state, parts, distance_index)，结果与apply_vector_hit相同
+    distance_index为各交战对应组合距离（weapon_decay）的编号；只用于单弹丸子弹，按防护参数缓存在组合中
+    """
+    key = (helmet_level, armor_level, armor_type)
+    cache = loadout.setdefault('specialized_hits', {})
+    if key in cache:
+        return cache[key]
+
+    weapon_decay = np.atleast_1d(loadout['weapon_decay'])[:, None]
+    is_head = np.arange(len(PART_ORDER)) == HEAD
+    levels = np.where(is_head, helmet_level, armor_level)
+    covered = np.where(is_head, True, COVERAGE[armor_type]) & (np.arange(len(PART_ORDER)) != MISS) & (levels > 0)
+    # 距离×部位的表（展平，按 距离编号×部位数+部位 取值），乘法顺序与apply_vector_hit相同
+    full_damage = (loadout['part_damage'] * weapon_decay).ravel()
+    armor_value = (loadout['armor_damage'] * loadout['decay_table'][levels] * weapon_decay).ravel()
+    penetration = loadout['penetration_table'][levels]
+    always_full = bool(loadout['is_338_lap_mag'])
+
+    def finish(state, alive, damage):
+        damage_cents = np.floor(damage * 100 + 0.5 + ROUND_EPSILON).astype(np.int64)
+        state['health'] -= np.where(alive, damage_cents, 0)
+        state['shots'][alive & (state['health'] <= 0)] = state['hit_count']
+        return alive
+
+    def open_hit(state, parts, distance_index):
+        state['hit_count'] += 1
+        return finish(state, state['shots'] == 0, full_damage.take(distance_index * len(PART_ORDER) + parts))
+
+    def protected_hit(state, parts, distance_index):
+        state['hit_count'] += 1
+        alive = state['shots'] == 0
+        index = distance_index * len(PART_ORDER) + parts
+        damage = full_damage.take(index)
+        head = is_head[parts]
+        durability = np.where(head, state['helmet_durability'], state['armor_durability'])
+
+        # 护甲耐久、拆分伤害只对受保护的交战计算（防护耗尽后越来越少）
+        selected = np.flatnonzero(covered[parts] & (durability > 0) & alive)
+        if len(selected):
+            full, value, current = damage[selected], armor_value.take(index[selected]), durability[selected]
+            remaining = current - value
+            remaining = np.where(remaining <= ROUND_EPSILON / 10, 0.0, round_half_up(remaining, 10))
+            if not always_full:
+                rate = penetration[parts[selected]]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    ratio = np.where(value == 0, 0.0, current / value)
+                damage[selected] = np.where(current >= value, full * rate, ratio * full * rate + (1 - ratio) * full)
+            on_head = head[selected]
+            for kind, mask in (('helmet', on_head), ('armor', ~on_head)):
+                updated = state[f'{kind}_durability'].copy()
+                updated[selected[mask]] = remaining[mask]
+                state[f'{kind}_durability'] = updated
+        return finish(state, alive, damage)
+
+    # 没有任何部位受保护（无头盔无护甲）时只需查表
+    hit = protected_hit if covered.any() else open_hit
+    cache[key] = hit
+    return hit
+
+def apply_vector_shot(loadout, state, parts):
+    """多弹丸子弹：对尚未击杀的交战结算一发，parts的最后一维为各弹丸的部位编号（按结算顺序）
+    同一防护上第k颗弹丸命中前的耐久为 耐久 - k×每颗扣除的耐久（耐久为0.1的整数倍时每颗扣除的量是常数，
+    被击穿后为0），因此全部弹丸在弹丸维度上一次数组运算完成，结果与逐颗结算一致
+    """
+    state['hit_count'] += 1
+    alive = state['shots'] == 0
+    expand = lambda values: np.asarray(values)[..., None]
+    parts = np.broadcast_to(parts, alive.shape + np.shape(parts)[-1:])
+    is_head = parts == HEAD
+
+    weapon_decay = expand(loadout['weapon_decay'])
+    full_damage = lookup(loadout['part_damage'], parts, True) * weapon_decay
+
+    # 每颗弹丸由哪类防护保护（耐久是否耗尽在下面按弹丸判断）
+    helmet_level, armor_level = expand(state['helmet_level']), expand(state['armor_level'])
+    levels = np.where(is_head, helmet_level, armor_level)
+    on_helmet = is_head & (helmet_level > 0)
+    on_armor = ~is_head & (parts != MISS) & COVERAGE[expand(state['armor_type']), parts] & (armor_level > 0)
+
+    # 同一防护上之前的弹丸数 -> 该弹丸命中前的耐久
+    armor_value = expand(loadout['armor_damage']) * lookup(loadout['decay_table'], levels, True) * weapon_decay
+    step = -round_half_up(-armor_value, 10)  # 每颗未击穿的弹丸扣除的耐久
+    before = np.where(is_head, np.cumsum(on_helmet, axis=-1) - on_helmet, np.cumsum(on_armor, axis=-1) - on_armor)
+    start = np.where(is_head, expand(state['helmet_durability']), expand(state['armor_durability']))
+    durability = np.maximum(round_half_up(start - before * step, 10), 0.0)
+    protected = (on_helmet | on_armor) & (durability > 0)
+
+    protected_damage = protected_damage_of(loadout, full_damage, levels, durability, armor_value, True)
+    damage = np.where(protected, protected_damage, full_damage)
+    damage_cents = np.floor(damage * 100 + 0.5 + ROUND_EPSILON).astype(np.int64).sum(axis=-1)
+
+    # 命中后的耐久：每类防护最后一颗弹丸命中后的耐久，被击穿时为0
+    remaining = durability - armor_value
+    remaining = np.where(remaining <= ROUND_EPSILON / 10, 0.0, round_half_up(remaining, 10))
+    for kind, hits in (('helmet', on_helmet), ('armor', on_armor)):
+        last = np.where(protected & hits, remaining, np.inf).min(axis=-1)
+        update = alive & (protected & hits).any(axis=-1)
+        state[f'{kind}_durability'] = np.where(update, last, state[f'{kind}_durability'])
+    state['health'] -= np.where(alive, damage_cents, 0)
+    state['shots'][alive & (state['health'] <= 0)] = state['hit_count']
+    return alive
+
+def shot_times(weapon, bullet, count):
+    """第0..count发的累计耗时数组（第0项为0，沿用gold_engine的射击间隔与扳机延迟规则）"""
+    loadout = prepare_loadout(weapon, bullet)
+    return np.array([0.0] + [float(shot_time(loadout, n)) for n in range(1, count + 1)])
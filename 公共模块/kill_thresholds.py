@@ -0,0 +1,127 @@
+import json
+
+import numpy as np
+
+from columnar import ARMOR_LEVELS, PART_INDEX, penetration_matrix, armor_decay_matrix
+from data_store import get_columnar_model, normalize_key
+
+# 爆头斩杀耐久表：全部武器×同口径子弹×1-6级头盔，单发与双发爆头不可击杀的最低头盔耐久
+#
+# 距离衰减按1.0，霰弹按单颗弹丸：
+# 无头盔伤害U = 基础伤害×子弹伤害倍率×爆头倍率，有头盔伤害A = U×穿透倍率，护甲伤害值V = 武器护甲伤害×子弹护甲倍率×护甲衰减倍率
+# 耐久d不足V时伤害为 d/V×A + (1-d/V)×U（保留两位小数，四舍五入），伤害低于100即不被击杀；
+# 理论耐久 V×(U-100)/(U-A) 的去尾值与进一值（0.1步长）依次验证，取第一个满足的；双发的伤害与护甲伤害值都翻倍
+# 穿透倍率按头盔等级取值（columnar.penetration_matrix，与gold_engine.calculate_penetration_multiplier相同）：
+# 子弹穿透等级低于头盔等级时为0，同级/高一级取表格数值，高两级及以上为1
+#
+# 全部组合在一次数组运算中完成；表格数值是十进制小数，浮点乘积与之相差远小于EPSILON，比较时按EPSILON放宽
+#
+# 输出表：{武器名称: {子弹名称: {头盔等级: {'one_shot': 单发阈值, 'two_shot': 双发阈值}}}}
+# 阈值为不被击杀的最低耐久（耐久不低于阈值即安全），0表示任何耐久（包括0）都不会被击杀，None表示任何耐久都会被击杀
+
+KILL_HEALTH = 100
+HELMET_LEVELS = np.arange(1, ARMOR_LEVELS + 1)
+SHOT_KEYS = {1: 'one_shot', 2: 'two_shot'}
+ALWAYS_KILLED = -1  # 阈值数组中“任何耐久都会被击杀”的标记
+EPSILON = 1e-9
+
+def is_number(value):
+    """表格值能否转为数值（“？”等占位符不能）"""
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+def compatible_indices(model):
+    """口径匹配的全部(武器序号, 子弹序号)，口径按规范化写法比较"""
+    keys = np.array([normalize_key(label) for label in model['calibers']['labels']])
+    mask = keys[model['weapons']['caliber']][:, None] == keys[model['bullets']['caliber']][None, :]
+    return np.nonzero(mask)
+
+def valid_levels(weapon, bullet):
+    """该组合各头盔等级的表格数值是否完整（只检查实际用到的倍率）"""
+    if not all(is_number(weapon[key]) for key in ('base_damage', 'armor_damage', 'head_multiplier')):
+        return [False] * ARMOR_LEVELS
+    if not all(is_number(bullet[key]) for key in ('penetration_level', 'base_damage_multiplier', 'base_armor_multiplier')):
+        return [False] * ARMOR_LEVELS
+    valid = []
+    for level, factor in zip(HELMET_LEVELS, bullet['armor_decay_factors']):
+        diff = float(bullet['penetration_level']) - level
+        penetration = {0: 'same_level_penetration', 1: 'higher_level_penetration'}.get(diff)
+        valid.append(is_number(factor) and (penetration is None or is_number(bullet[penetration])))
+    return valid
+
+def survives(durability, unarmored, armored, armor_value):
+    """耐久为durability（0.1为单位）时爆头伤害是否低于100"""
+    durability = durability / 10
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = durability / armor_value
+        damage = np.where(durability >= armor_value - EPSILON, armored, ratio * armored + (1 - ratio) * unarmored)
+    return np.floor(damage * 100 + 0.5 + EPSILON) < KILL_HEALTH * 100
+
+def min_safe_durability(unarmored, armored, armor_value):
+    """不被击杀的最低耐久（0.1为单位的整数数组），任何耐久都会被击杀时为ALWAYS_KILLED"""
+    always = armored >= KILL_HEALTH - EPSILON
+    never = unarmored < KILL_HEALTH - EPSILON
+    solvable = ~always & ~never & (unarmored - armored > EPSILON)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exact = armor_value * (unarmored - KILL_HEALTH) / (unarmored - armored) * 10
+    exact = np.where(solvable, exact, 0)
+    floor = np.floor(exact + EPSILON)
+    ceil = np.ceil(exact - EPSILON)
+    result = np.where(
+        survives(floor, unarmored, armored, armor_value), floor,
+        np.where(survives(ceil, unarmored, armored, armor_value), ceil, ALWAYS_KILLED)
+    )
+    return np.where(solvable, result, np.where(never, 0, ALWAYS_KILLED)).astype(np.int64)
+
+def threshold_arrays(model, weapon_index, bullet_index):
+    """各组合×头盔等级的单发/双发阈值：{发数: (组合数, 6)数组}"""
+    weapons, bullets = model['weapons'], model['bullets']
+    head = weapons['part_multipliers'][:, PART_INDEX['头部']]
+    unarmored = (weapons['base_damage'][weapon_index] * bullets['base_damage_multiplier'][bullet_index] * head[weapon_index])[:, None]
+    penetration = penetration_matrix(bullets, HELMET_LEVELS)[bullet_index]
+    armor_value = (weapons['armor_damage'][weapon_index] * bullets['base_armor_multiplier'][bullet_index])[:, None] * armor_decay_matrix(bullets, HELMET_LEVELS)[bullet_index]
+    return {
+        shots: min_safe_durability(shots * unarmored, shots * unarmored * penetration, shots * armor_value)
+        for shots in SHOT_KEYS
+    }
+
+def build_kill_table(store, skipped=None):
+    """生成斩杀耐久表（格式见文件开头），数值不完整的组合/头盔等级不列出，名称记入skipped列表"""
+    model = get_columnar_model(store)
+    weapon_index, bullet_index = compatible_indices(model)
+    thresholds = threshold_arrays(model, weapon_index, bullet_index)
+
+    table = {}
+    for i, (w, b) in enumerate(zip(weapon_index, bullet_index)):
+        weapon, bullet = store['weapons'][w], store['bullets'][b]
+        levels = {}
+        for j, valid in enumerate(valid_levels(weapon, bullet)):
+            if not valid:
+                if skipped is not None:
+                    skipped.append(f"{weapon['name']} / {bullet['name']} / {HELMET_LEVELS[j]}级头盔")
+                continue
+            levels[str(HELMET_LEVELS[j])] = {
+                key: None if thresholds[shots][i, j] == ALWAYS_KILLED else int(thresholds[shots][i, j]) / 10
+                for shots, key in SHOT_KEYS.items()
+            }
+        if levels:
+            table.setdefault(weapon['name'], {})[bullet['name']] = levels
+    return table
+
+def write_kill_table(store, output, skipped=None):
+    """把斩杀耐久表写成JSON，返回条目数（武器×子弹×头盔等级）"""
+    table = build_kill_table(store, skipped)
+    json.dump(table, output, ensure_ascii=False)
+    output.write('\n')
+    return sum(len(levels) for bullets in table.values() for levels in bullets.values())
+
+def headshot_safe(table, weapon, bullet, level, durability, shots=1):
+    """查表：level级头盔耐久为durability时能否扛住shots发（1或2）爆头，表中没有该组合时返回None"""
+    entry = table.get(weapon, {}).get(bullet, {}).get(str(level))
+    if entry is None:
+        return None
+    threshold = entry[SHOT_KEYS[shots]]
+    return threshold is not None and durability >= threshold
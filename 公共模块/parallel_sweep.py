@@ -0,0 +1,92 @@
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from data_store import build_data_store, compatible_pairs
+from gold_breakpoints import BREAKPOINT_HEADER, build_breakpoint_tables, breakpoint_lines
+from gold_sweep import HIT_PATTERNS, iter_sweep_rows, sweep_header, sweep_line
+
+# 多进程矩阵计算：把武器×子弹组合分块交给ProcessPoolExecutor并行计算，结果按块依次写出，输出与单进程完全一致
+# 主进程把已加载的武器、子弹、护甲、头盔记录作为进程初始化参数传给各工作进程（每个进程启动时传递、解序列化一次），
+# 各进程自己建立索引，不再各自读取xlsx；记录保持原样（包括“？”等占位值），计算与单进程使用同一套代码
+# 每块只传递组合在记录列表中的下标，工作进程把结果格式化为CSV文本按块返回，主进程只负责按顺序写出
+# （逐行返回时主进程要逐行解序列化再格式化几十万行，只用1个工作进程时比不用多进程慢约25%-30%，这部分进程再多也省不掉）
+# 每个进程持有一份完整的记录（表格数据只有几百条，复制的开销远小于计算本身）；
+# 没有使用multiprocessing.shared_memory：矩阵与断点表按记录字典计算，不使用列式数组（columnar），
+# 列式数组也无法无损表示“？”等占位值，共享它们对计算没有帮助
+
+RECORD_KINDS = ('weapons', 'bullets', 'armors', 'helmets')
+CHUNKS_PER_WORKER = 4  # 每个进程平均分到的块数，块越多负载越均衡
+
+_worker_store = None  # 工作进程中的数据仓库
+
+def default_workers():
+    """不指定进程数时使用的进程数：CPU核心数"""
+    return os.cpu_count() or 1
+
+def _init_worker(records):
+    """工作进程初始化：用主进程传来的记录重建索引"""
+    global _worker_store
+    _worker_store = build_data_store(**records)
+
+def _pairs(indexes):
+    """组合下标 -> (武器, 子弹)"""
+    return [(_worker_store['weapons'][w], _worker_store['bullets'][b]) for w, b in indexes]
+
+def _csv_text(lines):
+    """CSV行 -> (CSV文本, 行数)，格式与主进程的csv.writer相同"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(lines)
+    return buffer.getvalue(), len(lines)
+
+def _sweep_chunk(indexes, distances, fractions, patterns, engine):
+    """计算一块组合的击杀枪数矩阵，返回(CSV文本, 行数, 跳过的组合)"""
+    skipped = []
+    rows = iter_sweep_rows(_worker_store, distances, fractions, patterns, skipped, engine, _pairs(indexes))
+    return (*_csv_text([sweep_line(row) for row in rows]), skipped)
+
+def _breakpoints_chunk(indexes, distances, patterns):
+    """计算一块组合的耐久断点表，返回(CSV文本, 行数, 跳过的组合)"""
+    skipped = []
+    tables = build_breakpoint_tables(_worker_store, distances, patterns, skipped, _pairs(indexes))
+    return (*_csv_text(list(breakpoint_lines(tables))), skipped)
+
+def pair_indexes(store):
+    """全部武器×同口径子弹组合在记录列表中的下标"""
+    weapon_index = {id(weapon): i for i, weapon in enumerate(store['weapons'])}
+    bullet_index = {id(bullet): i for i, bullet in enumerate(store['bullets'])}
+    return [(weapon_index[id(weapon)], bullet_index[id(bullet)]) for weapon, bullet in compatible_pairs(store)]
+
+def run_parallel(store, output, header, task, workers=None, chunk_size=None, skipped=None):
+    """用多个进程计算全部组合并写出CSV，返回行数
+    task为按块计算的函数（参数为组合下标列表，返回CSV文本、行数与跳过的组合），结果按组合顺序写出
+    """
+    workers = workers or default_workers()
+    indexes = pair_indexes(store)
+    chunk_size = chunk_size or max(1, len(indexes) // (workers * CHUNKS_PER_WORKER))
+    chunks = [indexes[i:i + chunk_size] for i in range(0, len(indexes), chunk_size)]
+
+    writer = csv.writer(output)
+    writer.writerow(header)
+    count = 0
+    records = {kind: store[kind] for kind in RECORD_KINDS}
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(records,)) as executor:
+        # map按提交顺序返回结果，每块算完即可写出
+        for text, lines, chunk_skipped in executor.map(task, chunks):
+            output.write(text)
+            count += lines
+            if skipped is not None:
+                skipped.extend(chunk_skipped)
+    return count
+
+def parallel_sweep_csv(store, output, distances, fractions, patterns=None, skipped=None, engine='vector', workers=None, chunk_size=None):
+    """多进程版write_sweep_csv，返回行数"""
+    task = partial(_sweep_chunk, distances=distances, fractions=fractions, patterns=patterns or list(HIT_PATTERNS), engine=engine)
+    return run_parallel(store, output, sweep_header(distances), task, workers, chunk_size, skipped)
+
+def parallel_breakpoints_csv(store, output, distances, patterns=None, skipped=None, workers=None, chunk_size=None):
+    """多进程计算耐久断点表并写出CSV（格式同write_breakpoints_csv），返回行数"""
+    task = partial(_breakpoints_chunk, distances=distances, patterns=patterns)
+    return run_parallel(store, output, BREAKPOINT_HEADER, task, workers, chunk_size, skipped)
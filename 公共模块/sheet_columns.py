@@ -0,0 +1,166 @@
+from workbook_snapshot import read_sheet_rows
+
+# 各表格的列定义：字段名 -> Excel列字母，列表表示按顺序读取的一组列
+# first_row 为第一行数据所在的Excel行号（跳过标题行）
+
+# 夺金武器表（S6夺金武器.xlsx）
+GOLD_WEAPON_SHEET = {
+    'sheet': '夺金模式',
+    'first_row': 3,
+    'columns': {
+        'category': 'A',
+        'name': 'B',
+        'caliber': 'C',
+        'fire_mode': 'E',
+        'trigger_delay': 'F',
+        'fire_rate': 'G',
+        'muzzle_velocity': 'H',
+        'base_damage': 'I',
+        'armor_damage': 'K',
+        'head_multiplier': 'M',
+        'chest_multiplier': 'N',
+        'abdomen_multiplier': 'O',
+        'upper_arm_multiplier': 'P',
+        'lower_arm_multiplier': 'Q',
+        'thigh_multiplier': 'R',
+        'calf_multiplier': 'S',
+        'decay_distances': ['T', 'V', 'X', 'Z'],
+        'decay_factors': ['U', 'W', 'Y', 'AA']
+    }
+}
+
+# 子弹表（S6子弹数据.xlsx）
+BULLET_SHEET = {
+    'sheet': '子弹数据',
+    'first_row': 3,
+    'columns': {
+        'caliber': 'A',
+        'name': 'B',
+        'pellet_count': 'C',
+        'penetration_level': 'D',
+        'part_penetration_decay': 'E',
+        'base_damage_multiplier': 'F',
+        'base_armor_multiplier': 'G',
+        'armor_decay_factors': ['H', 'I', 'J', 'K', 'L', 'M'],  # 1-6甲护甲衰减倍率
+        'same_level_penetration': 'N',
+        'higher_level_penetration': 'O'
+    }
+}
+
+# 护甲表（S6护甲数据.xlsx），包含“护甲”“头盔”两个分段标记行
+ARMOR_SHEET = {
+    'sheet': '护甲数据',
+    'first_row': 1,
+    'columns': {
+        'name': 'A',
+        'level': 'B',
+        'type': 'C',
+        'max_durability': 'G',
+        'first_repair_max': 'H',
+        'repair_loss': 'I',
+        'repair_price': 'J',
+        'efficiencies': ['K', 'M', 'O', 'Q']  # 自制、标准、精密、高级维修包效率
+    }
+}
+
+# 战场武器表（S6战场武器.xlsx）
+BATTLEFIELD_WEAPON_SHEET = {
+    'sheet': '战场模式',
+    'first_row': 3,
+    'columns': {
+        'category': 'A',
+        'name': 'B',
+        'fire_mode': 'D',
+        'trigger_delay': 'E',
+        'rpm': 'F',
+        'shooting_interval': 'G',
+        'base_damage': 'I',
+        'head_mult': 'L',
+        'chest_mult': 'M',
+        'abdomen_mult': 'N',
+        'upper_arm_mult': 'O',
+        'forearm_mult': 'P',
+        'thigh_mult': 'Q',
+        'calf_mult': 'R',
+        'decay_distances': ['S', 'U', 'W', 'Y'],
+        'decay_multipliers': ['T', 'V', 'X', 'Z']
+    }
+}
+
+# 近战武器表（S6近战武器.xlsx），每把武器最多三段连击
+MELEE_WEAPON_SHEET = {
+    'sheet': 'Sheet1',
+    'first_row': 3,
+    'columns': {
+        'name': 'A',
+        'damages': ['B', 'C', 'D'],
+        'armor_damages': ['F', 'G', 'H'],
+        'head_multipliers': ['J', 'K', 'L']
+    }
+}
+
+# 战备计算器装备价格表（S5装备价格.xlsx）
+EQUIPMENT_PRICE_SHEET = {
+    'sheet': '护甲数据',
+    'first_row': 2,
+    'columns': {
+        'category': 'A',
+        'name': 'B',
+        'market_price': 'C',
+        'readiness_value': 'D',
+        'quality': 'G'
+    }
+}
+
+# 战备计算器武器价格表（S5武器价格.xlsx）
+WEAPON_PRICE_SHEET = {
+    'sheet': '夺金模式',
+    'first_row': 2,
+    'columns': {
+        'category': 'A',
+        'name': 'B',
+        'market_price': 'C',
+        'readiness_value': 'D'
+    }
+}
+
+def column_index(letter):
+    """Excel列字母转换为从0开始的列下标（A->0, AA->26）"""
+    index = 0
+    for char in letter.upper():
+        index = index * 26 + ord(char) - ord('A') + 1
+    return index - 1
+
+def compile_columns(columns):
+    """将列定义预先转换为下标，避免逐行解析列字母"""
+    compiled = []
+    for field, letters in columns.items():
+        if isinstance(letters, (list, tuple)):
+            compiled.append((field, tuple(column_index(letter) for letter in letters)))
+        else:
+            compiled.append((field, column_index(letters)))
+    return compiled
+
+def decode_row(row, compiled_columns):
+    """按列定义把一行值解码为字典，超出该行宽度的列视为空单元格"""
+    width = len(row)
+    record = {}
+    for field, index in compiled_columns:
+        if isinstance(index, tuple):
+            record[field] = [row[i] if i < width else None for i in index]
+        else:
+            record[field] = row[index] if index < width else None
+    return record
+
+def iter_records(file_path, layout):
+    """单次顺序遍历工作表，逐行按列定义解码（包含空行，由调用方筛选）
+    每条记录额外带有 'row' 字段，为该行的Excel行号
+    """
+    rows = read_sheet_rows(file_path, layout['sheet'])
+    compiled_columns = compile_columns(layout['columns'])
+    first_row = layout['first_row']
+
+    for row_number, row in enumerate(rows[first_row - 1:], start=first_row):
+        record = decode_row(row, compiled_columns)
+        record['row'] = row_number
+        yield record
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import pickle
+import sys
+
+import openpyxl
+
+# 快照格式版本，修改快照结构时递增，旧快照会自动重新编译
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = '.snapshot'
+
+def snapshot_path(file_path):
+    """快照文件与表格放在同一目录"""
+    return file_path + SNAPSHOT_SUFFIX
+
+def file_digest(file_path):
+    """计算表格文件内容的SHA-256摘要"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_workbook_values(file_path):
+    """读取整个表格的单元格值（每张工作表一组行元组）"""
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for ws in wb.worksheets:
+            rows = [tuple(row) for row in ws.iter_rows(values_only=True)]
+
+            # 去除尾部空行
+            while rows and all(value is None for value in rows[-1]):
+                rows.pop()
+
+            # 按实际使用的最大列宽截断，避免存入大量空列
+            width = 0
+            for row in rows:
+                for col in range(len(row), width, -1):
+                    if row[col - 1] is not None:
+                        width = col
+                        break
+            sheets[ws.title] = [row[:width] + (None,) * (width - len(row)) for row in rows]
+
+        return sheets, wb.active.title
+    finally:
+        wb.close()
+
+def compile_snapshot(file_path, digest=None):
+    """将表格编译为二进制快照并写入磁盘"""
+    stat = os.stat(file_path)
+    sheets, active = read_workbook_values(file_path)
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'digest': digest or file_digest(file_path),
+        'active': active,
+        'sheets': sheets
+    }
+    _write_snapshot(file_path, snapshot)
+    return snapshot
+
+def _write_snapshot(file_path, snapshot):
+    """原子写入快照；目录不可写时只跳过缓存，不影响读取"""
+    target = snapshot_path(file_path)
+    temp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(temp, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, target)
+    except OSError:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+def _read_snapshot(file_path):
+    """读取已有快照，文件损坏或格式过旧时返回None"""
+    try:
+        with open(snapshot_path(file_path), 'rb') as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('format') != SNAPSHOT_FORMAT:
+        return None
+    return snapshot
+
+def load_workbook_snapshot(file_path):
+    """读取表格快照；表格内容变化时自动重新编译"""
+    stat = os.stat(file_path)
+    snapshot = _read_snapshot(file_path)
+
+    if snapshot is not None:
+        # 修改时间与大小未变，直接使用快照
+        if snapshot['mtime_ns'] == stat.st_mtime_ns and snapshot['size'] == stat.st_size:
+            return snapshot
+
+        # 修改时间变了但内容相同（例如复制或重新保存），只刷新时间戳
+        digest = file_digest(file_path)
+        if snapshot['digest'] == digest:
+            snapshot['mtime_ns'] = stat.st_mtime_ns
+            snapshot['size'] = stat.st_size
+            _write_snapshot(file_path, snapshot)
+            return snapshot
+        return compile_snapshot(file_path, digest)
+
+    return compile_snapshot(file_path)
+
+def read_sheet_rows(file_path, sheet_name=None):
+    """读取工作表的全部行值，不指定工作表时读取活动工作表"""
+    snapshot = load_workbook_snapshot(file_path)
+    if sheet_name is None:
+        sheet_name = snapshot['active']
+    if sheet_name not in snapshot['sheets']:
+        raise KeyError(f"Worksheet {sheet_name} does not exist.")
+    return snapshot['sheets'][sheet_name]
+
+def find_workbooks(root):
+    """查找目录下的全部xlsx表格（跳过Excel临时文件）"""
+    workbooks = []
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = [name for name in dir_names if not name.startswith('.')]
+        for name in sorted(file_names):
+            if name.endswith('.xlsx') and not name.startswith('~$'):
+                workbooks.append(os.path.join(dir_path, name))
+    return workbooks
+
+def main():
+    # 不带参数时编译整个仓库内的表格
+    paths = sys.argv[1:] or find_workbooks(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+    for path in paths:
+        try:
+            snapshot = compile_snapshot(path)
+        except Exception as e:
+            print(f"编译失败: {path} - {e}")
+            continue
+        row_count = sum(len(rows) for rows in snapshot['sheets'].values())
+        print(f"已编译: {os.path.normpath(path)} ({len(snapshot['sheets'])} 张工作表, {row_count} 行)")
+
+if __name__ == "__main__":
+    main()
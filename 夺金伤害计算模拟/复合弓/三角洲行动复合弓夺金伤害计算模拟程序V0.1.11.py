@@ -1,8 +1,13 @@
 print("本程序由B站繁星攻略组制作")
 print("注：受限于数据精度问题，本程序给出的所有时间相关计算仅供参考，与实际存在一定误差")
 
+import os
+import sys
 from decimal import Decimal, ROUND_HALF_UP
-import openpyxl  # 添加Excel处理库
+
+# 公共模块目录（表格快照等共享代码）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '公共模块'))
+from sheet_columns import iter_records, ARMOR_SHEET
 
 # 使用Decimal进行高精度计算
 def round_decimal(value, decimals):
@@ -130,15 +135,12 @@ def calculate_penetration_rate(penetration, armor_level, is_head=False):
 def load_armor_data():
     """加载护甲和头盔数据"""
     try:
-        wb = openpyxl.load_workbook('S5护甲数据.xlsx', data_only=True)
-        ws = wb.active
-        
         armors = []
         helmets = []
         current_section = None
         
-        for row in range(1, ws.max_row + 1):
-            cell_value = ws.cell(row=row, column=1).value
+        for record in iter_records('S5护甲数据.xlsx', ARMOR_SHEET):
+            cell_value = record['name']
             
             # 检测章节开始
             if cell_value == "护甲":
@@ -153,9 +155,9 @@ def load_armor_data():
                 
             # 读取数据
             name = str(cell_value).strip()
-            level = ws.cell(row=row, column=2).value
-            armor_type = ws.cell(row=row, column=3).value
-            max_durability = ws.cell(row=row, column=7).value  # G列: 初始上限
+            level = record['level']
+            armor_type = record['type']
+            max_durability = record['max_durability']  # G列: 初始上限
             
             if level is None or max_durability is None:
                 continue
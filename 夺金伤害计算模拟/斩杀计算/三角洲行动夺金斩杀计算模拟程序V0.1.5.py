@@ -1,8 +1,18 @@
-import openpyxl
+import contextlib
 from decimal import Decimal, ROUND_HALF_UP, ROUND_FLOOR, ROUND_CEILING
-import msvcrt  # 用于检测按键
+try:
+    import msvcrt  # 用于检测按键
+except ImportError:
+    msvcrt = None  # 非Windows系统只能使用批量模式
+import os
 import sys  # 用于读取命令行参数
 
+# 公共模块目录（表格快照等共享代码）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '公共模块'))
+from sheet_columns import iter_records, GOLD_WEAPON_SHEET, BULLET_SHEET
+from data_store import build_data_store, bullets_for_caliber, create_session, get_session_store
+from gold_engine import calculate_penetration_multiplier
+
 # 全局调试模式标志
 DEBUG_MODE = False
 
@@ -21,29 +31,38 @@ def debug_print(message):
 def load_weapon_data():
     """加载武器数据"""
     try:
-        wb = openpyxl.load_workbook('S6夺金武器.xlsx', data_only=True)
-        ws = wb['夺金模式']
-        
         weapons = []
         current_category = ""
         
-        for row in range(3, ws.max_row + 1):
-            category_cell = ws.cell(row=row, column=1).value
+        for record in iter_records('S6夺金武器.xlsx', GOLD_WEAPON_SHEET):
+            category_cell = record['category']
             if category_cell and str(category_cell).strip():
                 current_category = str(category_cell).strip()
                 continue
                 
-            weapon_name = ws.cell(row=row, column=2).value
+            weapon_name = record['name']
             if not weapon_name or not str(weapon_name).strip():
                 continue
                 
             weapons.append({
                 'category': current_category,
                 'name': str(weapon_name).strip(),
-                'caliber': ws.cell(row=row, column=3).value,
-                'base_damage': ws.cell(row=row, column=9).value or 0,
-                'armor_damage': ws.cell(row=row, column=11).value or 0,
-                'head_multiplier': ws.cell(row=row, column=13).value or 1.0
+                'caliber': record['caliber'],
+                'base_damage': record['base_damage'] or 0,
+                'armor_damage': record['armor_damage'] or 0,
+                'head_multiplier': record['head_multiplier'] or 1.0,
+                # 以下字段只用于列式模型（--table）
+                'fire_mode': record['fire_mode'] or 0,
+                'trigger_delay': record['trigger_delay'] or 0,
+                'fire_rate': record['fire_rate'] or 0,
+                'chest_multiplier': record['chest_multiplier'] or 1.0,
+                'abdomen_multiplier': record['abdomen_multiplier'] or 1.0,
+                'upper_arm_multiplier': record['upper_arm_multiplier'] or 1.0,
+                'lower_arm_multiplier': record['lower_arm_multiplier'] or 1.0,
+                'thigh_multiplier': record['thigh_multiplier'] or 1.0,
+                'calf_multiplier': record['calf_multiplier'] or 1.0,
+                'decay_distances': [],  # 斩杀计算不考虑距离衰减
+                'decay_factors': []
             })
         
         return weapons
@@ -55,41 +74,35 @@ def load_weapon_data():
 def load_bullet_data():
     """加载子弹数据"""
     try:
-        wb = openpyxl.load_workbook('S6子弹数据.xlsx', data_only=True)
-        ws = wb['子弹数据']
-        
         bullets = []
         current_caliber = ""
         
-        for row in range(3, ws.max_row + 1):
-            caliber_cell = ws.cell(row=row, column=1).value
+        for record in iter_records('S6子弹数据.xlsx', BULLET_SHEET):
+            caliber_cell = record['caliber']
             if caliber_cell and str(caliber_cell).strip():
                 current_caliber = str(caliber_cell).strip()
                 
-            bullet_name = ws.cell(row=row, column=2).value
+            bullet_name = record['name']
             if not bullet_name or not str(bullet_name).strip():
                 continue
                 
             # 获取同级穿透倍率（N列）
-            same_level_penetration = ws.cell(row=row, column=14).value
+            same_level_penetration = record['same_level_penetration']
             if same_level_penetration is None or same_level_penetration == "":
                 same_level_penetration = 0.5  # 默认值
                 
             bullets.append({
                 'caliber': current_caliber,
                 'name': str(bullet_name).strip(),
-                'penetration_level': ws.cell(row=row, column=4).value or 0,
-                'base_damage_multiplier': ws.cell(row=row, column=6).value or 1.0,
-                'base_armor_multiplier': ws.cell(row=row, column=7).value or 1.0,
+                'penetration_level': record['penetration_level'] or 0,
+                'base_damage_multiplier': record['base_damage_multiplier'] or 1.0,
+                'base_armor_multiplier': record['base_armor_multiplier'] or 1.0,
                 'same_level_penetration': same_level_penetration,
-                'armor_decay_factors': [
-                    ws.cell(row=row, column=8).value or 0.0,  # 1甲
-                    ws.cell(row=row, column=9).value or 0.0,  # 2甲
-                    ws.cell(row=row, column=10).value or 0.0, # 3甲
-                    ws.cell(row=row, column=11).value or 0.0, # 4甲
-                    ws.cell(row=row, column=12).value or 0.0, # 5甲
-                    ws.cell(row=row, column=13).value or 0.0  # 6甲
-                ]
+                'higher_level_penetration': record['higher_level_penetration'] or 0.75,  # O列：越级穿透倍率
+                # 以下字段只用于列式模型（--table）
+                'pellet_count': record['pellet_count'] or 1,
+                # 1-6甲护甲衰减倍率（H到M列）
+                'armor_decay_factors': [factor or 0.0 for factor in record['armor_decay_factors']]
             })
         
         return bullets
@@ -98,6 +111,14 @@ def load_bullet_data():
         print(f"无法加载子弹数据: {e}")
         return []
 
+def load_data_store():
+    """加载武器与子弹数据并建立索引，任一数据为空时返回None"""
+    weapons = load_weapon_data()
+    bullets = load_bullet_data()
+    if not weapons or not bullets:
+        return None
+    return build_data_store(weapons, bullets)
+
 def calculate_damage(weapon, bullet, armor_level, durability=None, double_shot=False):
     """计算伤害"""
     # 转换为Decimal以确保精度
@@ -107,8 +128,8 @@ def calculate_damage(weapon, bullet, armor_level, durability=None, double_shot=F
     base_damage_multiplier = Decimal(str(bullet['base_damage_multiplier']))
     base_armor_multiplier = Decimal(str(bullet['base_armor_multiplier']))
     
-    # 使用子弹数据表格的N列数据（同级穿透倍率）
-    penetration_multiplier = Decimal(str(bullet['same_level_penetration']))
+    # 穿透倍率与伤害计算引擎一致：低于头盔等级为0，同级取N列，越一级取O列，越两级及以上为1
+    penetration_multiplier = calculate_penetration_multiplier(int(bullet['penetration_level']), armor_level, bullet)
     
     # 获取护甲衰减倍率
     armor_decay_factor = Decimal(str(bullet['armor_decay_factors'][armor_level - 1]))
@@ -134,7 +155,7 @@ def calculate_damage(weapon, bullet, armor_level, durability=None, double_shot=F
     debug_print(f"爆头倍率: {head_multiplier}")
     debug_print(f"子弹伤害倍率: {base_damage_multiplier}")
     debug_print(f"子弹护甲倍率: {base_armor_multiplier}")
-    debug_print(f"同级穿透倍率: {penetration_multiplier}")
+    debug_print(f"穿透倍率: {penetration_multiplier}")
     debug_print(f"护甲衰减倍率: {armor_decay_factor}")
     debug_print(f"护甲伤害值: {armor_damage_value}")
     debug_print(f"无护甲伤害: {unarmored_damage}")
@@ -274,6 +295,48 @@ def calculate_min_durability(weapon, bullet, armor_level):
     debug_print("无解，双发必死")
     return "双发必死"  # 无解，双发必死
 
+def get_option(name):
+    """读取命令行参数 name 后面的值，没有时返回None"""
+    args = sys.argv[1:]
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args) and not args[index + 1].startswith('--'):
+            return args[index + 1]
+    return None
+
+def run_table_mode():
+    """斩杀耐久表：--table [--output 结果文件]
+    对全部武器×同口径子弹×1-6级头盔一次算出单发/双发爆头不可击杀的最低耐久（JSON，按武器、子弹、头盔等级直接查询）
+    """
+    from kill_thresholds import write_kill_table
+    
+    output_path = get_option('--output')
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        store = load_data_store()
+    if store is None:
+        print("无法加载数据，请确保Excel文件存在且格式正确", file=sys.stderr)
+        return
+    
+    if output_path:
+        output = open(output_path, 'w', encoding='utf-8', newline='')
+    else:
+        sys.stdout.reconfigure(encoding='utf-8', newline='')
+        output = sys.stdout
+    
+    skipped = []
+    try:
+        count = write_kill_table(store, output, skipped)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    print(f"斩杀耐久表计算完成：共 {count} 条（武器×子弹×头盔等级）", file=sys.stderr)
+    if skipped:
+        print(f"以下 {len(skipped)} 项的表格数据不完整（存在“？”等未知数值），已跳过：", file=sys.stderr)
+        for name in skipped:
+            print(f"  {name}", file=sys.stderr)
+
 def wait_for_continue():
     """等待用户按Enter继续或Esc退出"""
     print("\n按Enter键开始新一轮计算，或按Esc键退出...")
@@ -286,26 +349,27 @@ def wait_for_continue():
                 return False
 
 def main():
+    if '--table' in sys.argv:
+        run_table_mode()
+        return
+    
     # 解析命令行参数
     parse_command_line_args()
     
+    # 整个进程只加载一次数据，表格修改后下一轮自动重新加载
+    session = create_session(['S6夺金武器.xlsx', 'S6子弹数据.xlsx'], load_data_store)
+    
     while True:
         print("三角洲行动夺金伤害计算模拟程序 - 爆头不可击杀最低耐久计算")
         
-        # 加载数据
-        weapons = load_weapon_data()
-        bullets = load_bullet_data()
+        # 取得数据
+        store = get_session_store(session)
         
-        if not weapons or not bullets:
+        if store is None:
             print("无法加载数据，请确保Excel文件存在且格式正确")
             return
         
-        # 按武器分类分组
-        categories = {}
-        for weapon in weapons:
-            if weapon['category'] not in categories:
-                categories[weapon['category']] = []
-            categories[weapon['category']].append(weapon)
+        categories = store['weapons_by_category']
         
         # 选择武器分类
         print("\n可用武器分类:")
@@ -347,7 +411,7 @@ def main():
         print(f"爆头倍率: {selected_weapon['head_multiplier']}")
         
         # 筛选匹配口径的子弹
-        caliber_bullets = [b for b in bullets if b['caliber'] == selected_weapon['caliber']]
+        caliber_bullets = bullets_for_caliber(store, selected_weapon['caliber'])
         
         if not caliber_bullets:
             print(f"\n没有找到匹配 {selected_weapon['caliber']} 口径的子弹")
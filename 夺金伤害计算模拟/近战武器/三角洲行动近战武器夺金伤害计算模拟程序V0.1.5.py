@@ -1,8 +1,12 @@
 print("本程序由B站繁星攻略组制作")
 
+import os
 import sys
 from decimal import Decimal, ROUND_HALF_UP
-import openpyxl
+
+# 公共模块目录（表格快照等共享代码）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '公共模块'))
+from sheet_columns import iter_records, MELEE_WEAPON_SHEET, ARMOR_SHEET
 
 def get_decimal_input(prompt, min_val, max_val, decimal_places):
     """获取精确的小数输入"""
@@ -37,13 +41,10 @@ def get_int_input(prompt, min_val, max_val):
 def load_melee_weapons_data():
     """加载近战武器数据"""
     try:
-        wb = openpyxl.load_workbook('S6近战武器.xlsx', data_only=True)
-        ws = wb['Sheet1']
-        
         weapons = []
         
-        for row in range(3, ws.max_row + 1):
-            weapon_name = ws.cell(row=row, column=1).value
+        for record in iter_records('S6近战武器.xlsx', MELEE_WEAPON_SHEET):
+            weapon_name = record['name']
             if not weapon_name or not str(weapon_name).strip():
                 continue
                 
@@ -55,22 +56,15 @@ def load_melee_weapons_data():
                 'head_multipliers': []
             }
             
-            # 基础伤害列：2,3,4 (B,C,D)
-            # 护甲伤害列：6,7,8 (F,G,H)
-            # 爆头倍率列：10,11,12 (J,K,L)
-            
             for i in range(3):  # 三组数据
                 # 基础伤害
-                damage_col = 2 + i  # B,C,D
-                damage = ws.cell(row=row, column=damage_col).value
+                damage = record['damages'][i]  # B,C,D
                 
                 # 护甲伤害
-                armor_col = 6 + i  # F,G,H
-                armor_damage = ws.cell(row=row, column=armor_col).value
+                armor_damage = record['armor_damages'][i]  # F,G,H
                 
                 # 爆头倍率
-                head_col = 10 + i  # J,K,L
-                head_multiplier = ws.cell(row=row, column=head_col).value
+                head_multiplier = record['head_multipliers'][i]  # J,K,L
                 
                 # 处理特殊值
                 if damage in (None, "", "/", "//", "N/A"):
@@ -146,15 +140,12 @@ def select_protection(items, item_type):
 def load_armor_data():
     """加载护甲和头盔数据"""
     try:
-        wb = openpyxl.load_workbook('S6护甲数据.xlsx', data_only=True)
-        ws = wb.active
-        
         armors = []
         helmets = []
         current_section = None
         
-        for row in range(1, ws.max_row + 1):
-            cell_value = ws.cell(row=row, column=1).value
+        for record in iter_records('S6护甲数据.xlsx', ARMOR_SHEET):
+            cell_value = record['name']
             
             # 检测章节开始
             if cell_value == "护甲":
@@ -169,9 +160,9 @@ def load_armor_data():
                 
             # 读取数据
             name = str(cell_value).strip()
-            level = ws.cell(row=row, column=2).value
-            armor_type = ws.cell(row=row, column=3).value
-            max_durability = ws.cell(row=row, column=7).value  # G列: 初始上限
+            level = record['level']
+            armor_type = record['type']
+            max_durability = record['max_durability']  # G列: 初始上限
             
             if level is None or max_durability is None:
                 continue
@@ -0,0 +1,974 @@
+import sys
+
+# 批量模式下标准输出只写计算结果，提示信息写到标准错误
+BATCH_MODE = any(flag in sys.argv for flag in ('--batch', '--sweep', '--curves', '--montecarlo', '--solve', '--breakpoints', '--ammo', '--top', '--heatmap', '--mixed'))
+print("本程序由繁星攻略组制作", file=sys.stderr if BATCH_MODE else sys.stdout)
+
+import contextlib
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None  # 非Windows系统只能使用批量模式
+import os
+
+# 公共模块目录（表格快照等共享代码）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '公共模块'))
+from sheet_columns import iter_records, GOLD_WEAPON_SHEET, BULLET_SHEET, ARMOR_SHEET
+from data_store import build_data_store, bullets_for_caliber, create_session, get_session_store
+from gold_engine import cached_loadout, new_state, parse_shot
+from gold_history import new_history, current_state, push_hit, rewind, edit_hit
+from gold_batch import DEFAULT_ENGINE, ENGINES, iter_scenarios, open_scenarios, run_batch
+from gold_solver import run_solve_batch
+
+# 全局调试标志
+DEBUG_MODE = False
+
+# 程序使用的数据表格
+DATA_FILES = ['S6护甲数据.xlsx', 'S6夺金武器.xlsx', 'S6子弹数据.xlsx']
+
+def debug_print(*args, **kwargs):
+    """只在调试模式下打印信息"""
+    if DEBUG_MODE:
+        print("[DEBUG]", *args, **kwargs)
+
+def get_decimal_input(prompt, min_val, max_val, decimal_places):
+    """获取精确的小数输入"""
+    while True:
+        try:
+            value = input(prompt)
+            decimal_value = Decimal(value)
+            quantized = decimal_value.quantize(
+                Decimal('1.' + '0' * decimal_places), 
+                rounding=ROUND_HALF_UP
+            )
+            float_val = float(quantized)
+            if min_val <= float_val <= max_val:
+                return quantized
+            else:
+                print(f"输入错误，范围{min_val}到{max_val}，请重新输入。")
+        except Exception:
+            print("输入错误，请输入有效的数字。")
+
+def get_int_input(prompt, min_val, max_val):
+    """获取整数输入"""
+    while True:
+        try:
+            value = int(input(prompt))
+            if min_val <= value <= max_val:
+                return value
+            else:
+                print(f"输入错误，范围{min_val}到{max_val}，请重新输入。")
+        except ValueError:
+            print("输入错误，请输入整数。")
+
+def wait_for_key(continue_msg="按 Enter 开始新一轮计算，按 ESC 结束程序"):
+    """等待用户按键，返回True继续，False退出"""
+    print(f"\n{continue_msg}")
+    while True:
+        if msvcrt.kbhit():
+            key = msvcrt.getch()
+            if key == b'\r':  # Enter键
+                return True
+            elif key == b'\x1b':  # ESC键
+                return False
+
+def standardize_caliber(caliber):
+    """标准化口径表示，确保匹配"""
+    if caliber is None:
+        return ""
+    # 去除空格和点号，统一大小写
+    return caliber.replace(" ", "").replace(".", "").lower().strip()
+
+def load_weapons_data():
+    """加载武器数据（修复版本）"""
+    try:
+        weapons = []
+        current_category = ""
+        
+        # 按列定义逐行读取（从第3行开始，跳过前2行标题）
+        for record in iter_records('S6夺金武器.xlsx', GOLD_WEAPON_SHEET):
+            # 读取关键单元格
+            category_cell = record['category']
+            weapon_name = record['name']
+            
+            # 更新当前武器类别（如果有）
+            if category_cell and str(category_cell).strip():
+                current_category = str(category_cell).strip()
+            
+            # 跳过空行（没有武器名称的行）
+            if not weapon_name or not str(weapon_name).strip():
+                continue
+            
+            # 标准化口径
+            caliber = record['caliber']
+            std_caliber = standardize_caliber(caliber) if caliber else ""
+            
+            # 创建武器数据字典
+            weapon_data = {
+                'category': current_category,
+                'name': str(weapon_name).strip(),
+                'caliber': std_caliber,
+                'raw_caliber': caliber,  # 保留原始口径用于显示
+                'fire_mode': record['fire_mode'] or 0,
+                'trigger_delay': record['trigger_delay'] or 0,
+                'fire_rate': record['fire_rate'] or 0,
+                'muzzle_velocity': record['muzzle_velocity'] or 0,
+                'base_damage': record['base_damage'] or 0,
+                'armor_damage': record['armor_damage'] or 0,
+                # 部位倍率
+                'head_multiplier': record['head_multiplier'] or 1.0,
+                'chest_multiplier': record['chest_multiplier'] or 1.0,
+                'abdomen_multiplier': record['abdomen_multiplier'] or 1.0,
+                'upper_arm_multiplier': record['upper_arm_multiplier'] or 1.0,
+                'lower_arm_multiplier': record['lower_arm_multiplier'] or 1.0,
+                'thigh_multiplier': record['thigh_multiplier'] or 1.0,
+                'calf_multiplier': record['calf_multiplier'] or 1.0,
+                'decay_distances': [],
+                'decay_factors': []
+            }
+            
+            # 读取衰减数据（最多4组）
+            for dist, factor in zip(record['decay_distances'], record['decay_factors']):  # T/U, V/W, X/Y, Z/AA列
+                # 处理特殊值
+                if dist in (None, "", "/", "//", "N/A"):
+                    continue
+                    
+                try:
+                    # 尝试转换为数值
+                    dist_val = float(dist)
+                    factor_val = float(factor)
+                    weapon_data['decay_distances'].append(dist_val)
+                    weapon_data['decay_factors'].append(factor_val)
+                except (ValueError, TypeError):
+                    continue
+            
+            weapons.append(weapon_data)
+        
+        debug_print(f"成功加载 {len(weapons)} 种武器")
+        return weapons
+    
+    except Exception as e:
+        print(f"\n错误: 无法加载武器数据 - {e}")
+        return []
+
+def load_bullets_data():
+    """加载子弹数据（修复版本）"""
+    try:
+        bullets = []
+        current_caliber = ""
+        
+        # 按列定义逐行读取（从第3行开始，跳过前2行标题）
+        for record in iter_records('S6子弹数据.xlsx', BULLET_SHEET):
+            # 读取关键单元格
+            caliber_cell = record['caliber']
+            bullet_name = record['name']
+            
+            # 更新当前口径（如果有）
+            if caliber_cell and str(caliber_cell).strip():
+                current_caliber = standardize_caliber(caliber_cell)
+            
+            # 跳过空行（没有子弹名称的行）
+            if not bullet_name or not str(bullet_name).strip():
+                continue
+                
+            # 处理可能的空值
+            pellet_count = record['pellet_count'] or 1
+            penetration_level = record['penetration_level'] or 0
+            base_damage_multiplier = record['base_damage_multiplier'] or 1.0
+            base_armor_multiplier = record['base_armor_multiplier'] or 1.0
+            
+            # 读取新的穿透倍率数据（N列和O列）
+            same_level_penetration = record['same_level_penetration'] or 0.5  # N列：同级穿透倍率
+            higher_level_penetration = record['higher_level_penetration'] or 0.75  # O列：越级穿透倍率
+            
+            bullet_data = {
+                'caliber': current_caliber,
+                'name': str(bullet_name).strip(),
+                'pellet_count': pellet_count,
+                'penetration_level': penetration_level,
+                'base_damage_multiplier': base_damage_multiplier,
+                'base_armor_multiplier': base_armor_multiplier,
+                'same_level_penetration': same_level_penetration,  # 新增：同级穿透倍率
+                'higher_level_penetration': higher_level_penetration,  # 新增：越级穿透倍率
+                'armor_decay_factors': []
+            }
+            
+            # 读取护甲衰减倍率 (1-6级)
+            for factor in record['armor_decay_factors']:  # H到M列
+                if factor is None:
+                    factor = 0.0
+                try:
+                    bullet_data['armor_decay_factors'].append(float(factor))
+                except (ValueError, TypeError):
+                    bullet_data['armor_decay_factors'].append(0.0)
+            
+            bullets.append(bullet_data)
+        
+        debug_print(f"成功加载 {len(bullets)} 种子弹")
+        return bullets
+    
+    except Exception as e:
+        print(f"\n错误: 无法加载子弹数据 - {e}")
+        return []
+
+def load_armor_data():
+    """加载护甲和头盔数据（修复版本）"""
+    try:
+        armors = []
+        helmets = []
+        current_section = None
+        
+        for record in iter_records('S6护甲数据.xlsx', ARMOR_SHEET):
+            cell_value = record['name']
+            
+            # 检测章节开始标记
+            if cell_value == "护甲":
+                current_section = "armor"
+            elif cell_value == "头盔":
+                current_section = "helmet"
+            
+            # 读取数据列
+            name = str(cell_value).strip() if cell_value else ""
+            level = record['level']
+            armor_type = record['type']
+            max_durability = record['max_durability']  # G列: 初始上限
+            
+            # 跳过空行和标记行（没有有效数据的行）
+            if not name or name in ["护甲", "头盔"] or level is None or max_durability is None:
+                continue
+                
+            try:
+                level = int(level)
+                max_durability = Decimal(str(max_durability))
+            except (ValueError, TypeError):
+                continue
+                
+            item_data = {
+                'name': name,
+                'level': level,
+                'max_durability': max_durability
+            }
+            
+            if current_section == "armor":
+                # 护甲类型映射
+                if armor_type == '半甲':
+                    item_data['armor_type'] = 1
+                elif armor_type == '全甲':
+                    item_data['armor_type'] = 2
+                elif armor_type == '重甲':
+                    item_data['armor_type'] = 3
+                else:
+                    continue  # 跳过无效类型
+                armors.append(item_data)
+                
+            elif current_section == "helmet":
+                helmets.append(item_data)
+                
+        debug_print(f"成功加载 {len(armors)} 种护甲和 {len(helmets)} 种头盔")
+        return armors, helmets
+    
+    except Exception as e:
+        print(f"\n错误: 无法加载护甲数据 - {e}")
+        return [], []
+
+def load_data_store():
+    """加载武器、子弹、护甲数据并建立索引，武器或子弹加载失败时返回None"""
+    print("正在加载护甲数据...")
+    armors, helmets = load_armor_data()
+    
+    print("正在加载武器数据...")
+    weapons = load_weapons_data()
+    if not weapons:
+        print("无法加载武器数据，程序退出")
+        return None
+    
+    print("正在加载子弹数据...")
+    bullets = load_bullets_data()
+    if not bullets:
+        print("无法加载子弹数据，程序退出")
+        return None
+    
+    return build_data_store(weapons, bullets, armors, helmets)
+
+def select_protection(levels, item_type):
+    """选择防护装备并输入耐久（levels为按等级分组的装备索引）"""
+    print(f"\n=== 选择{item_type} ===")
+    print("0. 无")
+    
+    # 显示等级选项
+    sorted_levels = sorted(levels.keys())
+    for i, level in enumerate(sorted_levels, 1):
+        print(f"{i}. {level}级{item_type}")
+    
+    # 获取用户选择，包括0（无）选项
+    max_choice = len(sorted_levels)
+    level_choice = get_int_input(f"请选择{item_type}等级 (0-{max_choice}): ", 0, max_choice)
+    
+    # 处理"无"选项
+    if level_choice == 0:
+        debug_print(f"用户选择无{item_type}")
+        return None, Decimal('0.0')
+    
+    selected_level = sorted_levels[level_choice - 1]
+    
+    # 显示该等级下的装备
+    level_items = levels[selected_level]
+    print(f"\n{selected_level}级{item_type}列表:")
+    for i, item in enumerate(level_items, 1):
+        print(f"{i}. {item['name']} (最大耐久: {item['max_durability']})")
+    
+    item_choice = get_int_input(f"请选择{item_type}: ", 1, len(level_items))
+    selected_item = level_items[item_choice - 1]
+    
+    # 输入当前耐久
+    max_durability = float(selected_item['max_durability'])
+    durability = get_decimal_input(
+        f"请输入当前{item_type}耐久 (0.0-{max_durability}): ",
+        0.0, max_durability, 1
+    )
+    
+    debug_print(f"选择{item_type}: {selected_item['name']}, 等级: {selected_item['level']}, 耐久: {durability}")
+    return selected_item, durability
+
+def print_hit_result(loadout, record, helmet_level):
+    """输出一次攻击的计算结果"""
+    hit_part = record['part']
+    total_time = record['time']
+    
+    debug_print(f"命中部位: {hit_part}, 命中次数: {record['shot']}")
+    debug_print(f"总耗时: {total_time} ms")
+    
+    # 处理未命中
+    if hit_part == '未命中':
+        print("\n=== 计算结果 ===")
+        print("本次攻击未命中")
+        print(f"累计耗时：{total_time} ms")
+        return
+    
+    if 'pellets' in record:
+        print_pellet_result(loadout, record)
+        return
+    
+    is_338_lap_mag = loadout['is_338_lap_mag']
+    if record['protected']:
+        debug_print(f"{hit_part} 受{'头盔' if record['protector'] == 'helmet' else '护甲'}保护，穿透倍率: {record['penetration_multiplier']}")
+        debug_print(f"护甲是否被击碎: {record['protector_destroyed']}")
+        if is_338_lap_mag:
+            print("\n[.338 Lap Mag特殊效果] 完全穿透护甲！")
+    else:
+        debug_print("无保护，直接计算伤害")
+    
+    final_damage = record['damage']
+    armor_damage_dealt = record['armor_damage']
+    debug_print(f"最终伤害: {final_damage}")
+    
+    # 输出结果
+    print("\n=== 计算结果 ===")
+    if record['protected'] and not is_338_lap_mag:  # .338弹药不显示护甲阻挡信息
+        if record['protector'] == 'helmet':
+            print("头盔被击碎！" if record['protector_destroyed'] else "头盔未被击碎。")
+            print(f"头盔损失耐久：{armor_damage_dealt.quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)}")
+        else:
+            print("护甲被击碎！" if record['protector_destroyed'] else "护甲未被击碎。")
+            print(f"护甲损失耐久：{armor_damage_dealt.quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)}")
+    elif hit_part == '头部' and helmet_level > 0 and not is_338_lap_mag:
+        print("（未受头盔保护）")
+    
+    print(f"受到伤害：{final_damage}")
+    print(f"剩余生命值：{record['health'].quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)}")
+    print(f"剩余头盔耐久：{record['helmet_durability']}")
+    print(f"剩余护甲耐久：{record['armor_durability']}")
+    print(f"累计耗时：{total_time} ms")
+
+def print_pellet_result(loadout, record):
+    """输出多弹丸一发的计算结果（各弹丸依次结算）"""
+    pellets = record['pellets']
+    counts = {}
+    for pellet in pellets:
+        counts[pellet['part']] = counts.get(pellet['part'], 0) + 1
+    for i, pellet in enumerate(pellets, 1):
+        debug_print(f"第{i}颗弹丸: {pellet['part']}, 防护: {pellet['protector']}, 伤害: {pellet['damage']}, 护甲伤害: {pellet['armor_damage']}")
+    
+    print("\n=== 计算结果 ===")
+    print("命中弹丸：" + "，".join(f"{part}{count}颗" for part, count in counts.items()))
+    if not loadout['is_338_lap_mag']:
+        for protector_type, name in (('helmet', '头盔'), ('armor', '护甲')):
+            hits = [pellet for pellet in pellets if pellet['protector'] == protector_type]
+            if hits:
+                lost = sum((pellet['armor_damage'] for pellet in hits), Decimal('0.0'))
+                print(f"{name}被击碎！" if any(pellet['protector_destroyed'] for pellet in hits) else f"{name}未被击碎。")
+                print(f"{name}损失耐久：{lost.quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)}（{len(hits)}颗弹丸）")
+    
+    print(f"受到伤害：{record['damage']}")
+    print(f"剩余生命值：{record['health'].quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)}")
+    print(f"剩余头盔耐久：{record['helmet_durability']}")
+    print(f"剩余护甲耐久：{record['armor_durability']}")
+    print(f"累计耗时：{record['time']} ms")
+
+def is_valid_shot(loadout, hit_part):
+    """输入是否为有效的命中部位（多弹丸子弹可写成“头部*2+胸部*5”）"""
+    try:
+        parse_shot(hit_part, loadout['pellet_count'])
+    except ValueError:
+        return False
+    return True
+
+def print_final_statistics(loadout, history):
+    """击杀后输出最终统计"""
+    state = current_state(history)
+    hit_statistics = state['hit_statistics']
+    print("\n=== 最终统计 ===")
+    print(f"射击模式：{'全自动' if loadout['fire_mode'] == 1 else '半自动'}")
+    print(f"总造成伤害：{state['total_damage'].quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)}")
+    print(f"总护甲伤害：{state['total_armor_damage'].quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)}")
+    
+    # 多弹丸子弹的命中统计按弹丸计数，有效命中为至少一颗弹丸命中的攻击次数
+    print("\n命中统计（弹丸）：" if loadout['pellet_count'] > 1 else "\n命中统计：")
+    total_shots = state['hit_count']
+    valid_hits = sum(1 for record in history['records'] if set(parse_shot(record['part'], loadout['pellet_count'])) != {'未命中'})
+    display_order = ['未命中', '头部', '胸部', '腹部', '下腹部', '大臂', '小臂', '大腿', '小腿']
+    for part in display_order:
+        count = hit_statistics.get(part, 0)
+        if count > 0:
+            print(f"{part.ljust(5)}：{count}{'颗' if loadout['pellet_count'] > 1 else '次'}")
+    
+    print(f"\n有效命中次数：{valid_hits}次")
+    print(f"总攻击次数：{total_shots}次")
+    print(f"击杀耗时：{state['total_time']} ms")
+
+def print_current_state(history):
+    """输出撤销或修改后的当前状态"""
+    state = current_state(history)
+    print("\n=== 当前状态 ===")
+    print(f"已攻击次数：{len(history['records'])}次")
+    print(f"剩余生命值：{state['health'].quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)}")
+    print(f"剩余头盔耐久：{state['helmet_durability']}")
+    print(f"剩余护甲耐久：{state['armor_durability']}")
+    print(f"累计耗时：{state['total_time']} ms")
+
+def run_history_command(loadout, history, text, helmet_level):
+    """处理命中记录命令，text不是命令时返回False
+    undo/撤销 [发数]：撤销最近的命中；edit/修改 序号 部位：修改第几发的命中部位；history/记录：查看命中记录
+    """
+    words = text.split()
+    if not words:
+        return False
+    command = words[0].lower()
+    records = history['records']
+    
+    if command in ('undo', '撤销'):
+        try:
+            count = int(words[1]) if len(words) > 1 else 1
+        except ValueError:
+            count = 0
+        if count < 1 or len(words) > 2:
+            print("用法：undo [发数]，发数为正整数")
+        elif not records:
+            print("还没有命中记录，无法撤销")
+        else:
+            print(f"已撤销 {rewind(history, count)} 发")
+            print_current_state(history)
+        return True
+    
+    if command in ('edit', '修改'):
+        try:
+            index = int(words[1]) if len(words) == 3 and is_valid_shot(loadout, words[2]) else 0
+        except ValueError:
+            index = 0
+        if not 1 <= index <= len(records):
+            print(f"用法：edit 序号 部位，序号为1-{len(records)}" if records else "还没有命中记录，无法修改")
+            return True
+        replayed = len(records) - index + 1
+        dropped = edit_hit(loadout, history, index, words[2])
+        print(f"已将第{index}发改为{words[2]}，从第{index}发起重新结算")
+        print_hit_result(loadout, records[index - 1], helmet_level)
+        if dropped:
+            print(f"修改后第{len(records)}发即可击杀，之后的 {dropped} 发命中已作废")
+        elif replayed > 1:
+            print(f"（之后的 {replayed - 1} 发命中已按原部位重新结算）")
+        print_current_state(history)
+        return True
+    
+    if command in ('history', '记录'):
+        if not records:
+            print("还没有命中记录")
+        for n, record in enumerate(records, 1):
+            print(f"第{n}发 {record['part'].ljust(4)} 伤害 {record['damage']}  剩余生命值 {record['health'].quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)}  累计耗时 {record['time']} ms")
+        return True
+    
+    return False
+
+def run_simulation(session):
+    """运行一次完整的伤害模拟（数据由会话提供，表格未修改时不重新加载）"""
+    # 初始化参数
+    print("=== 通用武器伤害模拟器 ===")
+    
+    # 取得数据
+    store = get_session_store(session)
+    if store is None:
+        return False
+    
+    # 选择头盔
+    helmet_level = 0
+    helmet_durability = Decimal('0.0')
+    
+    if store['helmets']:
+        selected_helmet, helmet_durability = select_protection(store['helmets_by_level'], "头盔")
+        if selected_helmet:
+            helmet_level = selected_helmet['level']
+            print(f"已选择头盔: {selected_helmet['name']} (等级{helmet_level})")
+        else:
+            print("已选择：无头盔")
+    else:
+        print("未找到头盔数据，将使用无头盔设置")
+    
+    # 选择护甲
+    armor_level = 0
+    armor_durability = Decimal('0.0')
+    armor_type_value = 0
+    
+    if store['armors']:
+        selected_armor, armor_durability = select_protection(store['armors_by_level'], "护甲")
+        if selected_armor:
+            armor_level = selected_armor['level']
+            armor_type_value = selected_armor['armor_type']
+            print(f"已选择护甲: {selected_armor['name']} (等级{armor_level}, 类型{armor_type_value})")
+        else:
+            print("已选择：无护甲")
+    else:
+        print("未找到护甲数据，将使用无护甲设置")
+    
+    # 选择武器
+    print("\n=== 选择武器 ===")
+    print("（点射武器不适用本程序）")
+    
+    # 武器类别索引
+    categories = store['weapons_by_category']
+    
+    # 显示武器类别
+    print("\n请选择武器类别：")
+    category_list = list(categories.keys())
+    for i, category in enumerate(category_list, 1):
+        print(f"{i}. {category}")
+    
+    category_choice = get_int_input("输入类别编号：", 1, len(category_list))
+    selected_category = category_list[category_choice - 1]
+    
+    # 显示选定类别中的武器
+    print(f"\n{selected_category}武器列表：")
+    category_weapons = categories[selected_category]
+    for i, weapon in enumerate(category_weapons, 1):
+        print(f"{i}. {weapon['name']} ({weapon['raw_caliber']})")
+    
+    weapon_choice = get_int_input("输入武器编号：", 1, len(category_weapons))
+    selected_weapon = category_weapons[weapon_choice - 1]
+    weapon_caliber = selected_weapon['caliber']
+    
+    debug_print(f"选择武器: {selected_weapon['name']}, 口径: {weapon_caliber}")
+    
+    # 根据武器口径过滤子弹
+    caliber_bullets = bullets_for_caliber(store, weapon_caliber)
+    
+    if not caliber_bullets:
+        print(f"\n警告：没有找到匹配 {weapon_caliber} 口径的子弹！")
+        print(f"武器口径: {selected_weapon['raw_caliber']}")
+        print("可用的子弹口径:")
+        for cal in store['bullets_by_caliber']:
+            print(f" - {cal}")
+        print("程序将退出。")
+        return False
+    
+    # 选择子弹
+    print(f"\n=== 选择 {selected_weapon['raw_caliber']} 子弹 ===")
+    for i, bullet in enumerate(caliber_bullets, 1):
+        pen_level = bullet['penetration_level']
+        dmg_mult = bullet['base_damage_multiplier']
+        same_pen = bullet['same_level_penetration']
+        higher_pen = bullet['higher_level_penetration']
+        print(f"{i}. {bullet['name']} (穿透:{pen_level}, 伤害:{dmg_mult}, 同级穿透:{same_pen}, 越级穿透:{higher_pen})")
+    
+    bullet_choice = get_int_input("输入子弹编号：", 1, len(caliber_bullets))
+    selected_bullet = caliber_bullets[bullet_choice - 1]
+    
+    debug_print(f"选择子弹: {selected_bullet['name']}, 穿透等级: {selected_bullet['penetration_level']}, 伤害倍率: {selected_bullet['base_damage_multiplier']}")
+    debug_print(f"同级穿透倍率: {selected_bullet['same_level_penetration']}, 越级穿透倍率: {selected_bullet['higher_level_penetration']}")
+    
+    # 输入目标距离
+    distance = get_decimal_input("\n请输入目标距离（0-400米）：", 0.0, 400.0, 1)
+    
+    # 预编译本次模拟的全部常量（衰减倍率、各部位伤害、护甲伤害、射击间隔等），相同组合直接复用缓存
+    try:
+        loadout = cached_loadout(
+            selected_weapon, selected_bullet,
+            helmet_level=helmet_level,
+            armor_level=armor_level,
+            armor_type=armor_type_value,
+            distance=distance
+        )
+    except InvalidOperation:
+        print("\n错误: 该武器或子弹的表格数据不完整（存在“？”等未知数值），无法计算")
+        return True
+    weapon_decay_multiplier = loadout['weapon_decay']
+    helmet_decay_multiplier = loadout['helmet_decay']
+    armor_decay_multiplier = loadout['armor_decay']
+    penetration_level = loadout['penetration_level']
+    base_damage_multiplier = loadout['base_damage_multiplier']
+    base_armor_multiplier = loadout['base_armor_multiplier']
+    fire_mode = loadout['fire_mode']
+    
+    debug_print(f"护甲类型: {armor_type_value}, 保护部位: {loadout['protected_areas']}")
+    debug_print(f"头盔等级 {helmet_level}, 头盔衰减倍率: {helmet_decay_multiplier}")
+    debug_print(f"护甲等级 {armor_level}, 护甲衰减倍率: {armor_decay_multiplier}")
+    debug_print(f"武器基础伤害: {selected_weapon['base_damage']}, 武器护甲伤害: {selected_weapon['armor_damage']}")
+    debug_print(f"射速: {selected_weapon['fire_rate']}, 射击模式: {fire_mode}, 扳机延迟: {selected_weapon['trigger_delay']}")
+    debug_print(f"子弹穿透等级: {penetration_level}, 伤害倍率: {base_damage_multiplier}, 护甲倍率: {base_armor_multiplier}")
+    
+    debug_print("部位倍率:")
+    for part, multiplier in loadout['body_part_multipliers'].items():
+        debug_print(f"  {part}: {multiplier}")
+    
+    # 打印选择的武器和子弹信息
+    print("\n=== 武器信息 ===")
+    print(f"武器: {selected_weapon['name']}")
+    print(f"子弹: {selected_bullet['name']}")
+    print(f"口径: {selected_weapon['raw_caliber']}")
+    print(f"距离: {distance}米, 武器衰减倍率: {weapon_decay_multiplier}")
+    print(f"穿透等级: {penetration_level}, 伤害倍率: {base_damage_multiplier}")
+    print(f"护甲倍率: {base_armor_multiplier}")
+    print(f"同级穿透倍率: {selected_bullet['same_level_penetration']}")
+    print(f"越级穿透倍率: {selected_bullet['higher_level_penetration']}")
+    print(f"头盔衰减倍率: {helmet_decay_multiplier}")
+    print(f"护甲衰减倍率: {armor_decay_multiplier}")
+    
+    if loadout['default_fire_rate']:
+        print("警告: 射速为0，使用默认值600")
+    if loadout['pellet_count'] > 1:
+        print(f"每发弹丸数: {loadout['pellet_count']}（各弹丸依次结算；输入部位表示全部弹丸命中，也可输入“头部*2+胸部*5”，其余弹丸视为未命中）")
+    
+    debug_print(f"射击间隔: {loadout['shot_interval']} ms")
+    
+    # 初始化状态；每发结算后保存检查点，撤销或修改命中时只重新结算之后的命中
+    history = new_history(new_state(helmet_durability, armor_durability))
+    announced = None  # 已显示最终统计的击杀记录
+    
+    print("\n=== 开始模拟计算 ===")
+    print("输入 undo [发数] 撤销最近的命中，edit 序号 部位 修改某一发，history 查看命中记录")
+    while True:
+        records = history['records']
+        if records and records[-1]['killed']:
+            # 死亡处理：显示最终统计，仍可撤销或修改之前的命中
+            if records[-1] is not announced:
+                print_final_statistics(loadout, history)
+                announced = records[-1]
+            command = input("\n按回车结束本次模拟计算，或输入 undo/edit/history 修改命中记录：").strip()
+            if not command or command.lower() == 'exit':
+                return True
+            if not run_history_command(loadout, history, command, helmet_level):
+                print("无效输入，请重新输入。")
+            continue
+        
+        # 输入命中部位或命令
+        hit_part = input("\n输入命中部位 (头部/胸部/腹部/下腹部/大臂/小臂/大腿/小腿/未命中)：").strip()
+        if hit_part.lower() == 'exit':
+            return True
+        if run_history_command(loadout, history, hit_part, helmet_level):
+            continue
+        if not is_valid_shot(loadout, hit_part):
+            print("无效输入，请重新输入。")
+            continue
+        
+        # 结算本次攻击
+        print_hit_result(loadout, push_hit(loadout, history, hit_part), helmet_level)
+
+def get_option(name):
+    """读取命令行参数 name 后面的值，没有时返回None"""
+    args = sys.argv[1:]
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args) and not args[index + 1].startswith('--'):
+            return args[index + 1]
+    return None
+
+def run_batch_mode():
+    """批量模式：--batch 场景文件（JSON/JSONL/CSV，省略或为 - 时读取标准输入） [--output 结果文件] [--details] [--engine fixed/decimal]
+    蒙特卡洛模式：--montecarlo 场景文件 [--output 结果文件] [--trials 试验次数] [--seed 随机种子]
+    最快击杀求解：--solve 场景文件 [--output 结果文件]，场景的parts字段为可命中部位
+    子弹排行：--ammo 场景文件 [--output 结果文件]，场景给出武器、目标防护、距离、命中方式pattern与排序方式order（不需要子弹）
+    最快组合搜索：--top 场景文件 [--output 结果文件]，场景给出目标防护、距离、命中方式pattern与排名数量top（不需要武器和子弹）
+    耐久热力图：--heatmap 场景文件 [--output 结果文件] [--details]，场景给出武器、子弹、头盔、护甲、距离与命中方式pattern，
+    输出头盔耐久×护甲耐久整个网格的等枪数线，--details 附带逐行游程编码的枪数网格
+    混装弹匣：--mixed 场景文件 [--output 结果文件]，场景给出武器、目标防护、距离、命中方式pattern与排名数量top，
+    求“前k发子弹A、之后子弹B”的最快组合与切换点；--batch 场景中的magazine字段可直接逐发指定子弹
+    每个场景输出一行JSON（JSONL），不写--output时输出到标准输出，--details 附带逐发命中记录
+    --engine 默认为整数定点引擎fixed，decimal为Decimal参考引擎，两者结果一致
+    """
+    montecarlo = '--montecarlo' in sys.argv
+    solve = '--solve' in sys.argv
+    ammo = '--ammo' in sys.argv
+    top = '--top' in sys.argv
+    heatmap = '--heatmap' in sys.argv
+    mixed = '--mixed' in sys.argv
+    mode = '--montecarlo' if montecarlo else '--solve' if solve else '--ammo' if ammo else '--top' if top else '--heatmap' if heatmap else '--mixed' if mixed else '--batch'
+    scenario_path = get_option(mode) or '-'
+    output_path = get_option('--output')
+    engine = get_option('--engine') or DEFAULT_ENGINE
+    if engine not in ENGINES:
+        print(f"错误: --engine 只能为 {'/'.join(ENGINES)}", file=sys.stderr)
+        return
+    
+    if montecarlo:
+        # 蒙特卡洛模拟需要numpy，只在此模式下导入
+        from gold_montecarlo import DEFAULT_TRIALS, run_montecarlo_batch
+        try:
+            trials = int(get_option('--trials') or DEFAULT_TRIALS)
+            seed = int(get_option('--seed')) if get_option('--seed') else None
+        except ValueError:
+            print("错误: --trials 与 --seed 应为整数", file=sys.stderr)
+            return
+    if ammo:
+        # 子弹排行按数组运算批量结算，同样只在此模式下导入numpy
+        from gold_ammo import run_ammo_batch
+    if top:
+        from gold_ammo import run_top_batch
+    if heatmap:
+        from gold_heatmap import run_heatmap_batch
+    if mixed:
+        from gold_magazine import run_mixed_batch
+    
+    # 加载提示写到标准错误，避免混入结果
+    with contextlib.redirect_stdout(sys.stderr):
+        store = load_data_store()
+    if store is None:
+        return
+    
+    stream, file_format = open_scenarios(scenario_path)
+    if output_path:
+        output = open(output_path, 'w', encoding='utf-8', newline='\n')
+    else:
+        sys.stdout.reconfigure(encoding='utf-8')
+        output = sys.stdout
+    
+    try:
+        scenarios = iter_scenarios(stream, file_format)
+        if montecarlo:
+            succeeded, failed = run_montecarlo_batch(store, scenarios, output, trials, seed)
+        elif solve:
+            succeeded, failed = run_solve_batch(store, scenarios, output)
+        elif ammo:
+            succeeded, failed = run_ammo_batch(store, scenarios, output)
+        elif top:
+            succeeded, failed = run_top_batch(store, scenarios, output)
+        elif heatmap:
+            succeeded, failed = run_heatmap_batch(store, scenarios, output, '--details' in sys.argv)
+        elif mixed:
+            succeeded, failed = run_mixed_batch(store, scenarios, output)
+        else:
+            succeeded, failed = run_batch(store, scenarios, output, '--details' in sys.argv, engine)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if output is not sys.stdout:
+            output.close()
+    
+    print(f"批量计算完成：成功 {succeeded} 个场景，失败 {failed} 个场景", file=sys.stderr)
+
+def parse_number_list(text):
+    """解析逗号分隔的数字列表，如 0,20,50"""
+    return tuple(float(value) if '.' in value else int(value) for value in text.replace('，', ',').split(',') if value.strip())
+
+def get_workers():
+    """--workers 进程数：不写数值时使用CPU核心数，未指定时返回None（单进程计算）"""
+    if '--workers' not in sys.argv:
+        return None
+    value = get_option('--workers')
+    if not value:
+        from parallel_sweep import default_workers
+        return default_workers()
+    workers = int(value)
+    if workers < 1:
+        raise ValueError
+    return workers
+
+def run_sweep_mode():
+    """矩阵模式：--sweep [--output 结果文件] [--distances 0,20,50] [--durability 1,0.5] [--engine vector/fixed/decimal] [--workers 进程数]
+    输出全部武器×子弹×头盔/护甲×耐久比例×距离在各命中方式下的击杀枪数与击杀耗时（CSV）
+    --engine 默认为数组运算vector；fixed、decimal逐个状态精确计算，速度较慢，用于核对
+    --workers 多进程并行计算，结果与单进程相同
+    """
+    # 矩阵计算需要numpy，只在此模式下导入
+    from gold_sweep import DEFAULT_DISTANCES, DEFAULT_DURABILITY_FRACTIONS, SWEEP_ENGINES, write_sweep_csv
+    
+    engine = get_option('--engine') or 'vector'
+    if engine not in SWEEP_ENGINES:
+        print(f"错误: --engine 只能为 {'/'.join(SWEEP_ENGINES)}", file=sys.stderr)
+        return
+    
+    try:
+        distances = parse_number_list(get_option('--distances') or '') or DEFAULT_DISTANCES
+        fractions = parse_number_list(get_option('--durability') or '') or DEFAULT_DURABILITY_FRACTIONS
+    except ValueError:
+        print("错误: --distances 与 --durability 应为逗号分隔的数字", file=sys.stderr)
+        return
+    try:
+        workers = get_workers()
+    except ValueError:
+        print("错误: --workers 应为正整数", file=sys.stderr)
+        return
+    output_path = get_option('--output')
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        store = load_data_store()
+    if store is None:
+        return
+    
+    if output_path:
+        output = open(output_path, 'w', encoding='utf-8', newline='')
+    else:
+        sys.stdout.reconfigure(encoding='utf-8', newline='')
+        output = sys.stdout
+    
+    skipped = []
+    try:
+        if workers:
+            from parallel_sweep import parallel_sweep_csv
+            count = parallel_sweep_csv(store, output, distances, fractions, skipped=skipped, engine=engine, workers=workers)
+        else:
+            count = write_sweep_csv(store, output, distances, fractions, skipped=skipped, engine=engine)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    print(f"矩阵计算完成：共 {count} 行", file=sys.stderr)
+    if skipped:
+        print(f"以下 {len(skipped)} 个组合的表格数据不完整（存在“？”等未知数值），已跳过：", file=sys.stderr)
+        for name in skipped:
+            print(f"  {name}", file=sys.stderr)
+
+def run_breakpoints_mode():
+    """耐久断点表：--breakpoints [--output 结果文件] [--distances 0,20,50] [--workers 进程数]
+    对全部武器×子弹×命中方式×防护等级×距离，直接求出击杀枪数随防护耐久变化的各个区间（CSV）
+    """
+    from gold_breakpoints import DEFAULT_DISTANCES, build_breakpoint_tables, write_breakpoints_csv
+    
+    try:
+        distances = parse_number_list(get_option('--distances') or '') or DEFAULT_DISTANCES
+    except ValueError:
+        print("错误: --distances 应为逗号分隔的数字", file=sys.stderr)
+        return
+    try:
+        workers = get_workers()
+    except ValueError:
+        print("错误: --workers 应为正整数", file=sys.stderr)
+        return
+    output_path = get_option('--output')
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        store = load_data_store()
+    if store is None:
+        return
+    
+    if output_path:
+        output = open(output_path, 'w', encoding='utf-8', newline='')
+    else:
+        sys.stdout.reconfigure(encoding='utf-8', newline='')
+        output = sys.stdout
+    
+    skipped = []
+    try:
+        if workers:
+            from parallel_sweep import parallel_breakpoints_csv
+            count = parallel_breakpoints_csv(store, output, distances, skipped=skipped, workers=workers)
+        else:
+            count = write_breakpoints_csv(build_breakpoint_tables(store, distances, skipped=skipped), output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    print(f"断点表计算完成：共 {count} 个耐久区间", file=sys.stderr)
+    if skipped:
+        print(f"以下 {len(skipped)} 个组合的表格数据不完整（存在“？”等未知数值），已跳过：", file=sys.stderr)
+        for name in skipped:
+            print(f"  {name}", file=sys.stderr)
+
+def run_curves_mode():
+    """距离断点曲线：--curves [--output 结果文件] [--durability 1,0.5]
+    对全部武器×子弹×命中方式×防护状态，按武器的衰减距离分段求出击杀枪数随距离变化的各个区间（CSV）
+    """
+    from gold_sweep import DEFAULT_DURABILITY_FRACTIONS
+    from gold_distance import write_curves_csv
+    
+    try:
+        fractions = parse_number_list(get_option('--durability') or '') or DEFAULT_DURABILITY_FRACTIONS
+    except ValueError:
+        print("错误: --durability 应为逗号分隔的数字", file=sys.stderr)
+        return
+    output_path = get_option('--output')
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        store = load_data_store()
+    if store is None:
+        return
+    
+    if output_path:
+        output = open(output_path, 'w', encoding='utf-8', newline='')
+    else:
+        sys.stdout.reconfigure(encoding='utf-8', newline='')
+        output = sys.stdout
+    
+    skipped = []
+    try:
+        count = write_curves_csv(store, output, fractions, skipped=skipped)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    print(f"距离断点曲线计算完成：共 {count} 个距离区间", file=sys.stderr)
+    if skipped:
+        print(f"以下 {len(skipped)} 个组合的表格数据不完整（存在“？”等未知数值），已跳过：", file=sys.stderr)
+        for name in skipped:
+            print(f"  {name}", file=sys.stderr)
+
+def main():
+    global DEBUG_MODE
+    
+    if '--sweep' in sys.argv:
+        run_sweep_mode()
+        return
+    if '--curves' in sys.argv:
+        run_curves_mode()
+        return
+    if '--breakpoints' in sys.argv:
+        run_breakpoints_mode()
+        return
+    if BATCH_MODE:
+        run_batch_mode()
+        return
+    
+    print("三角洲行动夺金伤害计算模拟程序 V0.2.38")  # 版本号更新
+    print("按 ESC 键可随时退出程序")
+    
+    # 检查是否启用调试模式
+    if len(sys.argv) > 1 and (sys.argv[1] == "--debug" or sys.argv[1] == "-d"):
+        DEBUG_MODE = True
+        print("调试模式已启用")
+    
+    # 整个进程只加载一次数据，表格修改后下一轮自动重新加载
+    session = create_session(DATA_FILES, load_data_store)
+    
+    while True:
+        result = run_simulation(session)
+        if not result:
+            break
+            
+        # 使用msvcrt检测按键
+        if not wait_for_key():
+            print("\n感谢使用，再见！")
+            break
+            
+        # 清屏并开始新一轮计算
+        os.system('cls' if os.name == 'nt' else 'clear')
+        print("开始新一轮计算...")
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,44 @@
 print("本程序由B站繁星攻略组制作，感谢B站用户Dec128与乂丶z提供的数据支持")
 
 import math
-import openpyxl
+import os
+import sys
 from decimal import Decimal, ROUND_HALF_UP, ROUND_FLOOR, getcontext
 
+# 公共模块目录（表格快照等共享代码）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '公共模块'))
+from sheet_columns import iter_records, ARMOR_SHEET
+
 # 设置Decimal精度环境
 getcontext().prec = 20  # 设置高精度计算环境
 
 # 加载Excel数据
 def load_armor_data(file_path):
-    wb = openpyxl.load_workbook(file_path)
-    sheet = wb['护甲数据']
-    
     # 创建1-6级的存储结构
     armors = {1: [], 2: [], 3: [], 4: [], 5: [], 6: []}
     helmets = {1: [], 2: [], 3: [], 4: [], 5: [], 6: []}
     
-    # 从第3行开始读取数据（跳过前2行标题）
-    for row_idx, row in enumerate(sheet.iter_rows(min_row=3, values_only=True), start=3):
+    # 按列定义逐行读取，标题行和分段行没有数值等级，会被跳过
+    for record in iter_records(file_path, ARMOR_SHEET):
         # 检查是否是有效行
-        if not row[0] or row[0] == "听力范围" or not isinstance(row[1], (int, float)):
+        if not record['name'] or record['name'] == "听力范围" or not isinstance(record['level'], (int, float)):
             continue
             
-        name = row[0]
-        armor_class = int(row[1])
-        armor_type = row[2]
+        name = record['name']
+        armor_class = int(record['level'])
+        armor_type = record['type']
         
         # 只处理1-6级装备
         if armor_class < 1 or armor_class > 6:
             continue
             
         # 获取关键数据
-        initial_max = row[6] if isinstance(row[6], (int, float)) else 0
-        repair_loss = row[8] if isinstance(row[8], (int, float)) else 0
+        initial_max = record['max_durability'] if isinstance(record['max_durability'], (int, float)) else 0
+        repair_loss = record['repair_loss'] if isinstance(record['repair_loss'], (int, float)) else 0
         
         # 获取四种维修包效率
         efficiencies = []
-        for col_idx in [10, 12, 14, 16]:  # K, M, O, Q列
-            eff_value = row[col_idx]
+        for eff_value in record['efficiencies']:  # K, M, O, Q列
             if isinstance(eff_value, (int, float)):
                 efficiencies.append(eff_value)
             else:
@@ -57,7 +58,7 @@ def load_armor_data(file_path):
             'initial_max': initial_max,
             'repair_loss': repair_loss,
             'efficiencies': efficiencies,
-            'row': row_idx  # 记录行号用于调试
+            'row': record['row']  # 记录行号用于调试
         }
         
         # 分类存储
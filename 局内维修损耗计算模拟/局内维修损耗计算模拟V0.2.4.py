@@ -3,8 +3,12 @@ print("本程序由B站繁星攻略组制作，感谢B站用户Dec128与乂丶z
 from decimal import Decimal, getcontext, ROUND_HALF_UP, ROUND_CEILING
 import math
 import re
-import openpyxl
 import os
+import sys
+
+# 公共模块目录（表格快照等共享代码）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '公共模块'))
+from sheet_columns import iter_records, ARMOR_SHEET
 
 # 设置Decimal上下文精度
 getcontext().prec = 28
@@ -34,22 +38,19 @@ def parse_efficiency(value):
 
 def load_armor_data(file_path):
     """从Excel文件加载护甲和头盔数据"""
-    wb = openpyxl.load_workbook(file_path)
-    sheet = wb['护甲数据']
-    
     # 支持1-6级装备
     armors = {1: [], 2: [], 3: [], 4: [], 5: [], 6: []}
     helmets = {1: [], 2: [], 3: [], 4: [], 5: [], 6: []}
     
-    # 从第4行开始读取数据（跳过前3行标题）
-    for row_idx, row in enumerate(sheet.iter_rows(min_row=4, values_only=True), start=4):
+    # 按列定义逐行读取，标题行和分段行没有数值等级，会被跳过
+    for record in iter_records(file_path, ARMOR_SHEET):
         # 提取基本数据
-        name = row[0]  # A列
+        name = record['name']  # A列
         if not name:
             continue
             
-        level = row[1]  # B列
-        armor_type = row[2]  # C列
+        level = record['level']  # B列
+        armor_type = record['type']  # C列
         
         # 处理所有1-6级装备
         if not isinstance(level, (int, float)) or level < 1 or level > 6:
@@ -59,16 +60,13 @@ def load_armor_data(file_path):
         
         # 转换数值类型为Decimal
         try:
-            max_durability = Decimal(str(row[6])) if row[6] is not None else Decimal('0')  # G列
-            repair_loss = Decimal(str(row[8])) if row[8] is not None else Decimal('0')      # I列
+            max_durability = Decimal(str(record['max_durability'])) if record['max_durability'] is not None else Decimal('0')  # G列
+            repair_loss = Decimal(str(record['repair_loss'])) if record['repair_loss'] is not None else Decimal('0')           # I列
         except:
             continue
         
         # 只读取K、M、O、Q四列的维修效率数据
-        efficiency_self = row[10]  # K列 (自制)
-        efficiency_std = row[12]   # M列 (标准)
-        efficiency_prec = row[14]  # O列 (精密)
-        efficiency_adv = row[16]   # Q列 (高级)
+        efficiency_self, efficiency_std, efficiency_prec, efficiency_adv = record['efficiencies']  # K、M、O、Q列 (自制、标准、精密、高级)
         
         # 创建装备数据字典
         equipment = {
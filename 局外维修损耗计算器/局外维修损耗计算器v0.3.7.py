@@ -3,8 +3,12 @@ print("本程序由B站繁星攻略组制作，感谢B站用户Dec128与乂丶z
 import math
 import re
 import os
+import sys
 from decimal import Decimal, getcontext, ROUND_FLOOR, ROUND_HALF_UP
-from openpyxl import load_workbook
+
+# 公共模块目录（表格快照等共享代码）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '公共模块'))
+from sheet_columns import iter_records, ARMOR_SHEET
 
 # 设置不可交易的装备列表
 NON_TRADABLE_EQUIPMENTS = [
@@ -69,42 +73,39 @@ def load_equipment_data(file_path):
         raise FileNotFoundError(f"文件不存在: {file_path}")
     
     try:
-        wb = load_workbook(file_path)
-        sheet = wb.active
-        
         # 初始化1-6级的护甲和头盔数据字典
         armor_data = {i: [] for i in range(1, 7)}
         helmet_data = {i: [] for i in range(1, 7)}
         
-        # 从第4行开始读取数据（跳过前3行标题）
-        for row in range(4, sheet.max_row + 1):
+        # 按列定义逐行读取，标题行和分段行没有有效等级，会被跳过
+        for record in iter_records(file_path, ARMOR_SHEET):
             # 读取装备名称
-            name = sheet.cell(row=row, column=1).value
+            name = record['name']
             if not name or name == " " or name == "":
                 continue
                 
             # 读取防护等级
-            level = sheet.cell(row=row, column=2).value
+            level = record['level']
             if level is None or level not in range(1, 7):  # 支持1-6级
                 continue
                 
             # 读取装备类型
-            armor_type = sheet.cell(row=row, column=3).value
+            armor_type = record['type']
             if not armor_type:
                 continue
                 
             # 读取初始上限
-            initial_upper = sheet.cell(row=row, column=7).value
+            initial_upper = record['max_durability']
             if initial_upper is None:
                 continue
                 
             # 读取维修损耗
-            repair_loss = sheet.cell(row=row, column=9).value
+            repair_loss = record['repair_loss']
             if repair_loss is None:
                 continue
                 
             # 读取维修单价
-            repair_price = sheet.cell(row=row, column=10).value
+            repair_price = record['repair_price']
             if repair_price is None:
                 continue
            
@@ -0,0 +1,335 @@
+import sys
+
+CURVES_MODE = '--curves' in sys.argv
+print("本程序由B站繁星攻略组制作", file=sys.stderr if CURVES_MODE else sys.stdout)
+
+import contextlib
+import csv
+import math
+import os
+from decimal import Decimal, ROUND_HALF_UP
+
+# 公共模块目录（表格快照等共享代码）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '公共模块'))
+from sheet_columns import iter_records, BATTLEFIELD_WEAPON_SHEET
+from decay_table import weapon_decay_table, decay_at
+from distance_curves import segment_distances, build_curve, curve_intervals, format_curve
+
+BODY_PARTS = ["头部", "胸部", "腹部", "大臂", "小臂", "大腿", "小腿"]
+MULTIPLIER_KEYS = {
+    "头部": "head_mult",
+    "胸部": "chest_mult",
+    "腹部": "abdomen_mult",
+    "大臂": "upper_arm_mult",
+    "小臂": "forearm_mult",
+    "大腿": "thigh_mult",
+    "小腿": "calf_mult"
+}
+
+def parse_base_damage(value):
+    """基础伤害 -> (单颗弹丸伤害, 弹丸数)；霰弹枪写成“单颗伤害*弹丸数”（如34*8）"""
+    if isinstance(value, str) and "*" in value:
+        damage, pellets = value.split("*", 1)
+        damage = float(damage)
+        return int(damage) if damage.is_integer() else damage, int(pellets)
+    return value or 0, 1
+
+def load_weapon_data(file_path):
+    """从Excel文件加载武器数据（霰弹枪按弹丸数计算）"""
+    try:
+        weapons = []
+        current_category = ""
+        
+        # 从第3行开始读取数据
+        for record in iter_records(file_path, BATTLEFIELD_WEAPON_SHEET):
+            if record["row"] > 100:  # 安全限制
+                break
+            
+            # 读取行数据
+            category_cell = record["category"]
+            name_cell = record["name"]
+            
+            # 更新当前武器类别
+            if category_cell:
+                current_category = category_cell
+            
+            # 跳过空行
+            if not name_cell:
+                continue
+            
+            try:
+                base_damage, pellet_count = parse_base_damage(record["base_damage"])
+            except ValueError:
+                print(f"警告: {name_cell} 的基础伤害无法识别（{record['base_damage']}），已跳过")
+                continue
+            
+            # 收集武器数据
+            weapon = {
+                "category": current_category,
+                "name": name_cell,
+                "fire_mode": record["fire_mode"] or 1,
+                "trigger_delay": record["trigger_delay"] or 0,
+                "rpm": record["rpm"] or 0,
+                "shooting_interval": record["shooting_interval"] or 0,
+                # 基础伤害在第9列(I列)，霰弹枪为单颗弹丸的伤害
+                "base_damage": base_damage,
+                "pellet_count": pellet_count,
+                # 部位倍率在第12-18列(L-R列)
+                "head_mult": record["head_mult"] or 0,  # L列
+                "chest_mult": record["chest_mult"] or 0,  # M列
+                "abdomen_mult": record["abdomen_mult"] or 0,  # N列
+                "upper_arm_mult": record["upper_arm_mult"] or 0,  # O列
+                "forearm_mult": record["forearm_mult"] or 0,  # P列
+                "thigh_mult": record["thigh_mult"] or 0,  # Q列
+                "calf_mult": record["calf_mult"] or 0,  # R列
+                "decay_distances": [],
+                "decay_multipliers": []
+            }
+            
+            # 处理射击间隔 - 如果为空则计算
+            if not weapon["shooting_interval"] and weapon["rpm"]:
+                weapon["shooting_interval"] = round(60000 / weapon["rpm"], 2)
+            
+            # 收集衰减数据（最多4组）
+            for dist, mult in zip(record["decay_distances"], record["decay_multipliers"]):  # S/T, U/V, W/X, Y/Z列
+                # 跳过无效数据
+                if dist in ["/", None] or mult in ["/", None]:
+                    continue
+                
+                # 确保是数值类型
+                try:
+                    dist_val = float(dist)
+                    mult_val = float(mult)
+                    weapon["decay_distances"].append(dist_val)
+                    weapon["decay_multipliers"].append(mult_val)
+                except (ValueError, TypeError):
+                    continue
+            
+            weapons.append(weapon)
+        
+        return weapons
+    
+    except Exception as e:
+        print(f"读取武器数据时出错: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return []
+
+def get_decay_multiplier(weapon, distance):
+    """根据距离获取衰减倍率（衰减表按距离排序后只编译一次，二分查找）"""
+    return decay_at(weapon_decay_table(weapon, 'decay_multipliers'), distance)
+
+def hits_to_kill(base_damage, multiplier, decay_multiplier, pellets_hit):
+    """击杀所需次数，无法造成伤害时为0"""
+    dmg_per_shot = base_damage * multiplier * decay_multiplier * pellets_hit
+    if dmg_per_shot <= 0:
+        return 0
+    return math.ceil(100 / dmg_per_shot)
+
+def distance_curve(weapon, part, pellets_hit=None):
+    """某部位击杀次数随距离变化的曲线（格式见distance_curves），每个衰减段只计算一次"""
+    table = weapon_decay_table(weapon, 'decay_multipliers')
+    distances, limits = segment_distances(table)
+    pellets_hit = pellets_hit or weapon["pellet_count"]
+    multiplier = weapon[MULTIPLIER_KEYS[part]]
+    return build_curve(limits, [
+        hits_to_kill(weapon["base_damage"], multiplier, decay_at(table, distance), pellets_hit)
+        for distance in distances
+    ])
+
+def run_curves_mode():
+    """距离断点曲线：--curves [--output 结果文件]
+    对全部武器的各部位，求出击杀次数随距离变化的各个区间（CSV，霰弹枪按全部弹丸命中计算）
+    区间不含下限、含上限（第一段从0米开始），最后一段上限与无法击杀的次数留空
+    """
+    file_path = "S6战场武器.xlsx"
+    output_path = None
+    if '--output' in sys.argv:
+        index = sys.argv.index('--output')
+        output_path = sys.argv[index + 1] if index + 1 < len(sys.argv) else None
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        weapons = load_weapon_data(file_path) if os.path.exists(file_path) else []
+    if not weapons:
+        print(f"错误: 未能从 '{file_path}' 读取武器数据", file=sys.stderr)
+        return
+    
+    if output_path:
+        output = open(output_path, 'w', encoding='utf-8', newline='')
+    else:
+        sys.stdout.reconfigure(encoding='utf-8', newline='')
+        output = sys.stdout
+    
+    count = 0
+    try:
+        writer = csv.writer(output)
+        writer.writerow(['武器类型', '武器', '部位', '距离下限', '距离上限', '击杀次数'])
+        for weapon in weapons:
+            for part in BODY_PARTS:
+                for start, end, hits in curve_intervals(distance_curve(weapon, part)):
+                    writer.writerow([weapon['category'], weapon['name'], part, f'{start:g}', f'{end:g}' if end is not None else '', hits or ''])
+                    count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"距离断点曲线计算完成：共 {count} 个距离区间", file=sys.stderr)
+
+def main():
+    if CURVES_MODE:
+        run_curves_mode()
+        return
+    
+    print("战场武器伤害计算器")
+    print("=" * 50)
+    
+    # 检查文件是否存在
+    file_path = "S6战场武器.xlsx"
+    if not os.path.exists(file_path):
+        print(f"错误: 武器数据文件 '{file_path}' 不存在")
+        print("请将Excel文件放在程序同一目录下")
+        input("按回车键退出...")
+        return
+    
+    # 加载武器数据
+    print("正在加载武器数据...")
+    weapons = load_weapon_data(file_path)
+    if not weapons:
+        print("未找到有效的武器数据")
+        input("按回车键退出...")
+        return
+    
+    # 按武器类型分组
+    weapon_categories = {}
+    for weapon in weapons:
+        category = weapon["category"]
+        if category not in weapon_categories:
+            weapon_categories[category] = []
+        weapon_categories[category].append(weapon)
+    
+    # 显示武器类型供选择
+    print("\n可用武器类型:")
+    print("（复合弓与点射武器不适用本程序）")
+    sorted_categories = sorted(weapon_categories.keys())
+    for idx, category in enumerate(sorted_categories, 1):
+        print(f"{idx}. {category}")
+    
+    # 选择武器类型
+    try:
+        cat_choice = int(input("\n请选择武器类型 (输入编号): "))
+        if cat_choice < 1 or cat_choice > len(sorted_categories):
+            print("无效的选择!")
+            return
+        
+        selected_category = sorted_categories[cat_choice - 1]
+        category_weapons = weapon_categories[selected_category]
+        
+        print(f"\n已选择: {selected_category}")
+    except ValueError:
+        print("请输入有效的数字!")
+        return
+    
+    # 显示具体武器供选择
+    print(f"\n{selected_category}可用武器:")
+    for idx, weapon in enumerate(category_weapons, 1):
+        print(f"{idx}. {weapon['name']}")
+    
+    # 选择具体武器
+    try:
+        weapon_choice = int(input("\n请选择武器 (输入编号): "))
+        if weapon_choice < 1 or weapon_choice > len(category_weapons):
+            print("无效的选择!")
+            return
+        
+        selected_weapon = category_weapons[weapon_choice - 1]
+        print(f"\n已选择: {selected_weapon['name']}")
+    except ValueError:
+        print("请输入有效的数字!")
+        return
+    
+    # 输入目标距离
+    try:
+        distance = float(input("\n请输入目标距离 (0-400米): "))
+        if distance < 0 or distance > 400:
+            print("距离必须在0-400米之间!")
+            return
+    except ValueError:
+        print("请输入有效的数字!")
+        return
+    
+    # 霰弹枪每发命中的弹丸数，直接回车为全部命中
+    pellet_count = selected_weapon["pellet_count"]
+    pellets_hit = pellet_count
+    if pellet_count > 1:
+        try:
+            text = input(f"\n请输入每发命中的弹丸数 (1-{pellet_count}，直接回车为全部命中): ").strip()
+            if text:
+                pellets_hit = int(text)
+            if pellets_hit < 1 or pellets_hit > pellet_count:
+                print(f"弹丸数必须在1-{pellet_count}之间!")
+                return
+        except ValueError:
+            print("请输入有效的数字!")
+            return
+    
+    # 计算衰减倍率
+    decay_multiplier = get_decay_multiplier(selected_weapon, distance)
+    
+    # 获取武器数据
+    fire_mode = selected_weapon["fire_mode"]
+    trigger_delay = selected_weapon["trigger_delay"]
+    rpm = selected_weapon["rpm"]
+    shooting_interval = selected_weapon["shooting_interval"]
+    base_damage = selected_weapon["base_damage"]
+    
+    # 部位倍率
+    multipliers = {part: selected_weapon[key] for part, key in MULTIPLIER_KEYS.items()}
+    
+    # 计算并显示结果
+    print("\n" + "=" * 50)
+    print(f"武器: {selected_weapon['name']} ({selected_weapon['category']})")
+    print(f"目标距离: {distance}米, 衰减倍率: {decay_multiplier:.3f}")
+    print(f"射击模式: {'全自动' if fire_mode == 1 else '半自动'}")
+    if pellet_count > 1:
+        print(f"基础伤害: {base_damage}×{pellet_count}（每发命中{pellets_hit}颗弹丸）, 射速: {rpm}RPM, 射击间隔: {shooting_interval:.2f}ms")
+    else:
+        print(f"基础伤害: {base_damage}, 射速: {rpm}RPM, 射击间隔: {shooting_interval:.2f}ms")
+    print(f"扳机延迟: {trigger_delay}ms")
+    
+    # 打印部位倍率用于验证
+    print("\n部位倍率:")
+    print(f"头部: {multipliers['头部']} | 胸部: {multipliers['胸部']} | 腹部: {multipliers['腹部']}")
+    print(f"大臂: {multipliers['大臂']} | 小臂: {multipliers['小臂']} | 大腿: {multipliers['大腿']} | 小腿: {multipliers['小腿']}")
+    
+    print("\n各部位致死次数及耗时:")
+    print("-" * 50)
+    
+    for part in BODY_PARTS:
+        hits = hits_to_kill(base_damage, multipliers[part], decay_multiplier, pellets_hit)
+        
+        if hits == 0:
+            hits_str = "无法致死"
+            time_str = "无法计算"
+        else:
+            # 根据射击模式计算耗时
+            if fire_mode == 1:  # 全自动
+                time_ms = trigger_delay + shooting_interval * (hits - 1)
+            else:  # 半自动
+                time_ms = trigger_delay * hits + shooting_interval * (hits - 1)
+            
+            time_ms = round(time_ms, 2)
+            hits_str = f"{hits}次"
+            time_str = f"{time_ms:.2f}ms"
+        
+        print(f"{part.ljust(4)}：{hits_str.ljust(8)}，耗时{time_str}")
+    
+    # 击杀次数只在衰减距离处变化，列出各部位的距离区间
+    print("\n各部位致死次数随距离的变化:")
+    print("-" * 50)
+    for part in BODY_PARTS:
+        print(f"{part.ljust(4)}：{format_curve(distance_curve(selected_weapon, part, pellets_hit))}")
+    
+    print("=" * 50)
+    input("\n按回车键结束模拟计算...")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
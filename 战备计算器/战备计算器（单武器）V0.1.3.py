@@ -1,18 +1,21 @@
 print("本程序由B站繁星攻略组制作")
 print("卡战备计算程序数据量较大，加载慢与计算慢很正常。耐心等待")
 
-import openpyxl
+import os
+import sys
 import time
 import heapq
 from collections import defaultdict
 
+# 公共模块目录（表格快照等共享代码）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '公共模块'))
+from sheet_columns import iter_records, EQUIPMENT_PRICE_SHEET, WEAPON_PRICE_SHEET
+
 def load_equipment_data(file_path, filter_overpriced=True, filter_zero_price=True):
     """加载装备数据（护甲、头盔、胸挂、背包）
     filter_overpriced: 是否过滤高价物品（市场价值≥战备价值+2000）
     filter_zero_price: 是否过滤市场价值为0的物品
     """
-    wb = openpyxl.load_workbook(file_path, data_only=True)
-    sheet = wb["护甲数据"]
     
     categories = {
         "护甲": [],
@@ -24,19 +27,16 @@ def load_equipment_data(file_path, filter_overpriced=True, filter_zero_price=Tru
     current_category = None
     overpriced_items = []
     
-    for row_idx, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-        if not any(row):  # 跳过空行
-            continue
-            
-        if row[0] in categories:  # 检测到类别标题
-            current_category = row[0]
+    for record in iter_records(file_path, EQUIPMENT_PRICE_SHEET):
+        if record["category"] in categories:  # 检测到类别标题
+            current_category = record["category"]
             continue
             
-        if current_category and row[1] and (row[2] is not None or row[3] is not None):
-            name = row[1]
-            market_price = row[2] or 0
-            readiness_value = row[3] or 0
-            quality = row[6] or 0  # 获取装备品质
+        if current_category and record["name"] and (record["market_price"] is not None or record["readiness_value"] is not None):
+            name = record["name"]
+            market_price = record["market_price"] or 0
+            readiness_value = record["readiness_value"] or 0
+            quality = record["quality"] or 0  # 获取装备品质
             
             # 跳过市场价值为0的装备（如果启用过滤）
             if filter_zero_price and market_price == 0:
@@ -67,25 +67,21 @@ def load_weapon_data(file_path, filter_overpriced=True, filter_zero_price=True):
     filter_overpriced: 是否过滤高价物品（市场价值≥战备价值+2000）
     filter_zero_price: 是否过滤市场价值为0的物品
     """
-    wb = openpyxl.load_workbook(file_path, data_only=True)
-    sheet = wb["夺金模式"]
+    records = list(iter_records(file_path, WEAPON_PRICE_SHEET))
     
     weapons = defaultdict(list)
     current_category = None
     overpriced_weapons = []
     
-    for row_idx, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-        if not any(row):  # 跳过空行
-            continue
-            
-        if row[0] and row[0] != "手枪":  # 检测到武器类别（排除手枪）
-            current_category = row[0]
+    for record in records:
+        if record["category"] and record["category"] != "手枪":  # 检测到武器类别（排除手枪）
+            current_category = record["category"]
             continue
             
-        if current_category and row[1] and (row[2] is not None or row[3] is not None):
-            name = row[1]
-            market_price = row[2] or 0
-            readiness_value = row[3] or 0
+        if current_category and record["name"] and (record["market_price"] is not None or record["readiness_value"] is not None):
+            name = record["name"]
+            market_price = record["market_price"] or 0
+            readiness_value = record["readiness_value"] or 0
             
             # 跳过市场价值为0的武器（如果启用过滤）
             if filter_zero_price and market_price == 0:
@@ -117,10 +113,11 @@ def load_weapon_data(file_path, filter_overpriced=True, filter_zero_price=True):
         (13, "R93")
     ]
     
+    records_by_row = {record["row"]: record for record in records}
     for row_idx, name in pistol_rows:
-        row = sheet[row_idx]
-        market_price = row[2].value if row[2] and row[2].value is not None else 0
-        readiness_value = row[3].value if row[3] and row[3].value is not None else 0
+        record = records_by_row[row_idx]
+        market_price = record["market_price"] if record["market_price"] is not None else 0
+        readiness_value = record["readiness_value"] if record["readiness_value"] is not None else 0
         
         # 跳过市场价值为0的手枪（如果启用过滤）
         if filter_zero_price and market_price == 0: